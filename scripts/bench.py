@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Banc de performance de bout en bout du pipeline de brainstorming.
+
+Exécute le pipeline réel (run_brainstorm_loop, process_ideas) et ses
+fonctions critiques contre le backend synthétique, avec des latences
+contrôlées, puis rapporte pour chaque scénario : temps réel, appels/s,
+temps CPU et pic de mémoire résidente. Le résultat JSON permet de comparer
+deux commits.
+
+Usage:
+    python scripts/bench.py --cycles 1,3 --ideas 1,3 --latency 0.05 --output bench.json
+    python scripts/bench.py --compare bench_avant.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Backend hors-ligne avant tout import du client GPT
+os.environ["BRAINSTORM_BACKEND"] = "synthetic"
+
+src_path = Path(__file__).parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+try:
+    from brainstorm_ai.core.backends import LatencyModel, SyntheticBackend
+    from brainstorm_ai.core.config import config
+    from brainstorm_ai.core.exporter import export_json, export_markdown, export_yaml
+    from brainstorm_ai.core.gpt import get_gpt_client, get_gpt_stats, reset_gpt_stats
+    from brainstorm_ai.core.loop_manager import (
+        extract_top_ideas_robust,
+        limiter_historique,
+        process_ideas,
+        run_brainstorm_loop,
+        validate_score,
+    )
+except ImportError as e:
+    print(f"❌ Erreur: Impossible d'importer brainstorm_ai ({e})")
+    print("   Installez le projet avec: pip install -e .")
+    sys.exit(1)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Pic de mémoire résidente du processus en Mo (None si indisponible)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux : kilo-octets, macOS : octets
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 2)
+
+
+def git_commit() -> Optional[str]:
+    """Commit courant du dépôt, si disponible."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(name: str, params: Dict[str, Any], func: Callable[[], Any], ops: int = 1) -> dict:
+    """Exécute une fonction et mesure temps réel, CPU, appels API et mémoire."""
+    reset_gpt_stats()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    calls = get_gpt_stats()["api_calls"]
+
+    result = {
+        "name": name,
+        "params": params,
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu, 4),
+        "api_calls": calls,
+        "calls_per_s": round(calls / wall, 2) if wall > 0 else 0.0,
+        "ops_per_s": round(ops / wall, 2) if wall > 0 else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    print(
+        f"  {name:<28} {json.dumps(params):<32} "
+        f"{result['wall_s']:>8.3f}s  cpu {result['cpu_s']:>7.3f}s  "
+        f"{calls:>4} appels  {result['calls_per_s']:>7.1f} appels/s"
+    )
+    return result
+
+
+def configure(args: argparse.Namespace, workdir: str) -> None:
+    """Configuration isolée : exports temporaires, cycles fixes, sans cache, quota, index ni télémétrie."""
+    config.set("general.ask_confirmation", False)
+    config.set("export.paths.logs_dir", os.path.join(workdir, "logs"))
+    config.set("export.paths.exports_dir", os.path.join(workdir, "exports"))
+    config.set("api.cache.enabled", False)
+    config.set("api.rate_limits", {})
+    config.set("advanced.idea_index.enabled", False)
+    config.set("general.early_stopping.enabled", False)
+    config.set("advanced.telemetry.enabled", False)
+
+    latency = LatencyModel(
+        distribution=args.distribution,
+        mean=args.latency,
+        sigma=args.sigma,
+        per_token=args.per_token,
+    )
+    get_gpt_client().set_backend(SyntheticBackend(latency=latency, seed=args.seed))
+
+
+def sample_log_data(cycles: int, ideas: int) -> dict:
+    """Log de brainstorm représentatif pour les exporteurs."""
+    texte = "\n".join(f"{i}. Idée détaillée numéro {i} " + "mot " * 40 for i in range(1, 6))
+    score = {"impact": 7, "faisabilite": 6, "originalite": 8, "clarte": 7, "total": 28}
+    return {
+        "objectif": "Objectif de benchmark",
+        "contexte": "Contexte de benchmark",
+        "contraintes": "Contraintes de benchmark",
+        "date": datetime.datetime.now().isoformat(),
+        "logs": [
+            {
+                "cycle": c,
+                "creation": texte,
+                "critique": texte,
+                "defense": texte,
+                "replique": texte,
+                "revision": texte,
+                "score": score,
+            }
+            for c in range(1, cycles + 1)
+        ],
+        "synthese_finale": texte,
+        "application": [
+            {
+                "idee": f"Idée {i}",
+                "plan_initial": texte,
+                "critique": texte,
+                "defense": texte,
+                "revision": texte,
+            }
+            for i in range(1, ideas + 1)
+        ],
+    }
+
+
+def run_benchmarks(args: argparse.Namespace, workdir: str) -> List[dict]:
+    results = []
+    cycles_list = [int(c) for c in args.cycles.split(",")]
+    ideas_list = [int(i) for i in args.ideas.split(",")]
+
+    print("🔁 Pipeline complet (run_brainstorm_loop)")
+    for cycles in cycles_list:
+        for ideas in ideas_list:
+            config.set("general.top_ideas_count", ideas)
+            for _ in range(args.repeat):
+                results.append(
+                    measure(
+                        "run_brainstorm_loop",
+                        {"cycles": cycles, "ideas": ideas},
+                        lambda c=cycles: run_brainstorm_loop(
+                            "Objectif", "Contexte", "Contraintes", c
+                        ),
+                    )
+                )
+
+    print("📌 Phase d'application (process_ideas)")
+    for ideas in ideas_list:
+        idees = [f"Idée de benchmark {i}" for i in range(1, ideas + 1)]
+        for _ in range(args.repeat):
+            results.append(
+                measure("process_ideas", {"ideas": ideas}, lambda i=idees: process_ideas(i))
+            )
+
+    print("⚙️  Fonctions critiques (sans API)")
+    iterations = args.iterations
+    entry = "x" * 2000
+    history_sizes = [100, 1000]
+    for size in history_sizes:
+        results.append(
+            measure(
+                "limiter_historique",
+                {"entries": size, "entry_chars": len(entry)},
+                lambda n=size: [limiter_historique([entry] * n) for _ in range(10)],
+                ops=10,
+            )
+        )
+
+    synthese = "\n".join(f"{i}. Idée {i} : " + "description " * 30 for i in range(1, 11))
+    results.append(
+        measure(
+            "extract_top_ideas_robust",
+            {"lines": 10, "count": 5},
+            lambda: [extract_top_ideas_robust(synthese, 5) for _ in range(iterations)],
+            ops=iterations,
+        )
+    )
+
+    valid = json.dumps({"impact": 7, "faisabilite": 6, "originalite": 8, "clarte": 7})
+    results.append(
+        measure(
+            "validate_score",
+            {"input": "valid+invalid"},
+            lambda: [
+                (validate_score(valid), validate_score("pas du json")) for _ in range(iterations)
+            ],
+            ops=2 * iterations,
+        )
+    )
+
+    log_data = sample_log_data(max(cycles_list), max(ideas_list))
+    exporters = {
+        "export_yaml": export_yaml,
+        "export_json": export_json,
+        "export_markdown": export_markdown,
+    }
+    for name, exporter in exporters.items():
+        target = os.path.join(workdir, "bench_exports", name)
+        results.append(
+            measure(
+                name,
+                {"cycles": len(log_data["logs"]), "ideas": len(log_data["application"])},
+                lambda e=exporter, t=target: [e(log_data, filename=t) for _ in range(20)],
+                ops=20,
+            )
+        )
+
+    return results
+
+
+def compare(results: List[dict], baseline_path: str) -> None:
+    """Affiche l'évolution du temps réel par rapport à un fichier de référence."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    def key(r: dict) -> str:
+        return f"{r['name']} {json.dumps(r['params'], sort_keys=True)}"
+
+    reference = {key(r): r for r in baseline.get("results", [])}
+    print(f"\n📊 Comparaison avec {baseline_path} ({baseline.get('meta', {}).get('commit')})")
+    for result in results:
+        ref = reference.get(key(result))
+        if not ref or not ref["wall_s"]:
+            continue
+        ratio = result["wall_s"] / ref["wall_s"]
+        marker = "🔴" if ratio > 1.1 else "🟢" if ratio < 0.9 else "⚪"
+        print(f"  {marker} {key(result):<60} x{ratio:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline Brainstorm AI")
+    parser.add_argument("--cycles", default="1,3", help="Nombres de cycles (ex: 1,3,5)")
+    parser.add_argument("--ideas", default="1,3", help="Nombres d'idées (ex: 1,3,5)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latence moyenne (s)")
+    parser.add_argument("--sigma", type=float, default=0.0, help="Dispersion de la latence")
+    parser.add_argument(
+        "--distribution",
+        default="fixed",
+        choices=["fixed", "uniform", "normal", "lognormal"],
+        help="Distribution de la latence",
+    )
+    parser.add_argument("--per-token", type=float, default=0.0, help="Secondes par token")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du backend synthétique")
+    parser.add_argument("--repeat", type=int, default=1, help="Répétitions par scénario")
+    parser.add_argument("--iterations", type=int, default=1000, help="Itérations micro-bench")
+    parser.add_argument("--output", help="Fichier JSON de sortie")
+    parser.add_argument("--compare", help="Fichier JSON de référence à comparer")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("brainstorm_ai").setLevel(logging.WARNING)
+
+    print("🚀 === BENCHMARK BRAINSTORM AI ===\n")
+    with tempfile.TemporaryDirectory(prefix="brainstorm_bench_") as workdir:
+        configure(args, workdir)
+        results = run_benchmarks(args, workdir)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "date": datetime.datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(args),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Résultats enregistrés dans {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
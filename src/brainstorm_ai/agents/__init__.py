@@ -7,6 +7,7 @@ Ce module contient tous les agents spécialisés du système :
 - Agent Révision : amélioration des idées
 - Agent Score : évaluation objective
 - Agent Synthèse : consolidation des résultats
+- Agent Résumé : compaction de l'historique des cycles
 - Agent Application : planification de mise en œuvre
 """
 
@@ -16,6 +17,7 @@ from .creative import AgentCreatif
 from .critic import AgentCritique
 from .revision import AgentRevision
 from .score import AgentScore
+from .summary import AgentResume
 from .synthesis import AgentSynthese
 
 # Instances singleton des agents
@@ -26,6 +28,7 @@ _agents = {
     "score": None,
     "synthese": None,
     "application": None,
+    "resume": None,
 }
 
 
@@ -47,6 +50,8 @@ def get_agent(agent_type: str):
             _agents[agent_type] = AgentSynthese()
         elif agent_type == "application":
             _agents[agent_type] = AgentApplication()
+        elif agent_type == "resume":
+            _agents[agent_type] = AgentResume()
 
     return _agents[agent_type]
 
@@ -82,11 +87,21 @@ def prompt_score(texte: str) -> str:
     return get_agent("score").evaluer(texte)
 
 
+def prompt_score_lot(textes: list) -> str:
+    """Wrapper pour compatibilité avec l'ancien code."""
+    return get_agent("score").evaluer_lot(textes)
+
+
 def prompt_synthese(idees_revisees: list, count: int = 3) -> str:
     """Wrapper pour compatibilité avec l'ancien code."""
     return get_agent("synthese").consolider(idees_revisees, count)
 
 
+def prompt_resume(historique: str, max_idees: int = 30) -> str:
+    """Wrapper pour compatibilité avec l'ancien code."""
+    return get_agent("resume").condenser(historique, max_idees)
+
+
 def prompt_plan(idee: str) -> str:
     """Wrapper pour compatibilité avec l'ancien code."""
     return get_agent("application").creer_plan(idee)
@@ -116,6 +131,7 @@ __all__ = [
     "AgentScore",
     "AgentSynthese",
     "AgentApplication",
+    "AgentResume",
     "get_agent",
     "prompt_creatif",
     "prompt_defense",
@@ -123,7 +139,9 @@ __all__ = [
     "prompt_replique",
     "prompt_revision",
     "prompt_score",
+    "prompt_score_lot",
     "prompt_synthese",
+    "prompt_resume",
     "prompt_plan",
     "prompt_critique_plan",
     "prompt_defense_plan",
@@ -31,7 +31,7 @@ class AgentApplication(BaseAgent):
             Le plan de mise en œuvre détaillé
         """
         prompt = PromptRegistry.get_prompt("application", "plan")
-        return self.execute_prompt(prompt, idee=idee)
+        return self.execute_prompt(prompt, step="plan", idee=idee)
 
     def critiquer_plan(self, plan: str) -> str:
         """
@@ -44,7 +44,7 @@ class AgentApplication(BaseAgent):
             L'analyse critique du plan
         """
         prompt = PromptRegistry.get_prompt("application", "critique_plan")
-        return self.execute_prompt(prompt, plan=plan)
+        return self.execute_prompt(prompt, step="critique_plan", plan=plan)
 
     def defendre_plan(self, plan: str, critique: str) -> str:
         """
@@ -58,7 +58,7 @@ class AgentApplication(BaseAgent):
             La défense du plan
         """
         prompt = PromptRegistry.get_prompt("application", "defense_plan")
-        return self.execute_prompt(prompt, plan=plan, critique=critique)
+        return self.execute_prompt(prompt, step="defense_plan", plan=plan, critique=critique)
 
     def reviser_plan(self, plan: str, critique: str) -> str:
         """
@@ -72,7 +72,7 @@ class AgentApplication(BaseAgent):
             Le plan révisé
         """
         prompt = PromptRegistry.get_prompt("application", "revision_plan")
-        return self.execute_prompt(prompt, plan=plan, critique=critique)
+        return self.execute_prompt(prompt, step="revision_plan", plan=plan, critique=critique)
 
 
 # Instance globale pour les fonctions de compatibilité
@@ -4,13 +4,16 @@ Fournit une classe abstraite et des utilitaires communs.
 """
 
 import logging
+import string
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator, List, Optional, Union
 
 import yaml
 
-from ..core.gpt import gpt
+from ..core.config import config
+from ..core.gpt import agpt, gpt, gpt_stream
+from ..core.tokenizer import count_tokens, prompt_token_budget
 
 logger = logging.getLogger(__name__)
 
@@ -28,32 +31,115 @@ class BaseAgent(ABC):
         self.role = role
         self.logger = logging.getLogger(f"agents.{role}")
 
-    def execute_prompt(self, prompt_template: str, **kwargs) -> str:
+    def execute_prompt(
+        self,
+        prompt_template: str,
+        stream: bool = False,
+        step: Optional[str] = None,
+        n: int = 1,
+        **kwargs,
+    ) -> Union[str, List[str], Iterator[str]]:
         """
         Exécute un prompt en remplaçant les variables et en appelant GPT.
 
         Args:
             prompt_template: Template du prompt avec des placeholders
+            stream: Si True, retourne un itérateur sur les fragments de la réponse
+                au lieu du texte final (consommation au fil de l'eau)
+            step: Étape du brainstorm servant au routage du modèle (par défaut le rôle)
+            n: Nombre de réponses candidates demandées en un seul appel
             **kwargs: Variables à substituer dans le template
 
         Returns:
-            La réponse de GPT
+            La réponse de GPT, la liste des réponses si ``n > 1``, ou un itérateur
+            de fragments si ``stream`` est activé
         """
-        # Formater le prompt avec les variables
-        prompt = prompt_template.format(**kwargs)
+        prompt = self._format_prompt(prompt_template, **kwargs)
 
-        # Log du prompt pour debug (tronqué)
-        self.logger.debug(f"Exécution du prompt ({len(prompt)} chars): {prompt[:200]}...")
+        if stream:
+            return gpt_stream(prompt, role=self.role, step=step)
 
         # Appel à GPT
         try:
-            response = gpt(prompt, role=self.role)
+            response = gpt(prompt, role=self.role, step=step, n=n)
+            if isinstance(response, list):
+                self.logger.info(
+                    f"{len(response)} réponses reçues ({sum(map(len, response))} chars)"
+                )
+            else:
+                self.logger.info(f"Réponse reçue ({len(response)} chars)")
+            return response
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'exécution du prompt: {str(e)}")
+            raise
+
+    async def aexecute_prompt(
+        self, prompt_template: str, step: Optional[str] = None, **kwargs
+    ) -> str:
+        """
+        Variante asynchrone de :meth:`execute_prompt` (appel via ``agpt``).
+
+        Args:
+            prompt_template: Template du prompt avec des placeholders
+            step: Étape du brainstorm servant au routage du modèle (par défaut le rôle)
+            **kwargs: Variables à substituer dans le template
+
+        Returns:
+            La réponse de GPT
+        """
+        prompt = self._format_prompt(prompt_template, **kwargs)
+
+        try:
+            response = await agpt(prompt, role=self.role, step=step)
             self.logger.info(f"Réponse reçue ({len(response)} chars)")
             return response
         except Exception as e:
             self.logger.error(f"Erreur lors de l'exécution du prompt: {str(e)}")
             raise
 
+    def render(self, prompt_name: str, **kwargs) -> str:
+        """
+        Construit le prompt d'un des templates de l'agent, sans appeler GPT.
+
+        Sert aux appels différés, par exemple soumis par lots (``core.batch``).
+
+        Args:
+            prompt_name: Le nom du prompt (clé de :meth:`get_prompts`)
+            **kwargs: Variables à substituer dans le template
+
+        Returns:
+            Le prompt formaté
+        """
+        return self.get_prompts()[prompt_name].format(**kwargs)
+
+    def _format_prompt(self, prompt_template: str, **kwargs) -> str:
+        """Formate le template avec les variables et logue le prompt (tronqué)."""
+        prompt = prompt_template.format(**kwargs)
+        self.logger.debug(f"Exécution du prompt ({len(prompt)} chars): {prompt[:200]}...")
+        return prompt
+
+    def available_tokens(self, prompt_template: str, **kwargs) -> int:
+        """
+        Calcule les tokens restants pour les variables non fournies d'un prompt.
+
+        Le prompt est formaté avec les variables données (les autres restent
+        vides) puis compté avec le tokenizer du modèle du rôle ; le résultat est
+        le budget de prompt du rôle diminué de cette partie fixe.
+
+        Args:
+            prompt_template: Template du prompt avec des placeholders
+            **kwargs: Variables déjà connues
+
+        Returns:
+            Le nombre de tokens disponibles pour les variables restantes
+        """
+        fields = {name for _, name, _, _ in string.Formatter().parse(prompt_template) if name}
+        values = dict.fromkeys(fields, "")
+        values.update(kwargs)
+        model = config.get_model_for_role(self.role)
+        fixed = count_tokens(prompt_template.format(**values), model)
+        return max(prompt_token_budget(self.role, model) - fixed, 0)
+
     @abstractmethod
     def get_prompts(self) -> Dict[str, str]:
         """
@@ -146,6 +232,13 @@ Idée : {idee}
 Critique : {critique}
 
 Propose une version améliorée de cette idée qui tient compte des critiques tout en préservant ses points forts."""
+            },
+            "resume": {
+                "condensation": """Tu es un agent de synthèse. Voici les idées proposées lors des cycles précédents :
+
+{historique}
+
+Condense-les en une liste numérotée d'au plus {max_idees} idées distinctes, une phrase courte par idée, sans introduction ni conclusion."""
             },
             "score": {
                 "evaluation": """Tu es un agent d'évaluation. Évalue objectivement cette proposition selon 4 critères :
@@ -158,7 +251,15 @@ Retourne UNIQUEMENT un JSON avec ces scores (1-10) :
     "faisabilite": [score_de_1_a_10],
     "originalite": [score_de_1_a_10],
     "clarte": [score_de_1_a_10]
-}}"""
+}}""",
+                "evaluation_lot": """Tu es un agent d'évaluation. Évalue indépendamment chacune des {nombre} propositions suivantes selon 4 critères :
+
+{idees}
+
+Retourne UNIQUEMENT un tableau JSON de {nombre} objets, un par proposition et dans leur ordre, avec ces scores (1-10) :
+[
+    {{"id": 1, "impact": [score], "faisabilite": [score], "originalite": [score], "clarte": [score]}}
+]""",
             },
             "synthese": {
                 "consolidation": """Tu es un agent de synthèse. Voici toutes les idées révisées :
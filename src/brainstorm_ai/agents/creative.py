@@ -2,6 +2,8 @@
 Agent créatif pour la génération d'idées innovantes.
 """
 
+from ..core.config import config
+from ..core.similarity import select_candidates
 from .base import BaseAgent, PromptRegistry
 
 
@@ -22,6 +24,10 @@ class AgentCreatif(BaseAgent):
         """
         Génère de nouvelles idées créatives.
 
+        Avec ``agents.candidates.n`` > 1, un seul appel produit plusieurs
+        réponses candidates ; les ``keep`` plus nouvelles par rapport à
+        l'historique (et entre elles en sélection ``diverse``) sont conservées.
+
         Args:
             objectif: L'objectif du brainstorming
             contexte: Le contexte du projet
@@ -32,13 +38,40 @@ class AgentCreatif(BaseAgent):
             Les nouvelles idées générées
         """
         prompt = PromptRegistry.get_prompt("creatif", "generation")
-        return self.execute_prompt(
+        candidates = config.get_candidates_config()
+        reponses = self.execute_prompt(
             prompt,
+            n=candidates["n"],
             objectif=objectif,
             contexte=contexte,
             contraintes=contraintes,
             historique=historique,
         )
+        if isinstance(reponses, str):
+            return reponses
+
+        retenues = select_candidates(
+            reponses, [historique], candidates["keep"], candidates["selection"]
+        )
+        self.logger.info(f"{len(retenues)} candidat(s) retenu(s) sur {len(reponses)}")
+        return "\n\n".join(retenues)
+
+    def budget_historique(self, objectif: str, contexte: str, contraintes: str) -> int:
+        """
+        Calcule le nombre de tokens disponibles pour l'historique dans le prompt de génération.
+
+        Args:
+            objectif: L'objectif du brainstorming
+            contexte: Le contexte du projet
+            contraintes: Les contraintes à respecter
+
+        Returns:
+            Le nombre de tokens que l'historique peut occuper
+        """
+        prompt = PromptRegistry.get_prompt("creatif", "generation")
+        return self.available_tokens(
+            prompt, objectif=objectif, contexte=contexte, contraintes=contraintes
+        )
 
     def defendre_idee(self, idee: str, critique: str) -> str:
         """
@@ -52,7 +85,7 @@ class AgentCreatif(BaseAgent):
             La défense de l'idée
         """
         prompt = PromptRegistry.get_prompt("creatif", "defense")
-        return self.execute_prompt(prompt, idee=idee, critique=critique)
+        return self.execute_prompt(prompt, step="defense", idee=idee, critique=critique)
 
 
 # Instance globale pour les fonctions de compatibilité
@@ -76,6 +109,21 @@ def prompt_creatif(objectif: str, contexte: str, contraintes: str, historique: s
     return _agent_creatif.generer_idees(objectif, contexte, contraintes, historique)
 
 
+def budget_historique(objectif: str, contexte: str, contraintes: str) -> int:
+    """
+    Interface de compatibilité pour le budget de tokens de l'historique.
+
+    Args:
+        objectif: L'objectif du brainstorming
+        contexte: Le contexte du projet
+        contraintes: Les contraintes à respecter
+
+    Returns:
+        Le nombre de tokens que l'historique peut occuper
+    """
+    return _agent_creatif.budget_historique(objectif, contexte, contraintes)
+
+
 def prompt_defense(idee: str, critique: str) -> str:
     """
     Interface de compatibilité pour la défense d'idées.
@@ -43,7 +43,7 @@ class AgentCritique(BaseAgent):
             L'évaluation de la défense
         """
         prompt = PromptRegistry.get_prompt("critique", "replique")
-        return self.execute_prompt(prompt, defense=defense, idee=idee)
+        return self.execute_prompt(prompt, step="replique", defense=defense, idee=idee)
 
 
 # Instance globale pour les fonctions de compatibilité
@@ -2,6 +2,8 @@
 Agent de scoring pour l'évaluation objective des idées.
 """
 
+from typing import Any, Dict, List
+
 from .base import BaseAgent, PromptRegistry
 
 
@@ -13,7 +15,10 @@ class AgentScore(BaseAgent):
 
     def get_prompts(self):
         """Retourne les prompts utilisés par l'agent de score."""
-        return {"evaluation": PromptRegistry.get_prompt("score", "evaluation")}
+        return {
+            "evaluation": PromptRegistry.get_prompt("score", "evaluation"),
+            "evaluation_lot": PromptRegistry.get_prompt("score", "evaluation_lot"),
+        }
 
     def evaluer(self, texte: str) -> str:
         """
@@ -28,6 +33,29 @@ class AgentScore(BaseAgent):
         prompt = PromptRegistry.get_prompt("score", "evaluation")
         return self.execute_prompt(prompt, idees=texte)
 
+    @staticmethod
+    def _variables_lot(textes: List[str]) -> Dict[str, Any]:
+        idees = "\n\n".join(f"### Proposition {i}\n{texte}" for i, texte in enumerate(textes, 1))
+        return {"idees": idees, "nombre": len(textes)}
+
+    def evaluer_lot(self, textes: List[str]) -> str:
+        """
+        Évalue plusieurs propositions en un seul appel.
+
+        Args:
+            textes: Les textes/idées à évaluer
+
+        Returns:
+            Un tableau JSON des scores, un objet par proposition (champ ``id``
+            = rang de la proposition à partir de 1)
+        """
+        prompt = PromptRegistry.get_prompt("score", "evaluation_lot")
+        return self.execute_prompt(prompt, step="score", **self._variables_lot(textes))
+
+    def render_lot(self, textes: List[str]) -> str:
+        """Construit le prompt de :meth:`evaluer_lot` sans l'exécuter (appel différé)."""
+        return self.render("evaluation_lot", **self._variables_lot(textes))
+
 
 # Instance globale pour les fonctions de compatibilité
 _agent_score = AgentScore()
@@ -45,3 +73,16 @@ def prompt_score(texte: str) -> str:
         Un JSON avec les scores d'évaluation
     """
     return _agent_score.evaluer(texte)
+
+
+def prompt_score_lot(textes: List[str]) -> str:
+    """
+    Interface de compatibilité pour l'évaluation groupée d'idées.
+
+    Args:
+        textes: Les textes/idées à évaluer
+
+    Returns:
+        Un tableau JSON des scores, un objet par proposition
+    """
+    return _agent_score.evaluer_lot(textes)
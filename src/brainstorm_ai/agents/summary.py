@@ -0,0 +1,49 @@
+"""
+Agent de résumé pour la compaction de l'historique des cycles.
+"""
+
+from .base import BaseAgent, PromptRegistry
+
+
+class AgentResume(BaseAgent):
+    """Agent responsable de la condensation de l'historique en liste d'idées."""
+
+    def __init__(self):
+        super().__init__("resume")
+
+    def get_prompts(self):
+        """Retourne les prompts utilisés par l'agent de résumé."""
+        return {"condensation": PromptRegistry.get_prompt("resume", "condensation")}
+
+    def condenser(self, historique: str, max_idees: int = 30) -> str:
+        """
+        Condense l'historique des créations en une liste numérotée d'idées.
+
+        Args:
+            historique: Les créations (et le résumé précédent) à condenser
+            max_idees: Nombre maximal d'idées conservées
+
+        Returns:
+            La liste numérotée des idées
+        """
+        prompt = PromptRegistry.get_prompt("resume", "condensation")
+        return self.execute_prompt(prompt, historique=historique, max_idees=max_idees)
+
+
+# Instance globale pour les fonctions de compatibilité
+_agent_resume = AgentResume()
+
+
+# Fonction de compatibilité avec l'interface attendue
+def prompt_resume(historique: str, max_idees: int = 30) -> str:
+    """
+    Interface de compatibilité pour la condensation de l'historique.
+
+    Args:
+        historique: Les créations à condenser
+        max_idees: Nombre maximal d'idées conservées
+
+    Returns:
+        La liste numérotée des idées
+    """
+    return _agent_resume.condenser(historique, max_idees)
@@ -3,8 +3,10 @@ import os
 import sys
 from pathlib import Path
 
+from ..core.backends import backend_type, requires_api_key
 from ..core.config import config
 from ..core.loop_manager import run_brainstorm_loop
+from ..core.telemetry import get_step_stats
 
 # Configuration du logging
 log_dir = Path("data/logs")
@@ -31,22 +33,23 @@ except ImportError:
 except Exception as e:
     logger.warning(f"Erreur lors du chargement du fichier .env : {e}")
 
-# Validation de la clé API
+# Validation de la clé API (inutile avec un backend hors-ligne : replay, synthetic)
 api_key = os.getenv("OPENAI_API_KEY")
-if not api_key:
+if not requires_api_key():
+    logger.info(f"Backend hors-ligne '{backend_type()}' : clé API OpenAI non requise")
+elif not api_key:
     logger.error("Clé API OpenAI manquante")
     print("\n❌ ERREUR : Clé API OpenAI non configurée")
     print("👉 Configurez la variable d'environnement OPENAI_API_KEY")
     print("   ou créez un fichier .env avec : OPENAI_API_KEY=votre_clé_ici")
     sys.exit(1)
-
-# Validation du format de la clé API
-if not api_key.startswith(("sk-", "sk-proj-")):
+elif not api_key.startswith(("sk-", "sk-proj-")):
+    # Validation du format de la clé API
     logger.warning("Format de clé API OpenAI potentiellement invalide")
     print("\n⚠️  ATTENTION : Le format de la clé API semble incorrect")
     print("   Les clés OpenAI commencent généralement par 'sk-' ou 'sk-proj-'")
-
-logger.info("Clé API OpenAI configurée avec succès")
+else:
+    logger.info("Clé API OpenAI configurée avec succès")
 
 
 def main():
@@ -63,11 +66,21 @@ def main():
     print(f"{config.get_emoji('contraintes')} Contraintes  : {contraintes}")
     print(f"{config.get_emoji('cycles')} Cycles       : {cycles}")
 
-    # Estimation du coût total
-    cost_estimate = config.estimate_total_cost(cycles, config.top_ideas_count)
+    # Estimation du coût total (à partir des mesures des runs précédents)
+    cost_estimate = config.estimate_total_cost(cycles, config.top_ideas_count, get_step_stats())
     print("\n💰 === ESTIMATION DU COÛT ===")
     print(f"📞 Appels API prévus: {cost_estimate['total_calls']}")
-    print(f"💵 Coût estimé: ${cost_estimate['total_cost']:.4f}")
+    print(
+        f"💵 Coût estimé: ${cost_estimate['total_cost']:.4f} "
+        f"(p90 : ${cost_estimate['total_cost_p90']:.4f})"
+    )
+    if cost_estimate["duration"] is not None:
+        print(
+            f"⏱️ Durée cumulée des appels: {cost_estimate['duration'] / 60:.1f} min "
+            f"(p90 : {cost_estimate['duration_p90'] / 60:.1f} min)"
+        )
+    if not cost_estimate["measured_steps"]:
+        print("ℹ️ Aucune mesure des runs précédents : estimation par défaut")
 
     # Affichage détaillé par modèle si plusieurs
     if len(cost_estimate["estimates"]) > 1:
@@ -14,7 +14,7 @@ from .config import Config, config
 
 # from .loop_manager import run_brainstorm_loop  # Removed to prevent circular import
 from .exporter import export_json, export_markdown, export_yaml
-from .gpt import GPTClient, get_gpt_stats, gpt, reset_gpt_stats
+from .gpt import GPTClient, agpt, get_gpt_stats, gpt, gpt_stream, reset_gpt_stats
 from .progress_tracker import ProgressTracker
 from .types import ApplicationLog, BrainstormLog, CycleLog, ScoreDict
 from .utils import dedupe
@@ -25,6 +25,8 @@ __all__ = [
     "config",
     # GPT
     "gpt",
+    "agpt",
+    "gpt_stream",
     "get_gpt_stats",
     "reset_gpt_stats",
     "GPTClient",
@@ -0,0 +1,744 @@
+"""
+Module des backends de complétion.
+
+Un backend exécute concrètement une requête de complétion pour ``core.gpt``.
+Quatre implémentations sont fournies :
+
+- ``OpenAIBackend`` : appels réels à l'API OpenAI
+- ``RecordingBackend`` : enveloppe un backend et enregistre les réponses dans une cassette
+- ``ReplayBackend`` : rejoue une cassette enregistrée, sans réseau
+- ``SyntheticBackend`` : génère des réponses factices avec latence et tokens paramétrables
+
+Les backends hors-ligne permettent d'exécuter ``run_brainstorm_loop`` sans clé API,
+de façon déterministe, pour mesurer les régressions de performance.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import json
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+Messages = List[Dict[str, str]]
+
+
+class BackendError(Exception):
+    """Exception levée pour les erreurs de backend (configuration, cassette)."""
+
+    pass
+
+
+@dataclass
+class Completion:
+    """Résultat normalisé d'une complétion."""
+
+    content: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    model: str = ""
+    # Toutes les réponses d'un appel à plusieurs choix (option ``n``) ; ``content`` est la première
+    choices: List[str] = field(default_factory=list)
+
+
+@dataclass
+class CompletionChunk:
+    """Fragment d'une complétion en streaming (l'usage n'est connu qu'à la fin)."""
+
+    text: str = ""
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+
+def request_key(model: str, messages: Messages, temperature: float, n: int = 1) -> str:
+    """Clé déterministe d'une requête, utilisée pour indexer les cassettes."""
+    request: Dict[str, Any] = {"model": model, "messages": messages, "temperature": temperature}
+    if n > 1:
+        # Absent pour une réponse unique : les cassettes existantes restent valides
+        request["n"] = n
+    raw = json.dumps(request, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CompletionBackend(ABC):
+    """Interface commune des backends de complétion."""
+
+    name = "base"
+
+    @abstractmethod
+    def complete(
+        self, model: str, messages: Messages, temperature: float, **options: Any
+    ) -> Completion:
+        """Exécute une complétion de façon bloquante."""
+
+    async def acomplete(
+        self, model: str, messages: Messages, temperature: float, **options: Any
+    ) -> Completion:
+        """Exécute une complétion de façon asynchrone (par défaut dans un thread)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.complete(model, messages, temperature, **options)
+        )
+
+    def stream(
+        self, model: str, messages: Messages, temperature: float, **options: Any
+    ) -> Iterator[CompletionChunk]:
+        """Exécute une complétion en streaming (par défaut : un seul fragment)."""
+        completion = self.complete(model, messages, temperature, **options)
+        yield CompletionChunk(text=completion.content)
+        yield CompletionChunk(
+            prompt_tokens=completion.prompt_tokens,
+            completion_tokens=completion.completion_tokens,
+        )
+
+    def close(self) -> None:  # noqa: B027 - optionnel pour les backends sans ressources
+        """Libère les ressources du backend."""
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Retourne les métriques du pool de connexions HTTP ({} sans réseau)."""
+        return {}
+
+
+class PoolMetrics:
+    """
+    Métriques d'utilisation d'un pool de connexions HTTP.
+
+    Les connexions ouvertes et les négociations TLS sont comptées via
+    l'extension ``trace`` de httpcore ; une requête qui n'en déclenche pas a
+    réutilisé une connexion maintenue ouverte.
+    """
+
+    def __init__(self, max_connections: int):
+        self.max_connections = max_connections
+        self._requests = 0
+        self._connections = 0
+        self._tls_handshakes = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._saturated = 0
+        self._lock = threading.Lock()
+
+    def request_started(self) -> None:
+        with self._lock:
+            self._requests += 1
+            if self._in_flight >= self.max_connections:
+                self._saturated += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+    def request_finished(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def trace(self, event_name: str) -> None:
+        """Comptabilise un événement de trace httpcore."""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._connections += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self._tls_handshakes += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Retourne les métriques courantes.
+
+        Returns:
+            Requêtes, connexions ouvertes, négociations TLS, taux de
+            réutilisation des connexions, requêtes en cours et pic, taux
+            d'utilisation maximal du pool et requêtes ayant trouvé le pool saturé
+        """
+        with self._lock:
+            requests, connections = self._requests, self._connections
+            return {
+                "requests": requests,
+                "connections_opened": connections,
+                "tls_handshakes": self._tls_handshakes,
+                "connection_reuse_rate": (
+                    round(max(0.0, 1 - connections / requests), 3) if requests else 0.0
+                ),
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+                "max_connections": self.max_connections,
+                "peak_utilisation": round(min(1.0, self._peak_in_flight / self.max_connections), 3),
+                "saturated_requests": self._saturated,
+            }
+
+
+class OpenAIBackend(CompletionBackend):
+    """
+    Backend appelant l'API OpenAI (clients sync et async créés à la demande).
+
+    Les deux clients partagent la configuration d'un pool de connexions
+    maintenues ouvertes (``api.http_pool``), en HTTP/2 si le paquet ``h2`` est
+    installé : les appels concurrents de tous les agents réutilisent des
+    connexions déjà établies au lieu de renégocier TLS.
+    """
+
+    name = "openai"
+
+    def __init__(
+        self, api_key: str, pool_config: Optional[Dict[str, Any]] = None, **client_options: Any
+    ):
+        """
+        Args:
+            api_key: Clé API OpenAI
+            pool_config: Configuration du pool HTTP (défaut : ``api.http_pool``)
+            **client_options: Options transmises aux clients OpenAI
+        """
+        self.api_key = api_key
+        self.pool_config = pool_config or config.get_http_pool_config()
+        self.client_options = client_options
+        self.metrics = PoolMetrics(self.pool_config["max_connections"])
+        self._client = None
+        self._async_client = None
+        self._lock = threading.Lock()
+
+    def _http_client_options(self) -> Dict[str, Any]:
+        """Options communes des clients httpx (limites du pool, HTTP/2)."""
+        import httpx
+
+        http2 = self.pool_config["http2"] and importlib.util.find_spec("h2") is not None
+        if self.pool_config["http2"] and not http2:
+            logger.debug("Paquet h2 absent : connexions HTTP/1.1")
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.pool_config["max_connections"],
+                max_keepalive_connections=self.pool_config["max_keepalive_connections"],
+                keepalive_expiry=self.pool_config["keepalive_expiry"],
+            ),
+            "http2": http2,
+            "follow_redirects": True,
+        }
+
+    @property
+    def client(self):
+        """Retourne le client OpenAI synchrone."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import httpx
+                    from openai import OpenAI
+
+                    def trace(event_name: str, _info: Dict[str, Any]) -> None:
+                        self.metrics.trace(event_name)
+
+                    def on_request(request: Any) -> None:
+                        request.extensions["trace"] = trace
+
+                    http_client = httpx.Client(
+                        event_hooks={"request": [on_request]}, **self._http_client_options()
+                    )
+                    self._client = OpenAI(
+                        api_key=self.api_key, http_client=http_client, **self.client_options
+                    )
+                    logger.info("Client OpenAI initialisé avec succès")
+        return self._client
+
+    @property
+    def async_client(self):
+        """Retourne le client OpenAI asynchrone."""
+        if self._async_client is None:
+            with self._lock:
+                if self._async_client is None:
+                    import httpx
+                    from openai import AsyncOpenAI
+
+                    async def trace(event_name: str, _info: Dict[str, Any]) -> None:
+                        self.metrics.trace(event_name)
+
+                    async def on_request(request: Any) -> None:
+                        request.extensions["trace"] = trace
+
+                    http_client = httpx.AsyncClient(
+                        event_hooks={"request": [on_request]}, **self._http_client_options()
+                    )
+                    self._async_client = AsyncOpenAI(
+                        api_key=self.api_key, http_client=http_client, **self.client_options
+                    )
+                    logger.info("Client OpenAI asynchrone initialisé avec succès")
+        return self._async_client
+
+    @staticmethod
+    def _to_completion(response: Any, model: str) -> Completion:
+        usage = response.usage
+        choices = [choice.message.content or "" for choice in response.choices]
+        return Completion(
+            content=choices[0],
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            model=getattr(response, "model", None) or model,
+            choices=choices if len(choices) > 1 else [],
+        )
+
+    def complete(
+        self, model: str, messages: Messages, temperature: float, **options: Any
+    ) -> Completion:
+        client = self.client
+        self.metrics.request_started()
+        try:
+            response = client.chat.completions.create(
+                model=model, messages=messages, temperature=temperature, **options
+            )
+        finally:
+            self.metrics.request_finished()
+        return self._to_completion(response, model)
+
+    async def acomplete(
+        self, model: str, messages: Messages, temperature: float, **options: Any
+    ) -> Completion:
+        client = self.async_client
+        self.metrics.request_started()
+        try:
+            response = await client.chat.completions.create(
+                model=model, messages=messages, temperature=temperature, **options
+            )
+        finally:
+            self.metrics.request_finished()
+        return self._to_completion(response, model)
+
+    def stream(
+        self, model: str, messages: Messages, temperature: float, **options: Any
+    ) -> Iterator[CompletionChunk]:
+        client = self.client
+        self.metrics.request_started()
+        try:
+            stream = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=True,
+                stream_options={"include_usage": True},
+                **options,
+            )
+        except Exception:
+            self.metrics.request_finished()
+            raise
+        try:
+            for chunk in stream:
+                usage = getattr(chunk, "usage", None)
+                if usage:
+                    yield CompletionChunk(
+                        prompt_tokens=usage.prompt_tokens,
+                        completion_tokens=usage.completion_tokens,
+                    )
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield CompletionChunk(text=chunk.choices[0].delta.content)
+        finally:
+            self.metrics.request_finished()
+            if hasattr(stream, "close"):
+                stream.close()
+
+    def close(self) -> None:
+        # Le client asynchrone se ferme via ``await close()`` depuis sa boucle d'événements
+        if self._client is not None:
+            self._client.close()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self.metrics.snapshot()
+
+
+class LatencyModel:
+    """
+    Modèle de latence d'une complétion simulée.
+
+    latence = temps jusqu'au premier token (tiré selon la distribution)
+              + completion_tokens * per_token
+    """
+
+    def __init__(
+        self,
+        distribution: str = "fixed",
+        mean: float = 0.0,
+        sigma: float = 0.0,
+        per_token: float = 0.0,
+    ):
+        if distribution not in ("fixed", "uniform", "normal", "lognormal"):
+            raise BackendError(f"Distribution de latence inconnue : {distribution}")
+        self.distribution = distribution
+        self.mean = mean
+        self.sigma = sigma
+        self.per_token = per_token
+
+    @classmethod
+    def from_config(cls, latency_config: Optional[Dict[str, Any]]) -> "LatencyModel":
+        latency_config = latency_config or {}
+        return cls(
+            distribution=latency_config.get("distribution", "fixed"),
+            mean=latency_config.get("mean", 0.0),
+            sigma=latency_config.get("sigma", 0.0),
+            per_token=latency_config.get("per_token", 0.0),
+        )
+
+    def first_token_delay(self, rng: random.Random) -> float:
+        """Tire le temps jusqu'au premier token."""
+        if self.distribution == "fixed" or self.mean <= 0:
+            return max(0.0, self.mean)
+        if self.distribution == "uniform":
+            return rng.uniform(max(0.0, self.mean - self.sigma), self.mean + self.sigma)
+        if self.distribution == "normal":
+            return max(0.0, rng.gauss(self.mean, self.sigma))
+        # lognormal paramétrée par sa moyenne et l'écart-type du log
+        mu = math.log(self.mean) - self.sigma**2 / 2
+        return rng.lognormvariate(mu, self.sigma)
+
+    def total_delay(self, rng: random.Random, completion_tokens: int) -> float:
+        return self.first_token_delay(rng) + completion_tokens * self.per_token
+
+
+# Demande d'évaluation groupée (prompt ``score.evaluation_lot``)
+_SCORE_BATCH = re.compile(r"tableau JSON de (\d+)")
+
+
+class SyntheticBackend(CompletionBackend):
+    """
+    Backend factice déterministe.
+
+    Les réponses ont la forme attendue par le pipeline : un JSON de scores
+    quand le prompt demande du JSON, sinon une liste numérotée d'idées.
+    """
+
+    name = "synthetic"
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        min_completion_tokens: int = 300,
+        max_completion_tokens: int = 900,
+        seed: int = 42,
+        score_keys: Optional[List[str]] = None,
+    ):
+        self.latency = latency or LatencyModel()
+        self.min_completion_tokens = min_completion_tokens
+        self.max_completion_tokens = max(min_completion_tokens, max_completion_tokens)
+        self.seed = seed
+        self.score_keys = score_keys or ["impact", "faisabilite", "originalite", "clarte"]
+
+    def _rng(self, key: str) -> random.Random:
+        # Graine dérivée du seul contenu de la requête : la réponse ne dépend pas
+        # de l'ordre d'arrivée des appels concurrents
+        return random.Random(f"{self.seed}:{key}")
+
+    def _content(self, prompt: str, rng: random.Random) -> str:
+        batch = _SCORE_BATCH.search(prompt)
+        if batch:
+            # Évaluation groupée : un objet de scores par proposition
+            scores = [
+                {"id": i, **{key: rng.randint(4, 9) for key in self.score_keys}}
+                for i in range(1, int(batch.group(1)) + 1)
+            ]
+            return json.dumps(scores)
+        if "JSON" in prompt:
+            scores = {key: rng.randint(4, 9) for key in self.score_keys}
+            return json.dumps(scores)
+
+        target_tokens = rng.randint(self.min_completion_tokens, self.max_completion_tokens)
+        lines = []
+        index = 1
+        while sum(len(line) for line in lines) // 4 < target_tokens:
+            words = " ".join(f"concept{rng.randint(1, 500)}" for _ in range(12))
+            lines.append(f"{index}. Idée synthétique {index} : {words}")
+            index += 1
+        return "\n".join(lines)
+
+    def _generate(
+        self, model: str, messages: Messages, temperature: float, n: int = 1
+    ) -> Tuple[Completion, random.Random]:
+        prompt = "\n".join(m.get("content", "") for m in messages)
+        rng = self._rng(request_key(model, messages, temperature, n))
+        prompt_tokens = max(1, len(prompt) // 4)
+
+        # Plusieurs choix partagent le prompt : seuls les tokens de complétion s'additionnent
+        choices = [self._content(prompt, rng) for _ in range(max(1, n))]
+        return Completion(
+            content=choices[0],
+            prompt_tokens=prompt_tokens,
+            completion_tokens=sum(max(1, len(choice) // 4) for choice in choices),
+            model=model,
+            choices=choices if len(choices) > 1 else [],
+        ), rng
+
+    def complete(
+        self, model: str, messages: Messages, temperature: float, **options: Any
+    ) -> Completion:
+        completion, rng = self._generate(model, messages, temperature, options.get("n", 1))
+        # Les choix sont générés en parallèle : la latence est celle du plus long
+        longest = max(1, len(max(completion.choices or [completion.content], key=len)) // 4)
+        time.sleep(self.latency.total_delay(rng, longest))
+        return completion
+
+    async def acomplete(
+        self, model: str, messages: Messages, temperature: float, **options: Any
+    ) -> Completion:
+        completion, rng = self._generate(model, messages, temperature, options.get("n", 1))
+        longest = max(1, len(max(completion.choices or [completion.content], key=len)) // 4)
+        await asyncio.sleep(self.latency.total_delay(rng, longest))
+        return completion
+
+    def stream(
+        self, model: str, messages: Messages, temperature: float, **_options: Any
+    ) -> Iterator[CompletionChunk]:
+        completion, rng = self._generate(model, messages, temperature)
+        time.sleep(self.latency.first_token_delay(rng))
+        for line in completion.content.splitlines(keepends=True):
+            time.sleep(self.latency.per_token * max(1, len(line) // 4))
+            yield CompletionChunk(text=line)
+        yield CompletionChunk(
+            prompt_tokens=completion.prompt_tokens,
+            completion_tokens=completion.completion_tokens,
+        )
+
+
+class RecordingBackend(CompletionBackend):
+    """Enveloppe un backend et enregistre chaque réponse dans une cassette JSONL."""
+
+    name = "record"
+
+    def __init__(self, inner: CompletionBackend, cassette_path: str):
+        self.inner = inner
+        self.cassette_path = Path(cassette_path)
+        self.cassette_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        logger.info(f"Enregistrement des réponses dans {self.cassette_path}")
+
+    def _record(
+        self,
+        model: str,
+        messages: Messages,
+        temperature: float,
+        completion: Completion,
+        latency: float,
+        n: int = 1,
+    ) -> None:
+        entry = {
+            "key": request_key(model, messages, temperature, n),
+            "model": model,
+            "temperature": temperature,
+            "messages": messages,
+            "content": completion.content,
+            "prompt_tokens": completion.prompt_tokens,
+            "completion_tokens": completion.completion_tokens,
+            "latency": round(latency, 4),
+        }
+        if completion.choices:
+            entry["choices"] = completion.choices
+        with self._lock, open(self.cassette_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def complete(
+        self, model: str, messages: Messages, temperature: float, **options: Any
+    ) -> Completion:
+        started_at = time.monotonic()
+        completion = self.inner.complete(model, messages, temperature, **options)
+        self._record(
+            model,
+            messages,
+            temperature,
+            completion,
+            time.monotonic() - started_at,
+            options.get("n", 1),
+        )
+        return completion
+
+    async def acomplete(
+        self, model: str, messages: Messages, temperature: float, **options: Any
+    ) -> Completion:
+        started_at = time.monotonic()
+        completion = await self.inner.acomplete(model, messages, temperature, **options)
+        self._record(
+            model,
+            messages,
+            temperature,
+            completion,
+            time.monotonic() - started_at,
+            options.get("n", 1),
+        )
+        return completion
+
+    def stream(
+        self, model: str, messages: Messages, temperature: float, **options: Any
+    ) -> Iterator[CompletionChunk]:
+        started_at = time.monotonic()
+        parts: List[str] = []
+        completion = Completion(content="", model=model)
+        for chunk in self.inner.stream(model, messages, temperature, **options):
+            if chunk.text:
+                parts.append(chunk.text)
+            if chunk.prompt_tokens is not None:
+                completion.prompt_tokens = chunk.prompt_tokens
+                completion.completion_tokens = chunk.completion_tokens or 0
+            yield chunk
+        completion.content = "".join(parts)
+        self._record(model, messages, temperature, completion, time.monotonic() - started_at)
+
+    def close(self) -> None:
+        self.inner.close()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self.inner.pool_stats()
+
+
+class ReplayBackend(CompletionBackend):
+    """
+    Rejoue les réponses d'une cassette.
+
+    Les requêtes identiques enregistrées plusieurs fois sont rejouées dans
+    l'ordre d'enregistrement (puis en boucle). Une requête absente de la
+    cassette lève une ``BackendError`` ou est déléguée au backend de secours.
+    """
+
+    name = "replay"
+
+    def __init__(
+        self,
+        cassette_path: str,
+        fallback: Optional[CompletionBackend] = None,
+        latency: Optional[LatencyModel] = None,
+        use_recorded_latency: bool = False,
+    ):
+        self.cassette_path = Path(cassette_path)
+        self.fallback = fallback
+        self.latency = latency or LatencyModel()
+        self.use_recorded_latency = use_recorded_latency
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(0)
+        self._load()
+
+    def _load(self) -> None:
+        if not self.cassette_path.exists():
+            raise BackendError(f"Cassette introuvable : {self.cassette_path}")
+        with open(self.cassette_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry["key"], []).append(entry)
+        count = sum(len(entries) for entries in self._entries.values())
+        logger.info(f"Cassette chargée : {count} réponses depuis {self.cassette_path}")
+
+    def _lookup(
+        self, model: str, messages: Messages, temperature: float, n: int = 1
+    ) -> Optional[dict]:
+        key = request_key(model, messages, temperature, n)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return entries[position % len(entries)]
+
+    def _delay(self, entry: Dict[str, Any]) -> float:
+        if self.use_recorded_latency:
+            return entry.get("latency", 0.0)
+        with self._lock:
+            return self.latency.total_delay(self._rng, entry.get("completion_tokens", 0))
+
+    @staticmethod
+    def _to_completion(entry: Dict[str, Any]) -> Completion:
+        return Completion(
+            content=entry["content"],
+            prompt_tokens=entry.get("prompt_tokens", 0),
+            completion_tokens=entry.get("completion_tokens", 0),
+            model=entry.get("model", ""),
+            choices=entry.get("choices", []),
+        )
+
+    def _missing(self, model: str) -> None:
+        if self.fallback is None:
+            raise BackendError(f"Requête absente de la cassette ({model}) : {self.cassette_path}")
+        logger.debug(f"Requête absente de la cassette, délégation à {self.fallback.name}")
+
+    def complete(
+        self, model: str, messages: Messages, temperature: float, **options: Any
+    ) -> Completion:
+        entry = self._lookup(model, messages, temperature, options.get("n", 1))
+        if entry is None:
+            self._missing(model)
+            return self.fallback.complete(model, messages, temperature, **options)
+        time.sleep(self._delay(entry))
+        return self._to_completion(entry)
+
+    async def acomplete(
+        self, model: str, messages: Messages, temperature: float, **options: Any
+    ) -> Completion:
+        entry = self._lookup(model, messages, temperature, options.get("n", 1))
+        if entry is None:
+            self._missing(model)
+            return await self.fallback.acomplete(model, messages, temperature, **options)
+        await asyncio.sleep(self._delay(entry))
+        return self._to_completion(entry)
+
+
+def backend_type() -> str:
+    """Type de backend configuré (la variable ``BRAINSTORM_BACKEND`` est prioritaire)."""
+    return os.environ.get("BRAINSTORM_BACKEND") or config.get("api.backend.type", "openai")
+
+
+def requires_api_key(kind: Optional[str] = None) -> bool:
+    """Indique si le backend configuré appelle l'API réelle."""
+    return (kind or backend_type()) in ("openai", "record")
+
+
+def _synthetic_from_config(backend_config: Dict[str, Any]) -> SyntheticBackend:
+    synthetic = backend_config.get("synthetic", {}) or {}
+    tokens = synthetic.get("completion_tokens", {}) or {}
+    return SyntheticBackend(
+        latency=LatencyModel.from_config(synthetic.get("latency")),
+        min_completion_tokens=tokens.get("min", 300),
+        max_completion_tokens=tokens.get("max", 900),
+        seed=synthetic.get("seed", 42),
+        score_keys=config.get_score_validation_config().get("required_keys"),
+    )
+
+
+def create_backend(api_key: Optional[str] = None, **client_options: Any) -> CompletionBackend:
+    """
+    Construit le backend décrit par ``api.backend`` dans la configuration.
+
+    Args:
+        api_key: Clé API OpenAI (requise pour les types ``openai`` et ``record``)
+        **client_options: Options transmises au client OpenAI
+
+    Raises:
+        BackendError: Si le type de backend est inconnu
+    """
+    backend_config = config.get("api.backend", {}) or {}
+    kind = backend_type()
+    cassette = backend_config.get("cassette", "data/cache/cassette.jsonl")
+
+    if kind == "openai":
+        return OpenAIBackend(api_key, **client_options)
+    if kind == "record":
+        return RecordingBackend(OpenAIBackend(api_key, **client_options), cassette)
+    if kind == "synthetic":
+        return _synthetic_from_config(backend_config)
+    if kind == "replay":
+        replay = backend_config.get("replay", {}) or {}
+        fallback = (
+            _synthetic_from_config(backend_config)
+            if replay.get("fallback", "synthetic") == "synthetic"
+            else None
+        )
+        synthetic = backend_config.get("synthetic", {}) or {}
+        return ReplayBackend(
+            cassette,
+            fallback=fallback,
+            latency=LatencyModel.from_config(synthetic.get("latency")),
+            use_recorded_latency=replay.get("use_recorded_latency", False),
+        )
+    raise BackendError(f"Type de backend inconnu : {kind}")
@@ -0,0 +1,398 @@
+"""
+Module d'exécution par lot (API Batch) des appels indépendants d'une phase.
+
+Pour les runs non interactifs (ex: traitements de nuit), les appels d'une
+même phase qui ne dépendent pas les uns des autres (plans de toutes les
+idées, scores de toutes les révisions...) sont écrits dans un fichier de
+soumission JSONL au format de l'API Batch d'OpenAI, soumis en une fois puis
+suivis jusqu'à leur achèvement. Le tarif par token d'un lot est réduit
+(``api.batch.discount``) en échange d'une latence de plusieurs minutes à
+plusieurs heures.
+
+Deux serveurs de lots sont fournis :
+
+- ``OpenAIBatchServer`` : API Batch d'OpenAI (fichiers + ``batches``)
+- ``LocalBatchServer`` : serveur local de substitution qui exécute le fichier
+  de soumission avec le backend de complétion configuré (synthetic, replay),
+  pour tester le mode lot sans réseau
+
+Les requêtes en échec dans le lot sont rejouées en appels interactifs.
+"""
+
+import itertools
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .backends import CompletionBackend, backend_type
+from .budget import get_budget_guard
+from .config import config
+from .gpt import (
+    BudgetExceededError,
+    DeadlineExceededError,
+    get_gpt_client,
+    gpt,
+    run_deadline_exceeded,
+)
+
+logger = logging.getLogger(__name__)
+
+# Point d'accès des requêtes d'un lot
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# États finaux d'un lot (vocabulaire de l'API Batch)
+ETATS_FINAUX = ("completed", "failed", "expired", "cancelled")
+
+# Premier intervalle de suivi d'un lot, doublé jusqu'à ``api.batch.poll_interval``
+PREMIER_SUIVI = 1.0
+
+
+@dataclass
+class BatchRequest:
+    """Appel différé d'un lot."""
+
+    custom_id: str
+    prompt: str
+    role: str
+    step: Optional[str] = None
+
+
+class BatchServer(ABC):
+    """Interface commune des serveurs de lots."""
+
+    name = "base"
+
+    @abstractmethod
+    def submit(self, input_path: Path) -> str:
+        """Soumet un fichier de requêtes JSONL et retourne l'identifiant du lot."""
+
+    @abstractmethod
+    def status(self, batch_id: str) -> str:
+        """Retourne l'état du lot (``validating``, ``in_progress``, ``completed``...)."""
+
+    @abstractmethod
+    def results(self, batch_id: str) -> List[Dict[str, Any]]:
+        """Retourne les lignes de résultat (succès et erreurs) d'un lot terminé."""
+
+    def cancel(self, batch_id: str) -> None:  # noqa: B027 - annulation facultative
+        """Annule un lot en cours."""
+
+
+class OpenAIBatchServer(BatchServer):
+    """Soumission des lots à l'API Batch d'OpenAI."""
+
+    name = "openai"
+
+    def __init__(self, client: Any, completion_window: str = "24h"):
+        """
+        Args:
+            client: Client OpenAI synchrone
+            completion_window: Délai d'exécution demandé pour le lot
+        """
+        self.client = client
+        self.completion_window = completion_window
+
+    def submit(self, input_path: Path) -> str:
+        with open(input_path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def results(self, batch_id: str) -> List[Dict[str, Any]]:
+        batch = self.client.batches.retrieve(batch_id)
+        lines: List[Dict[str, Any]] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = self.client.files.content(file_id).text
+                lines.extend(json.loads(line) for line in content.splitlines() if line.strip())
+        return lines
+
+    def cancel(self, batch_id: str) -> None:
+        self.client.batches.cancel(batch_id)
+
+
+class LocalBatchServer(BatchServer):
+    """
+    Serveur de lots local, substitut hors-ligne de l'API Batch.
+
+    Chaque lot est exécuté en arrière-plan avec un backend de complétion ; les
+    résultats sont écrits dans un fichier JSONL au format de sortie de l'API
+    Batch, à côté du fichier de soumission.
+    """
+
+    name = "local"
+
+    def __init__(self, backend: CompletionBackend, workers: int = 8):
+        """
+        Args:
+            backend: Backend exécutant les requêtes (ex: ``SyntheticBackend``)
+            workers: Requêtes d'un lot exécutées simultanément
+        """
+        self.backend = backend
+        self.workers = max(1, workers)
+        self._batches: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, input_path: Path) -> str:
+        with open(input_path, encoding="utf-8") as f:
+            requests = [json.loads(line) for line in f if line.strip()]
+        batch_id = f"batch_local_{next(self._ids)}"
+        output_path = input_path.with_name(f"{input_path.stem}_output.jsonl")
+        with self._lock:
+            self._batches[batch_id] = {"status": "validating", "output_path": output_path}
+        threading.Thread(
+            target=self._run, args=(batch_id, requests, output_path), daemon=True
+        ).start()
+        return batch_id
+
+    def _execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        body = request["body"]
+        try:
+            completion = self.backend.complete(
+                body["model"], body["messages"], body.get("temperature", 1.0)
+            )
+        except Exception as e:
+            return {
+                "custom_id": request["custom_id"],
+                "response": None,
+                "error": {"code": type(e).__name__, "message": str(e)},
+            }
+        return {
+            "custom_id": request["custom_id"],
+            "response": {
+                "status_code": 200,
+                "body": {
+                    "model": completion.model or body["model"],
+                    "choices": [{"message": {"role": "assistant", "content": completion.content}}],
+                    "usage": {
+                        "prompt_tokens": completion.prompt_tokens,
+                        "completion_tokens": completion.completion_tokens,
+                        "total_tokens": completion.prompt_tokens + completion.completion_tokens,
+                    },
+                },
+            },
+            "error": None,
+        }
+
+    def _run(self, batch_id: str, requests: List[Dict[str, Any]], output_path: Path) -> None:
+        self._set_status(batch_id, "in_progress")
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch") as executor:
+            lines = list(executor.map(self._execute, requests))
+        with open(output_path, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        with self._lock:
+            if self._batches[batch_id]["status"] != "cancelled":
+                self._batches[batch_id]["status"] = "completed"
+
+    def _set_status(self, batch_id: str, status: str) -> None:
+        with self._lock:
+            self._batches[batch_id]["status"] = status
+
+    def status(self, batch_id: str) -> str:
+        with self._lock:
+            return self._batches[batch_id]["status"]
+
+    def results(self, batch_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            output_path = self._batches[batch_id]["output_path"]
+        if not output_path.exists():
+            return []
+        with open(output_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def cancel(self, batch_id: str) -> None:
+        self._set_status(batch_id, "cancelled")
+
+
+class BatchRunner:
+    """Soumet des lots de requêtes, suit leur exécution et comptabilise leur usage."""
+
+    def __init__(
+        self,
+        server: BatchServer,
+        workdir: str = "data/cache/batches",
+        poll_interval: float = 30.0,
+        timeout: Optional[float] = None,
+        discount: float = 0.5,
+    ):
+        """
+        Args:
+            server: Serveur de lots
+            workdir: Répertoire des fichiers de soumission et de résultats
+            poll_interval: Intervalle maximal (s) entre deux consultations de l'état
+            timeout: Attente maximale (s) d'un lot avant de repasser en appels
+                interactifs (None = jusqu'à l'expiration du lot)
+            discount: Coefficient appliqué au tarif des tokens d'un lot
+        """
+        self.server = server
+        self.workdir = Path(workdir)
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.discount = discount
+        self._submissions = itertools.count(1)
+
+    def _write_submission(self, requests: List[BatchRequest], models: Dict[str, str]) -> Path:
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        name = f"batch_{time.strftime('%Y%m%d_%H%M%S')}_{next(self._submissions)}.jsonl"
+        input_path = self.workdir / name
+        with open(input_path, "w", encoding="utf-8") as f:
+            for request in requests:
+                line = {
+                    "custom_id": request.custom_id,
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": {
+                        "model": models[request.custom_id],
+                        "messages": [{"role": "user", "content": request.prompt}],
+                        "temperature": config.get_temperature_for_role(request.role),
+                    },
+                }
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        return input_path
+
+    def _wait(self, batch_id: str) -> str:
+        """
+        Attend la fin d'un lot.
+
+        Returns:
+            L'état final du lot, ou ``timeout`` si l'attente maximale est dépassée
+
+        Raises:
+            DeadlineExceededError: Si l'échéance du run est dépassée (le lot est annulé)
+        """
+        started_at = time.monotonic()
+        delay = min(PREMIER_SUIVI, self.poll_interval)
+        while True:
+            status = self.server.status(batch_id)
+            if status in ETATS_FINAUX:
+                return status
+            if run_deadline_exceeded():
+                self.server.cancel(batch_id)
+                raise DeadlineExceededError(f"Échéance du run dépassée, lot {batch_id} annulé")
+            if self.timeout is not None and time.monotonic() - started_at > self.timeout:
+                self.server.cancel(batch_id)
+                return "timeout"
+            time.sleep(delay)
+            delay = min(delay * 2, self.poll_interval)
+
+    def _record(self, model: str, body: Dict[str, Any]) -> None:
+        usage = body.get("usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        cost = config.calculate_cost(model, prompt_tokens, completion_tokens) * self.discount
+        get_gpt_client().add_usage(prompt_tokens, completion_tokens, cost)
+
+    def run(self, requests: List[BatchRequest]) -> Dict[str, str]:
+        """
+        Exécute un lot de requêtes indépendantes.
+
+        Args:
+            requests: Les requêtes du lot (``custom_id`` uniques)
+
+        Returns:
+            La réponse de chaque requête, par ``custom_id``
+
+        Raises:
+            BudgetExceededError: Si le plafond de budget du run est atteint
+            DeadlineExceededError: Si l'échéance du run est dépassée
+        """
+        if not requests:
+            return {}
+        if run_deadline_exceeded():
+            raise DeadlineExceededError("Échéance du run dépassée, lot refusé")
+        guard = get_budget_guard()
+        if guard.exceeded:
+            raise BudgetExceededError(
+                f"Budget du run épuisé (${guard.spent_cost:.4f}, {guard.spent_tokens} tokens), "
+                "lot refusé"
+            )
+
+        by_id = {request.custom_id: request for request in requests}
+        models = {
+            request.custom_id: guard.model_for(
+                config.get_route_models(request.step or request.role, request.role)[0]
+            )
+            for request in requests
+        }
+        input_path = self._write_submission(requests, models)
+        batch_id = self.server.submit(input_path)
+        logger.info(f"Lot {batch_id} soumis ({len(requests)} requêtes, serveur {self.server.name})")
+
+        started_at = time.monotonic()
+        status = self._wait(batch_id)
+        logger.info(f"Lot {batch_id} {status} en {time.monotonic() - started_at:.1f}s")
+
+        responses: Dict[str, str] = {}
+        if status == "completed":
+            for line in self.server.results(batch_id):
+                custom_id = line.get("custom_id")
+                response = line.get("response") or {}
+                if custom_id not in by_id or response.get("status_code") != 200:
+                    continue
+                body = response["body"]
+                responses[custom_id] = body["choices"][0]["message"]["content"] or ""
+                self._record(models[custom_id], body)
+
+        # Les requêtes en échec (ou d'un lot non terminé) sont rejouées une à une
+        missing = [request for request in requests if request.custom_id not in responses]
+        if missing:
+            logger.warning(f"Lot {batch_id} : {len(missing)} requête(s) rejouée(s) en interactif")
+        for request in missing:
+            responses[request.custom_id] = gpt(request.prompt, role=request.role, step=request.step)
+        return responses
+
+
+# Instance globale (initialisation lazy)
+_batch_runner: Optional[BatchRunner] = None
+_batch_lock = threading.Lock()
+
+
+def _create_server(batch_config: Dict[str, Any]) -> BatchServer:
+    server = batch_config["server"]
+    if server == "auto":
+        server = "local" if backend_type() in ("synthetic", "replay") else "openai"
+    if server == "local":
+        return LocalBatchServer(get_gpt_client().backend, batch_config["local_workers"])
+    return OpenAIBatchServer(get_gpt_client().client, batch_config["completion_window"])
+
+
+def get_batch_runner() -> BatchRunner:
+    """Retourne l'exécuteur de lots configuré sous ``api.batch``."""
+    global _batch_runner
+    if _batch_runner is None:
+        with _batch_lock:
+            if _batch_runner is None:
+                batch_config = config.get_batch_config()
+                _batch_runner = BatchRunner(
+                    _create_server(batch_config),
+                    workdir=batch_config["workdir"],
+                    poll_interval=batch_config["poll_interval"],
+                    timeout=batch_config["timeout"],
+                    discount=batch_config["discount"],
+                )
+    return _batch_runner
+
+
+def batch_enabled() -> bool:
+    """Indique si les phases du brainstorm s'exécutent par lots (``api.batch.enabled``)."""
+    return bool(config.get_batch_config()["enabled"])
+
+
+def run_batch(requests: List[BatchRequest]) -> Dict[str, str]:
+    """Exécute un lot de requêtes avec l'exécuteur global (voir :meth:`BatchRunner.run`)."""
+    return get_batch_runner().run(requests)
@@ -0,0 +1,133 @@
+"""
+Module de contrôle du budget (coût et tokens) pendant un brainstorm.
+
+Le garde-budget est alimenté en temps réel par ``GPTClient.add_usage``. Au-delà
+d'une fraction du budget, il passe en mode dégradé (modèle économique pour les
+appels restants, étapes optionnelles sautées) ; une fois le plafond atteint,
+les appels suivants sont refusés et le run s'arrête avec des exports partiels.
+"""
+
+import logging
+import threading
+from typing import Iterable, Optional
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetGuard:
+    """Suivi thread-safe des dépenses d'un run par rapport à son budget."""
+
+    def __init__(
+        self,
+        max_cost: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        degrade_at: float = 0.8,
+        fallback_model: Optional[str] = None,
+        skip_steps: Iterable[str] = (),
+    ):
+        """
+        Args:
+            max_cost: Plafond de dépense en dollars (None = illimité)
+            max_tokens: Plafond de tokens (None = illimité)
+            degrade_at: Fraction du budget à partir de laquelle le mode dégradé s'active
+            fallback_model: Modèle utilisé en mode dégradé (None = modèles inchangés)
+            skip_steps: Étapes optionnelles sautées en mode dégradé
+        """
+        self.max_cost = max_cost
+        self.max_tokens = max_tokens
+        self.degrade_at = degrade_at
+        self.fallback_model = fallback_model
+        self.skip_steps = frozenset(skip_steps)
+        self.spent_cost = 0.0
+        self.spent_tokens = 0
+        self._degraded = False
+        self._exceeded = False
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Vrai si un plafond est configuré."""
+        return self.max_cost is not None or self.max_tokens is not None
+
+    def usage_ratio(self) -> float:
+        """Fraction consommée du budget le plus contraignant (0 si aucun plafond)."""
+        ratios = [0.0]
+        if self.max_cost:
+            ratios.append(self.spent_cost / self.max_cost)
+        if self.max_tokens:
+            ratios.append(self.spent_tokens / self.max_tokens)
+        return max(ratios)
+
+    def record(self, cost: float, tokens: int) -> None:
+        """Comptabilise un appel et met à jour l'état du budget."""
+        if not self.active:
+            return
+        with self._lock:
+            self.spent_cost += cost
+            self.spent_tokens += tokens
+            ratio = self.usage_ratio()
+            if ratio >= 1.0 and not self._exceeded:
+                self._exceeded = True
+                logger.error(
+                    f"Budget dépassé : ${self.spent_cost:.4f} / {self.spent_tokens} tokens "
+                    f"(plafonds : {self.max_cost} $ / {self.max_tokens} tokens)"
+                )
+            elif ratio >= self.degrade_at and not self._degraded:
+                self._degraded = True
+                logger.warning(
+                    f"{ratio:.0%} du budget consommé : mode économique "
+                    f"(modèle {self.fallback_model or 'inchangé'}, "
+                    f"étapes sautées : {', '.join(sorted(self.skip_steps)) or 'aucune'})"
+                )
+
+    @property
+    def degraded(self) -> bool:
+        """Vrai si le mode économique est actif."""
+        return self._degraded or self._exceeded
+
+    @property
+    def exceeded(self) -> bool:
+        """Vrai si le plafond est atteint."""
+        return self._exceeded
+
+    def model_for(self, model: str) -> str:
+        """Retourne le modèle à utiliser compte tenu de l'état du budget."""
+        if self.degraded and self.fallback_model:
+            return self.fallback_model
+        return model
+
+    def should_skip(self, step: str) -> bool:
+        """Indique si une étape optionnelle doit être sautée pour économiser le budget."""
+        return self.degraded and step in self.skip_steps
+
+    def reset(self) -> None:
+        """Remet les dépenses à zéro (nouveau run)."""
+        with self._lock:
+            self.spent_cost = 0.0
+            self.spent_tokens = 0
+            self._degraded = False
+            self._exceeded = False
+
+
+# Instance globale (initialisation lazy)
+_budget_guard: Optional[BudgetGuard] = None
+_budget_guard_lock = threading.Lock()
+
+
+def get_budget_guard() -> BudgetGuard:
+    """Retourne le garde-budget configuré sous ``api.budget``."""
+    global _budget_guard
+    if _budget_guard is None:
+        with _budget_guard_lock:
+            if _budget_guard is None:
+                budget = config.get_budget_config()
+                _budget_guard = BudgetGuard(
+                    max_cost=budget["max_cost"],
+                    max_tokens=budget["max_tokens"],
+                    degrade_at=budget["degrade_at"],
+                    fallback_model=budget["fallback_model"],
+                    skip_steps=budget["skip_steps"],
+                )
+    return _budget_guard
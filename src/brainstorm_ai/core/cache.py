@@ -0,0 +1,168 @@
+"""
+Module de cache persistant des réponses GPT.
+
+Les réponses sont adressées par contenu : la clé est un hash de
+(backend, modèle, température, rôle, prompt). Le backend en fait partie pour
+qu'une réponse synthétique ou rejouée ne soit jamais servie à un run réel.
+Le stockage est une base SQLite locale
+avec éviction par âge et par nombre d'entrées.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Cache SQLite thread-safe des réponses de l'API."""
+
+    def __init__(self, path: str, max_entries: int = 5000, max_age_days: float = 30):
+        """
+        Initialise le cache.
+
+        Args:
+            path: Chemin du fichier SQLite
+            max_entries: Nombre maximal d'entrées conservées (0 = illimité)
+            max_age_days: Âge maximal d'une entrée en jours (0 = illimité)
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                role TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)"
+        )
+        self._conn.commit()
+        logger.info(f"Cache de réponses ouvert : {self.path}")
+
+    @staticmethod
+    def make_key(
+        model: str, temperature: float, role: str, prompt: str, backend: str = "openai"
+    ) -> str:
+        """Calcule la clé de cache d'un appel (``backend`` : type de backend)."""
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        raw = f"{backend}\x1f{model}\x1f{temperature}\x1f{role}\x1f{prompt_hash}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Retourne la réponse en cache, ou None si absente ou expirée."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is not None and self.max_age_seconds and now - row[1] > self.max_age_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, model: str, role: str, response: str) -> None:
+        """Enregistre une réponse et applique la politique d'éviction."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, role, response, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Supprime les entrées expirées puis les moins récemment utilisées."""
+        if self.max_age_seconds:
+            self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.max_age_seconds,)
+            )
+        if self.max_entries:
+            self._conn.execute(
+                """DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        """Vide le cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+        logger.info("Cache de réponses vidé")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retourne les compteurs du cache."""
+        total = self.hits + self.misses
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def reset_stats(self) -> None:
+        """Réinitialise les compteurs de hits/misses."""
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        """Ferme la connexion SQLite."""
+        with self._lock:
+            self._conn.close()
+
+
+# Instance globale du cache (initialisation lazy)
+_response_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Retourne le cache de réponses, ou None s'il est désactivé dans la configuration."""
+    global _response_cache
+    cache_config = config.get_cache_config()
+    if not cache_config.get("enabled", False):
+        return None
+
+    if _response_cache is None:
+        with _cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(
+                    cache_config.get("path", "data/cache/responses.sqlite"),
+                    max_entries=cache_config.get("max_entries", 5000),
+                    max_age_days=cache_config.get("max_age_days", 30),
+                )
+    return _response_cache
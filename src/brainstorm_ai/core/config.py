@@ -6,7 +6,7 @@ Charge et gère les paramètres depuis config.yaml
 import logging
 import threading
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 import yaml
 
@@ -154,6 +154,28 @@ class Config:
 
         return value
 
+    def set(self, key_path: str, value: Any) -> None:
+        """
+        Modifie une valeur de configuration en mémoire avec notation pointée.
+
+        Les sections intermédiaires manquantes sont créées. La modification
+        n'est pas écrite dans le fichier de configuration.
+
+        Args:
+            key_path: Chemin vers la clé (ex: "api.cache.enabled")
+            value: Nouvelle valeur
+        """
+        with self._lock:
+            if self._config is None:
+                self._config = {}
+            keys = key_path.split(".")
+            node = self._config
+            for key in keys[:-1]:
+                if not isinstance(node.get(key), dict):
+                    node[key] = {}
+                node = node[key]
+            node[keys[-1]] = value
+
     def get_model_for_role(self, role: str) -> str:
         """Retourne le modèle GPT à utiliser pour un rôle donné."""
         return self.get(f"agents.models.{role}", self.get("agents.models.default", "gpt-4o"))
@@ -162,6 +184,32 @@ class Config:
         """Retourne la température à utiliser pour un rôle donné."""
         return self.get(f"agents.temperatures.{role}", self.get("agents.temperatures.default", 0.7))
 
+    def get_token_budget(self, role: str) -> dict:
+        """
+        Retourne le budget de tokens d'un rôle.
+
+        Returns:
+            Dict {"prompt": tokens de prompt max (None = fenêtre du modèle),
+            "completion": tokens de complétion attendus}
+        """
+        budgets = self.get("agents.token_budgets", {}) or {}
+        budget = {"prompt": None, "completion": 2000}
+        budget.update(budgets.get("default") or {})
+        budget.update(budgets.get(role) or {})
+        return budget
+
+    def get_candidates_config(self) -> dict:
+        """Retourne la configuration de la génération créative à plusieurs candidats."""
+        candidates = {"n": 1, "keep": 1, "selection": "diverse"}
+        candidates.update(self.get("agents.candidates", {}) or {})
+        return candidates
+
+    def get_context_window(self, model: str) -> int:
+        """Retourne la fenêtre de contexte (en tokens) d'un modèle."""
+        # Lecture directe : les noms de modèles peuvent contenir des points
+        windows = self.get("api.context_windows", {}) or {}
+        return int(windows.get(model, windows.get("default", 128000)))
+
     def get_emoji(self, name: str) -> str:
         """Retourne l'emoji pour un nom donné, ou une chaîne vide si désactivé."""
         if not self.get("display.use_emojis", True):
@@ -184,6 +232,14 @@ class Config:
     def cycles(self) -> int:
         return self.get("general.cycles", 3)
 
+    @property
+    def parallel_steps(self) -> bool:
+        return self.get("general.parallel_steps", True)
+
+    @property
+    def idea_workers(self) -> int:
+        return max(1, int(self.get("general.idea_workers", 1)))
+
     @property
     def max_context_chars(self) -> int:
         return self.get("agents.max_context_chars", 120000)
@@ -196,6 +252,22 @@ class Config:
     def retry_delay_base(self) -> int:
         return self.get("api.retry_delay_base", 2)
 
+    @property
+    def retry_delay_max(self) -> float:
+        return self.get("api.retry_delay_max", 30)
+
+    @property
+    def request_timeout(self) -> Optional[float]:
+        return self.get("api.request_timeout", 120)
+
+    @property
+    def call_timeout(self) -> Optional[float]:
+        return self.get("api.call_timeout", 300)
+
+    @property
+    def run_timeout(self) -> Optional[float]:
+        return self.get("api.run_timeout")
+
     @property
     def logs_dir(self) -> str:
         return self.get("export.paths.logs_dir", "data/logs")
@@ -243,6 +315,176 @@ class Config:
             },
         )
 
+    def get_scoring_config(self) -> dict:
+        """Retourne la configuration du calcul des scores des cycles."""
+        scoring = {"mode": "background", "batch_size": 10}
+        scoring.update(self.get("advanced.scoring", {}) or {})
+        return scoring
+
+    def get_cache_config(self) -> dict:
+        """Retourne la configuration du cache de réponses."""
+        return self.get(
+            "api.cache",
+            {
+                "enabled": False,
+                "path": "data/cache/responses.sqlite",
+                "max_entries": 5000,
+                "max_age_days": 30,
+            },
+        )
+
+    def get_history_compaction_config(self) -> dict:
+        """Retourne la configuration de compaction de l'historique."""
+        compaction = {
+            "enabled": False,
+            "strategy": "extractive",
+            "keep_recent": 2,
+            "min_entries": 4,
+            "max_ideas": 30,
+            "max_idea_chars": 200,
+        }
+        compaction.update(self.get("agents.history_compaction", {}) or {})
+        return compaction
+
+    def get_idea_index_config(self) -> dict:
+        """Retourne la configuration de l'index des idées des runs précédents."""
+        index_config = {
+            "enabled": True,
+            "path": "data/cache/idea_index.json",
+            "mode": "annotate",
+            "threshold": 0.8,
+            "num_perm": 128,
+            "bands": 32,
+        }
+        index_config.update(self.get("advanced.idea_index", {}) or {})
+        return index_config
+
+    def get_early_stopping_config(self) -> dict:
+        """Retourne la configuration d'arrêt anticipé des cycles."""
+        stopping = {
+            "enabled": False,
+            "min_cycles": 2,
+            "patience": 2,
+            "min_score_gain": 1,
+            "novelty_threshold": 0.15,
+        }
+        stopping.update(self.get("general.early_stopping", {}) or {})
+        return stopping
+
+    def get_budget_config(self) -> dict:
+        """Retourne le budget maximal d'un brainstorm (None = illimité) et le mode économique."""
+        budget = {
+            "max_cost": None,
+            "max_tokens": None,
+            "degrade_at": 0.8,
+            "fallback_model": "gpt-4o-mini",
+            "skip_steps": ["replique"],
+        }
+        budget.update(self.get("api.budget", {}) or {})
+        return budget
+
+    def get_routing_config(self) -> dict:
+        """Retourne la configuration du routage des appels vers les modèles."""
+        routing = {
+            "enabled": False,
+            "routes": {},
+            "downgrade_at": 0.5,
+            "rate_limit_cooldown": 30,
+            "max_queue_wait": 30,
+            "latency_slo": None,
+        }
+        routing.update(self.get("api.routing", {}) or {})
+        return routing
+
+    def get_explicit_model(self, step: str, role: str) -> Optional[str]:
+        """
+        Retourne le modèle fixé dans ``agents.models`` pour une étape, à défaut
+        pour son rôle (``agents.models.default`` n'est pas un choix explicite).
+        """
+        return self.get(f"agents.models.{step}") or self.get(f"agents.models.{role}")
+
+    def get_route_models(self, step: str, role: str) -> List[str]:
+        """
+        Retourne les modèles candidats d'une étape, par ordre de préférence.
+
+        La route de l'étape est prioritaire, puis celle du rôle ; sans route
+        (ou routage désactivé), seul le modèle du rôle est candidat. Un modèle
+        fixé dans ``agents.models`` reste le premier choix : la route ne fournit
+        alors que les modèles de repli.
+        """
+        explicit = self.get_explicit_model(step, role)
+        routing = self.get_routing_config()
+        if routing["enabled"]:
+            routes = routing["routes"] or {}
+            models = routes.get(step) or routes.get(role)
+            if models:
+                models = [models] if isinstance(models, str) else list(models)
+                if explicit:
+                    models = [explicit] + [m for m in models if m != explicit]
+                return models
+        return [explicit or self.get_model_for_role(role)]
+
+    def get_hedging_config(self) -> dict:
+        """Retourne la configuration des requêtes de secours (hedging)."""
+        hedging = {
+            "enabled": False,
+            "percentile": 95,
+            "min_samples": 20,
+            "initial_delay": 15,
+            "min_delay": 1,
+            "fallback_model": None,
+            "max_workers": 32,
+        }
+        hedging.update(self.get("api.hedging", {}) or {})
+        return hedging
+
+    def get_http_pool_config(self) -> dict:
+        """Retourne la configuration du pool de connexions HTTP partagé."""
+        pool = {
+            "max_connections": 64,
+            "max_keepalive_connections": 32,
+            "keepalive_expiry": 30,
+            "http2": True,
+        }
+        pool.update(self.get("api.http_pool", {}) or {})
+        return pool
+
+    def get_batch_config(self) -> dict:
+        """Retourne la configuration de l'exécution par lots (API Batch)."""
+        batch = {
+            "enabled": False,
+            "server": "auto",
+            "completion_window": "24h",
+            "poll_interval": 30,
+            "timeout": None,
+            "discount": 0.5,
+            "workdir": "data/cache/batches",
+            "local_workers": 8,
+        }
+        batch.update(self.get("api.batch", {}) or {})
+        return batch
+
+    def get_circuit_breaker_config(self) -> dict:
+        """Retourne la configuration des disjoncteurs par modèle."""
+        breaker = {
+            "enabled": True,
+            "failure_threshold": 5,
+            "recovery_timeout": 30,
+            "half_open_max_calls": 1,
+        }
+        breaker.update(self.get("api.circuit_breaker", {}) or {})
+        return breaker
+
+    def get_telemetry_config(self) -> dict:
+        """Retourne la configuration de la télémétrie des appels API."""
+        telemetry = {
+            "enabled": True,
+            "path": "data/cache/telemetry.json",
+            "max_samples": 500,
+        }
+        telemetry.update(self.get("advanced.telemetry", {}) or {})
+        return telemetry
+
     def get_optimization_config(self) -> dict:
         """Retourne la configuration d'optimisation."""
         return self.get(
@@ -293,42 +535,124 @@ class Config:
         output_cost = (output_tokens / 1000) * pricing["output"]
         return input_cost + output_cost
 
-    def estimate_total_cost(self, cycles: int, ideas_count: int) -> dict:
-        """Estime le coût total d'un brainstorm complet."""
-        # Estimation basée sur l'usage moyen observé
-        avg_input_per_call = 2000  # tokens d'input moyens par appel
-        avg_output_per_call = 800  # tokens d'output moyens par appel
-
-        # Calcul du nombre d'appels total
-        calls_per_cycle = 6  # créatif, critique, défense, réplique, révision, score
-        synthesis_calls = 1
-        idea_calls = ideas_count * 4  # plan, critique, défense, révision par idée
-
-        total_calls = (cycles * calls_per_cycle) + synthesis_calls + idea_calls
-
-        # Estimation par modèle
-        estimates = {}
-        for role in ["creatif", "critique", "revision", "synthese", "score", "application"]:
-            model = self.get_model_for_role(role)
-            if model not in estimates:
-                estimates[model] = {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cost": 0.0}
-
-        # Répartition des appels par type de modèle
-        default_model = self.get_model_for_role("default")
-
-        estimates[default_model]["calls"] = total_calls
-        estimates[default_model]["input_tokens"] = total_calls * avg_input_per_call
-        estimates[default_model]["output_tokens"] = total_calls * avg_output_per_call
-        estimates[default_model]["cost"] = self.calculate_cost(
-            default_model,
-            estimates[default_model]["input_tokens"],
-            estimates[default_model]["output_tokens"],
-        )
+    def estimate_total_cost(
+        self,
+        cycles: int,
+        ideas_count: int,
+        step_stats: Optional[Dict[str, Dict[str, float]]] = None,
+    ) -> dict:
+        """
+        Estime le coût et la durée d'un brainstorm complet.
+
+        Les tokens de chaque appel proviennent des distributions mesurées par
+        étape (télémétrie des runs précédents), à défaut par rôle, sinon des
+        valeurs par défaut. Le prompt de génération créative grossit à chaque
+        cycle de la création précédente ajoutée à l'historique ; une fois la
+        compaction déclenchée, l'historique se limite au résumé des idées
+        anciennes et aux ``keep_recent`` dernières créations. Il reste borné
+        par le budget de prompt du rôle.
+
+        Args:
+            cycles: Nombre de cycles de brainstorming
+            ideas_count: Nombre d'idées développées
+            step_stats: Distributions par étape (``TelemetryStore.step_stats()``)
+
+        Returns:
+            Dictionnaire avec le nombre d'appels, le détail par modèle, le coût
+            moyen (``total_cost``) et pessimiste (``total_cost_p90``), la durée
+            cumulée des appels (None si une étape n'a jamais été mesurée) et les
+            étapes mesurées
+        """
+        step_stats = step_stats or {}
+        default_prompt = 2000  # tokens d'input par appel sans mesure
+        default_completion = 800  # tokens d'output par appel sans mesure
+
+        def distribution(role: str, step: Optional[str] = None) -> dict:
+            stats = step_stats.get(step or role) or step_stats.get(role)
+            if stats:
+                return stats
+            return {
+                "prompt_min": default_prompt,
+                "prompt_mean": default_prompt,
+                "prompt_p90": default_prompt,
+                "completion_mean": default_completion,
+                "completion_p90": default_completion,
+                "latency_mean": None,
+                "latency_p90": None,
+            }
+
+        compaction = self.get_history_compaction_config()
+        # Taille maximale du résumé des idées anciennes (résumé extractif), à
+        # ~4 caractères par token (tokenizer.CHARS_PER_TOKEN)
+        summary_cap = compaction["max_ideas"] * compaction["max_idea_chars"] / 4
+
+        def history_tokens(cycle: int, per_creation: float) -> float:
+            """Tokens d'historique du prompt créatif au cycle ``cycle`` (0-based)."""
+            if not compaction["enabled"] or cycle < compaction["min_entries"]:
+                return per_creation * cycle
+            recent = min(cycle, compaction["keep_recent"])
+            summary = min(summary_cap, per_creation * (cycle - recent))
+            return per_creation * recent + summary
+
+        # (rôle, étape, prompt moyen, prompt p90) de chaque appel prévu
+        calls: List[tuple] = []
+        creatif = distribution("creatif")
+        history_cap = self.get_token_budget("creatif")["prompt"]
+        for cycle in range(cycles):
+            # Génération : l'historique contient les créations des cycles précédents
+            growth_mean = history_tokens(cycle, creatif["completion_mean"])
+            growth_p90 = history_tokens(cycle, creatif["completion_p90"])
+            if history_cap is not None:
+                growth_mean = min(growth_mean, history_cap)
+                growth_p90 = min(growth_p90, history_cap)
+            base = creatif["prompt_min"]
+            calls.append(("creatif", "creatif", base + growth_mean, base + growth_p90))
+            for role, step in (
+                ("creatif", "defense"),
+                ("critique", "critique"),
+                ("critique", "replique"),
+                ("revision", "revision"),
+                ("score", "score"),
+            ):
+                stats = distribution(role, step)
+                calls.append((role, step, stats["prompt_mean"], stats["prompt_p90"]))
+        synthese = distribution("synthese")
+        calls.append(("synthese", "synthese", synthese["prompt_mean"], synthese["prompt_p90"]))
+        for _ in range(ideas_count):
+            for step in ("plan", "critique_plan", "defense_plan", "revision_plan"):
+                stats = distribution("application", step)
+                calls.append(("application", step, stats["prompt_mean"], stats["prompt_p90"]))
+
+        estimates: Dict[str, dict] = {}
+        duration: Optional[float] = 0.0
+        duration_p90: Optional[float] = 0.0
+        for role, step, prompt_mean, prompt_p90 in calls:
+            stats = distribution(role, step)
+            # Modèle préféré de la route de l'étape
+            model = self.get_route_models(step, role)[0]
+            estimate = estimates.setdefault(
+                model,
+                {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cost": 0.0, "cost_p90": 0.0},
+            )
+            estimate["calls"] += 1
+            estimate["input_tokens"] += round(prompt_mean)
+            estimate["output_tokens"] += round(stats["completion_mean"])
+            estimate["cost"] += self.calculate_cost(model, prompt_mean, stats["completion_mean"])
+            estimate["cost_p90"] += self.calculate_cost(model, prompt_p90, stats["completion_p90"])
+            if stats["latency_mean"] is None:
+                duration = duration_p90 = None
+            elif duration is not None:
+                duration += stats["latency_mean"]
+                duration_p90 += stats["latency_p90"]
 
         return {
-            "total_calls": total_calls,
+            "total_calls": len(calls),
             "estimates": estimates,
             "total_cost": sum(est["cost"] for est in estimates.values()),
+            "total_cost_p90": sum(est["cost_p90"] for est in estimates.values()),
+            "duration": duration,
+            "duration_p90": duration_p90,
+            "measured_steps": sorted(step for step in step_stats if step_stats[step]),
         }
 
 
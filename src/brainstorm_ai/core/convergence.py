@@ -0,0 +1,212 @@
+"""
+Module d'arrêt anticipé des cycles de brainstorming.
+
+Après chaque cycle, le moniteur de convergence décide s'il est utile d'en
+lancer un autre : la phase de cycles s'arrête lorsque les scores plafonnent,
+lorsque les nouvelles créations n'apportent plus rien de neuf, ou lorsque le
+budget ne permet pas un cycle supplémentaire.
+"""
+
+import itertools
+import logging
+from typing import Any, Dict, List, Optional
+
+from .config import config
+from .similarity import cosine_matrix
+from .types import CycleLog
+
+logger = logging.getLogger(__name__)
+
+# Raisons d'arrêt enregistrées dans le BrainstormLog
+ARRET_CYCLES_MAX = "cycles_max"
+ARRET_PLATEAU_SCORE = "plateau_score"
+ARRET_NOUVEAUTE_FAIBLE = "nouveaute_faible"
+ARRET_BUDGET = "budget_epuise"
+# Plafond de budget atteint en cours de run (résultats partiels)
+ARRET_BUDGET_DEPASSE = "budget_depasse"
+# Échéance du run (api.run_timeout) atteinte (résultats partiels)
+ARRET_DELAI_DEPASSE = "delai_depasse"
+
+
+class ConvergenceMonitor:
+    """Suit les cycles et décide de l'arrêt anticipé."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        min_cycles: int = 2,
+        patience: int = 2,
+        min_score_gain: float = 1.0,
+        novelty_threshold: float = 0.15,
+        max_cost: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ):
+        """
+        Args:
+            enabled: Active les critères de convergence (plateau et nouveauté)
+            min_cycles: Nombre de cycles toujours exécutés avant d'envisager l'arrêt
+            patience: Nombre de cycles sans amélioration du meilleur score avant arrêt
+            min_score_gain: Gain minimal du score total considéré comme une amélioration
+            novelty_threshold: Nouveauté minimale d'une création (1 - similarité
+                cosinus maximale avec les créations précédentes)
+            max_cost: Budget maximal en dollars (None = illimité)
+            max_tokens: Budget maximal en tokens (None = illimité)
+        """
+        self.enabled = enabled
+        self.min_cycles = max(1, min_cycles)
+        self.patience = max(1, patience)
+        self.min_score_gain = min_score_gain
+        self.novelty_threshold = novelty_threshold
+        self.max_cost = max_cost
+        self.max_tokens = max_tokens
+
+        # Score total par cycle, None tant que le cycle n'est pas évalué
+        self.totals: List[Optional[float]] = []
+        # Scores reçus avant l'observation de leur cycle, par numéro de cycle
+        self._early_totals: Dict[int, float] = {}
+        self.novelties: List[float] = []
+        self._creations: List[str] = []
+        self._start_cost: Optional[float] = None
+        self._start_tokens: Optional[int] = None
+
+    @classmethod
+    def from_config(cls) -> "ConvergenceMonitor":
+        """Construit le moniteur depuis ``general.early_stopping`` et ``api.budget``."""
+        stopping = config.get_early_stopping_config()
+        budget = config.get_budget_config()
+        return cls(
+            enabled=stopping["enabled"],
+            min_cycles=stopping["min_cycles"],
+            patience=stopping["patience"],
+            min_score_gain=stopping["min_score_gain"],
+            novelty_threshold=stopping["novelty_threshold"],
+            max_cost=budget.get("max_cost"),
+            max_tokens=budget.get("max_tokens"),
+        )
+
+    def start(self, stats: Dict[str, Any]) -> None:
+        """Mémorise l'usage de l'API au début de la phase de cycles."""
+        self._start_cost = stats.get("total_cost", 0.0)
+        self._start_tokens = stats.get("total_tokens", 0)
+
+    def _novelty(self, creation: str) -> float:
+        if not self._creations:
+            return 1.0
+        similarities = cosine_matrix([*self._creations, creation])
+        return float(1.0 - similarities[-1, :-1].max())
+
+    def _scored(self) -> List[float]:
+        """Scores des premiers cycles consécutifs déjà évalués."""
+        return list(itertools.takewhile(lambda total: total is not None, self.totals))
+
+    def _plateau(self) -> bool:
+        totals = self._scored()
+        if len(totals) <= self.patience:
+            return False
+        best_before = max(totals[: -self.patience])
+        return max(totals[-self.patience :]) < best_before + self.min_score_gain
+
+    def _budget_exhausted(self, stats: Dict[str, Any]) -> bool:
+        """Vrai si un cycle de plus (au coût moyen observé) dépasserait le budget."""
+        cycles = len(self.totals)
+        cost = stats.get("total_cost", 0.0)
+        tokens = stats.get("total_tokens", 0)
+        if self.max_cost is not None:
+            per_cycle = (cost - (self._start_cost or 0.0)) / cycles
+            if cost + per_cycle > self.max_cost:
+                return True
+        if self.max_tokens is not None:
+            per_cycle = (tokens - (self._start_tokens or 0)) / cycles
+            if tokens + per_cycle > self.max_tokens:
+                return True
+        return False
+
+    def record_score(self, cycle: int, score: Dict[str, Any]) -> None:
+        """
+        Enregistre le score d'un cycle évalué après coup.
+
+        Un score reçu avant l'observation de son cycle est conservé et pris en
+        compte par :meth:`observe`.
+
+        Args:
+            cycle: Numéro du cycle (1-based)
+            score: Le score validé du cycle
+        """
+        total = float(score.get("total", 0))
+        if cycle <= len(self.totals):
+            self.totals[cycle - 1] = total
+        else:
+            self._early_totals[cycle] = total
+
+    def needs_scores(self, cycle: int) -> bool:
+        """
+        Indique si les scores doivent être demandés dès la fin du cycle.
+
+        Sans arrêt anticipé, les scores ne servent qu'après la phase de cycles
+        et peuvent être calculés ensemble. Sinon, le plateau demande
+        ``min_cycles`` cycles et ``patience + 1`` cycles évalués ; un score
+        calculé en tâche de fond n'arrivant qu'au cycle suivant, il est
+        demandé un cycle plus tôt.
+
+        Args:
+            cycle: Numéro du cycle qui vient de se terminer (1-based)
+        """
+        return self.enabled and cycle + 1 >= max(self.min_cycles, self.patience + 1)
+
+    def check_plateau(self) -> Optional[str]:
+        """
+        Indique si le score a plafonné sur les cycles déjà évalués.
+
+        Appelée par :meth:`observe`, et de nouveau par la boucle dès qu'elle a
+        enregistré des scores calculés en tâche de fond : sans ce second
+        appel, le plateau serait constaté avec un ou deux cycles de retard.
+
+        Returns:
+            ``ARRET_PLATEAU_SCORE``, ou None pour continuer
+        """
+        cycle = len(self.totals)
+        if not self.enabled or cycle < self.min_cycles or not self._plateau():
+            return None
+        # Le plateau ne porte que sur les cycles déjà évalués (score par lot :
+        # critère inactif)
+        logger.info(
+            f"Arrêt après le cycle {cycle} : score plafonné "
+            f"({self._scored()[-self.patience :]} sur {self.patience} cycles)"
+        )
+        return ARRET_PLATEAU_SCORE
+
+    def observe(self, log: CycleLog, stats: Dict[str, Any]) -> Optional[str]:
+        """
+        Enregistre un cycle terminé et indique s'il faut arrêter.
+
+        Args:
+            log: Le log du cycle terminé
+            stats: Statistiques d'utilisation de l'API (``get_gpt_stats()``)
+
+        Returns:
+            La raison d'arrêt, ou None pour continuer
+        """
+        score = log.get("score")
+        total = float(score.get("total", 0)) if score else None
+        self.totals.append(self._early_totals.pop(len(self.totals) + 1, total))
+        novelty = self._novelty(log["creation"])
+        self.novelties.append(novelty)
+        self._creations.append(log["creation"])
+        cycle = len(self.totals)
+
+        if self._budget_exhausted(stats):
+            logger.info(f"Arrêt après le cycle {cycle} : budget insuffisant pour un cycle de plus")
+            return ARRET_BUDGET
+
+        if not self.enabled or cycle < self.min_cycles:
+            return None
+
+        raison = self.check_plateau()
+        if raison is not None:
+            return raison
+
+        if novelty < self.novelty_threshold:
+            logger.info(f"Arrêt après le cycle {cycle} : nouveauté faible ({novelty:.2f})")
+            return ARRET_NOUVEAUTE_FAIBLE
+
+        return None
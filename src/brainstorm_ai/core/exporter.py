@@ -120,6 +120,11 @@ def export_markdown(data: Dict[str, Any], filename: str = "logs/brainstorm_expor
             f.write(f"## Objectif\n{escape_markdown(data.get('objectif', ''))}\n\n")
             f.write(f"## Contexte\n{escape_markdown(data.get('contexte', ''))}\n\n")
             f.write(f"## Contraintes\n{escape_markdown(data.get('contraintes', ''))}\n\n")
+            if data.get("raison_arret"):
+                f.write(
+                    f"**Cycles exécutés :** {data.get('cycles_executes', len(data.get('logs', [])))}"
+                    f" (arrêt : {data['raison_arret']})\n\n"
+                )
 
             # Cycles
             f.write("## Cycles de Brainstorming\n\n")
@@ -1,18 +1,47 @@
+import asyncio
+import itertools
 import logging
 import os
+import random
+import threading
 import time
-from functools import lru_cache
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from openai import (
     APIConnectionError,
     APIError,
+    APIStatusError,
+    AsyncOpenAI,
     OpenAI,
     RateLimitError,
     Timeout,
 )
 
+from .backends import (
+    BackendError,
+    Completion,
+    CompletionBackend,
+    OpenAIBackend,
+    RecordingBackend,
+    backend_type,
+    create_backend,
+    requires_api_key,
+)
+from .budget import get_budget_guard
+from .cache import ResponseCache, get_response_cache
 from .config import config
+from .hedging import get_hedge_executor, get_latency_tracker, hedge_delay, hedged_call, timed
+from .rate_limiter import get_rate_limiter
+from .resilience import (
+    FERME,
+    CircuitOpenError,
+    decorrelated_jitter,
+    get_circuit_breaker,
+    retry_after,
+)
+from .router import get_router
+from .telemetry import get_expected_completion, record_call
+from .tokenizer import count_tokens, is_exact
 
 logger = logging.getLogger(__name__)
 
@@ -35,26 +64,74 @@ class GPTAPIError(GPTError):
     pass
 
 
+class GPTContextLengthError(GPTAPIError):
+    """Exception levée quand un prompt ne tient pas dans la fenêtre de contexte du modèle."""
+
+    pass
+
+
+class BudgetExceededError(GPTError):
+    """Exception levée quand le plafond de coût ou de tokens du run est atteint."""
+
+    pass
+
+
+class GPTTimeoutError(GPTAPIError):
+    """Exception levée quand un appel dépasse son délai maximal (``api.call_timeout``)."""
+
+    pass
+
+
+class DeadlineExceededError(GPTError):
+    """Exception levée quand l'échéance du run (``api.run_timeout``) est dépassée."""
+
+    pass
+
+
 class GPTClient:
-    """Singleton pour gérer le client OpenAI et les statistiques."""
+    """
+    Singleton pour gérer le backend de complétion (OpenAI par défaut) et les statistiques.
+
+    Le backend (et son pool de connexions) est partagé par tous les agents ;
+    sa construction et les compteurs d'utilisation sont protégés par des
+    verrous, les appels pouvant venir de plusieurs threads.
+    """
 
     _instance = None
-    _client = None
-    _total_tokens = {"prompt": 0, "completion": 0}
-    _total_cost = 0.0
-    _api_calls = 0
+    _instance_lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._backend = None
+                    instance._backend_lock = threading.RLock()
+                    instance._stats_lock = threading.Lock()
+                    instance._reset_counters()
+                    cls._instance = instance
         return cls._instance
 
     def __init__(self):
-        if self._client is None:
-            self._initialize_client()
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._initialize_client()
 
-    def _initialize_client(self):
-        """Initialise le client OpenAI une seule fois."""
+    def _reset_counters(self) -> None:
+        self._total_tokens = {"prompt": 0, "completion": 0}
+        self._total_cost = 0.0
+        self._api_calls = 0
+        self._hedge_stats = {
+            "hedged_calls": 0,
+            "hedge_wins": 0,
+            "hedge_tokens": 0,
+            "hedge_cost": 0.0,
+        }
+
+    @staticmethod
+    def _get_api_key() -> str:
+        """Lit et vérifie la clé API OpenAI."""
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
             raise GPTConfigError("La clé API OpenAI n'est pas configurée dans OPENAI_API_KEY")
@@ -62,59 +139,616 @@ class GPTClient:
         if not api_key.startswith(("sk-", "sk-proj-")):
             logger.warning("Le format de la clé API OpenAI semble incorrect")
 
-        self._client = OpenAI(api_key=api_key)
-        logger.info("Client OpenAI initialisé avec succès")
+        return api_key
+
+    def _initialize_client(self):
+        """Initialise le backend configuré une seule fois (clé API requise pour OpenAI)."""
+        api_key = self._get_api_key() if requires_api_key() else None
+        try:
+            # Les tentatives sont gérées par gpt() : pas de retry caché dans le client
+            self._backend = create_backend(api_key, timeout=config.request_timeout, max_retries=0)
+        except BackendError as e:
+            raise GPTConfigError(str(e)) from e
+        logger.info(f"Backend de complétion initialisé : {self._backend.name}")
+
+    @property
+    def backend(self) -> CompletionBackend:
+        """Retourne le backend de complétion."""
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._initialize_client()
+        return self._backend
+
+    def set_backend(self, backend: Optional[CompletionBackend]) -> None:
+        """
+        Remplace le backend de complétion.
+
+        Args:
+            backend: Le nouveau backend, ou None pour reconstruire celui de la configuration
+        """
+        with self._backend_lock:
+            if self._backend is not None and self._backend is not backend:
+                self._backend.close()
+            self._backend = backend
+            if backend is None:
+                self._initialize_client()
 
     @property
     def client(self) -> OpenAI:
-        """Retourne le client OpenAI."""
-        if self._client is None:
-            self._initialize_client()
-        return self._client
+        """Retourne le client OpenAI (uniquement avec un backend OpenAI)."""
+        backend = self.backend
+        if isinstance(backend, RecordingBackend):
+            backend = backend.inner
+        if not isinstance(backend, OpenAIBackend):
+            raise GPTConfigError(f"Le backend '{backend.name}' n'utilise pas de client OpenAI")
+        return backend.client
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Retourne le client OpenAI asynchrone (uniquement avec un backend OpenAI)."""
+        backend = self.backend
+        if isinstance(backend, RecordingBackend):
+            backend = backend.inner
+        if not isinstance(backend, OpenAIBackend):
+            raise GPTConfigError(f"Le backend '{backend.name}' n'utilise pas de client OpenAI")
+        return backend.async_client
 
     def add_usage(self, prompt_tokens: int, completion_tokens: int, cost: float):
-        """Ajoute les statistiques d'utilisation."""
-        self._total_tokens["prompt"] += prompt_tokens
-        self._total_tokens["completion"] += completion_tokens
-        self._total_cost += cost
-        self._api_calls += 1
+        """Ajoute les statistiques d'utilisation et les impute au budget du run."""
+        with self._stats_lock:
+            self._total_tokens["prompt"] += prompt_tokens
+            self._total_tokens["completion"] += completion_tokens
+            self._total_cost += cost
+            self._api_calls += 1
+        get_budget_guard().record(cost, prompt_tokens + completion_tokens)
+
+    def add_hedge(self, won: bool) -> None:
+        """Comptabilise une requête de secours lancée (et si elle a gagné)."""
+        with self._stats_lock:
+            self._hedge_stats["hedged_calls"] += 1
+            self._hedge_stats["hedge_wins"] += int(won)
+
+    def add_hedge_usage(self, tokens: int, cost: float) -> None:
+        """Comptabilise une réponse de secours ignorée, à part mais imputée au budget."""
+        with self._stats_lock:
+            self._hedge_stats["hedge_tokens"] += tokens
+            self._hedge_stats["hedge_cost"] += cost
+        get_budget_guard().record(cost, tokens)
 
     def get_stats(self) -> Dict[str, Any]:
-        """Retourne les statistiques d'utilisation."""
-        return {
-            "total_tokens": self._total_tokens["prompt"] + self._total_tokens["completion"],
-            "prompt_tokens": self._total_tokens["prompt"],
-            "completion_tokens": self._total_tokens["completion"],
-            "total_cost": round(self._total_cost, 4),
-            "api_calls": self._api_calls,
-        }
+        """
+        Retourne les statistiques d'utilisation (hors réponses de secours ignorées).
+
+        Les métriques du pool de connexions HTTP du backend figurent sous ``http_pool``.
+        """
+        with self._stats_lock:
+            stats = {
+                "total_tokens": self._total_tokens["prompt"] + self._total_tokens["completion"],
+                "prompt_tokens": self._total_tokens["prompt"],
+                "completion_tokens": self._total_tokens["completion"],
+                "total_cost": round(self._total_cost, 4),
+                "api_calls": self._api_calls,
+                "hedged_calls": self._hedge_stats["hedged_calls"],
+                "hedge_wins": self._hedge_stats["hedge_wins"],
+                "hedge_tokens": self._hedge_stats["hedge_tokens"],
+                "hedge_cost": round(self._hedge_stats["hedge_cost"], 4),
+            }
+        stats["http_pool"] = self.backend.pool_stats()
+        return stats
 
     def reset_stats(self):
         """Réinitialise les statistiques."""
-        self._total_tokens = {"prompt": 0, "completion": 0}
-        self._total_cost = 0.0
-        self._api_calls = 0
+        with self._stats_lock:
+            self._reset_counters()
+        get_budget_guard().reset()
 
 
 # Instance globale du client (initialisation lazy)
 _gpt_client = None
+_gpt_client_lock = threading.Lock()
 
 
 def get_gpt_client() -> GPTClient:
     """Retourne l'instance GPT client (initialisation lazy)."""
     global _gpt_client
     if _gpt_client is None:
-        _gpt_client = GPTClient()
+        with _gpt_client_lock:
+            if _gpt_client is None:
+                _gpt_client = GPTClient()
     return _gpt_client
 
 
+# Observateurs des réponses en streaming (ex: ProgressTracker)
+_stream_listeners: List[Any] = []
+_stream_ids = itertools.count(1)
+
+
+def add_stream_listener(listener: Any) -> None:
+    """
+    Abonne un observateur aux événements de streaming.
+
+    L'observateur peut implémenter ``on_stream_start(stream_id, role, model)``,
+    ``on_stream_chunk(stream_id, text)`` et ``on_stream_end(stream_id, stats)``.
+    """
+    if listener not in _stream_listeners:
+        _stream_listeners.append(listener)
+
+
+def remove_stream_listener(listener: Any) -> None:
+    """Désabonne un observateur des événements de streaming."""
+    if listener in _stream_listeners:
+        _stream_listeners.remove(listener)
+
+
+def _notify_stream(event: str, *args: Any) -> None:
+    """Diffuse un événement de streaming aux observateurs (sans jamais lever)."""
+    for listener in list(_stream_listeners):
+        handler = getattr(listener, event, None)
+        if handler is None:
+            continue
+        try:
+            handler(*args)
+        except Exception as e:
+            logger.debug(f"Erreur dans l'observateur de streaming {listener!r}: {e}")
+
+
+# Échéance du brainstorm en cours (horloge monotone), partagée par tous les threads
+_run_deadline: Optional[float] = None
+
+
+def set_run_deadline(timeout: Optional[float]) -> None:
+    """
+    Fixe l'échéance du run en cours.
+
+    Args:
+        timeout: Durée maximale du run en secondes à partir de maintenant
+            (None = sans échéance)
+    """
+    global _run_deadline
+    _run_deadline = time.monotonic() + timeout if timeout else None
+
+
+def run_deadline_exceeded() -> bool:
+    """Indique si l'échéance du run en cours est dépassée."""
+    return _run_deadline is not None and time.monotonic() >= _run_deadline
+
+
+def _call_deadline() -> Optional[float]:
+    """Échéance d'un appel : la plus proche entre ``api.call_timeout`` et celle du run."""
+    deadlines = [_run_deadline] if _run_deadline is not None else []
+    if config.call_timeout:
+        deadlines.append(time.monotonic() + config.call_timeout)
+    return min(deadlines) if deadlines else None
+
+
+def _deadline_error(role: str, last_error: Optional[Exception]) -> GPTError:
+    """Construit l'erreur levée quand l'échéance d'un appel est atteinte."""
+    if run_deadline_exceeded():
+        return DeadlineExceededError(f"Échéance du run dépassée, appel {role} abandonné")
+    cause = f": {type(last_error).__name__}: {last_error}" if last_error else ""
+    logger.error(f"Délai de {config.call_timeout}s dépassé pour l'appel {role}{cause}")
+    return GPTTimeoutError(f"Délai de {config.call_timeout}s dépassé (appel {role}){cause}")
+
+
+def _attempt_timeout(
+    deadline: Optional[float], role: str, last_error: Optional[Exception]
+) -> Optional[float]:
+    """
+    Calcule le délai de la prochaine tentative, borné par l'échéance de l'appel.
+
+    Raises:
+        GPTTimeoutError: Si l'échéance de l'appel est atteinte
+        DeadlineExceededError: Si l'échéance du run est atteinte
+    """
+    timeout = config.request_timeout
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise _deadline_error(role, last_error)
+    return min(timeout, remaining) if timeout else remaining
+
+
+def _backoff(
+    delay: Optional[float], deadline: Optional[float], role: str, last_error: Exception
+) -> Optional[float]:
+    """
+    Vérifie que l'attente avant la prochaine tentative tient dans l'échéance.
+
+    Raises:
+        GPTTimeoutError: Si l'attente dépasserait l'échéance de l'appel
+        DeadlineExceededError: Si elle dépasserait l'échéance du run
+    """
+    if delay is not None and deadline is not None and time.monotonic() + delay >= deadline:
+        raise _deadline_error(role, last_error) from last_error
+    return delay
+
+
+def _resolve_call_params(
+    prompt: str,
+    role: str,
+    step: str,
+    model_override: Optional[str],
+    temperature: Optional[float],
+    max_retries: Optional[int],
+) -> Tuple[str, float, int]:
+    """
+    Résout le modèle, la température et le nombre de tentatives d'un appel.
+
+    Sans modèle imposé, le modèle est choisi par le routeur selon l'étape,
+    la taille du prompt et l'état du budget et des quotas.
+
+    Raises:
+        BudgetExceededError: Si le plafond de budget du run est atteint
+        DeadlineExceededError: Si l'échéance du run est dépassée
+    """
+    if run_deadline_exceeded():
+        raise DeadlineExceededError(f"Échéance du run dépassée, appel {role} refusé")
+    guard = get_budget_guard()
+    if guard.exceeded:
+        raise BudgetExceededError(
+            f"Budget du run épuisé (${guard.spent_cost:.4f}, {guard.spent_tokens} tokens), "
+            f"appel {role} refusé"
+        )
+    # En mode économique, les rôles sans modèle imposé basculent sur le modèle de repli
+    if model_override:
+        model = model_override
+    else:
+        prompt_tokens = count_tokens(prompt, config.get_model_for_role(role))
+        model = guard.model_for(get_router().select(step, role, prompt_tokens))
+    if temperature is None:
+        temperature = config.get_temperature_for_role(role)
+    if max_retries is None:
+        max_retries = config.max_retries
+    return model, temperature, max_retries
+
+
+def _record_usage(
+    client: GPTClient,
+    model: str,
+    step: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    latency: float,
+    estimated_tokens: int = 0,
+) -> None:
+    """Comptabilise l'usage (tokens, coût et latence) d'un appel réussi."""
+    # Réconciliation du quota TPM réservé avec l'usage réel
+    if prompt_tokens or completion_tokens:
+        get_rate_limiter().record_usage(model, estimated_tokens, prompt_tokens + completion_tokens)
+
+    # Calcul du coût
+    cost = config.calculate_cost(model, prompt_tokens, completion_tokens)
+
+    # Mise à jour des statistiques
+    client.add_usage(prompt_tokens, completion_tokens, cost)
+    # Télémétrie par étape : un même rôle sert des étapes de tailles différentes
+    record_call(step, prompt_tokens, completion_tokens, latency)
+    get_router().record_call(step, model, prompt_tokens, completion_tokens, cost, latency)
+
+    logger.info(
+        f"Appel GPT réussi - Tokens: {prompt_tokens}+{completion_tokens}, Coût: ${cost:.4f}"
+    )
+
+
+def _record_completion(
+    client: GPTClient,
+    completion: Completion,
+    model: str,
+    step: str,
+    started_at: float,
+    estimated_tokens: int = 0,
+) -> str:
+    """Comptabilise l'usage d'une complétion et retourne son contenu."""
+    _record_usage(
+        client,
+        model,
+        step,
+        completion.prompt_tokens,
+        completion.completion_tokens,
+        time.monotonic() - started_at,
+        estimated_tokens,
+    )
+
+    # Retourner uniquement le contenu de la réponse
+    return completion.content.strip()
+
+
+def _is_transient(error: Exception) -> bool:
+    """Vrai pour les défaillances du point d'accès (serveur, connexion, timeout)."""
+    if isinstance(error, APIStatusError):
+        return error.status_code >= 500
+    return isinstance(error, (APIConnectionError, asyncio.TimeoutError))
+
+
+def _record_outcome(model: str, error: Optional[Exception] = None) -> None:
+    """Met à jour le disjoncteur du modèle après une tentative."""
+    breaker = get_circuit_breaker(model)
+    if breaker is None or isinstance(error, CircuitOpenError):
+        return
+    if error is not None and _is_transient(error):
+        breaker.record_failure(retry_after(error))
+    else:
+        # Le point d'accès a répondu (éventuellement par un refus) : il est disponible
+        breaker.record_success()
+
+
+def _check_circuit(model: str) -> None:
+    """
+    Vérifie que le disjoncteur du modèle autorise l'appel.
+
+    Raises:
+        CircuitOpenError: Si le disjoncteur du modèle est ouvert
+    """
+    breaker = get_circuit_breaker(model)
+    if breaker is not None:
+        breaker.before_call()
+
+
+def _retry_delay(
+    error: Exception, attempt: int, max_retries: int, previous_delay: Optional[float] = None
+) -> Optional[float]:
+    """
+    Détermine le délai avant la prochaine tentative après une erreur.
+
+    Le délai suit un backoff à gigue décorrélée (désynchronise les appelants
+    parallèles) ; une indication ``Retry-After`` du serveur est prioritaire.
+
+    Args:
+        error: L'exception levée par l'appel
+        attempt: Numéro de la tentative échouée (0-based)
+        max_retries: Nombre total de tentatives
+        previous_delay: Délai attendu avant cette tentative (None pour la première)
+
+    Returns:
+        Le délai en secondes, ou None s'il n'y a plus de tentative
+
+    Raises:
+        GPTAPIError: Pour les erreurs inattendues (non réessayables)
+    """
+    base = config.retry_delay_base
+    if isinstance(error, CircuitOpenError):
+        logger.warning(f"{error}, tentative {attempt + 1}/{max_retries}")
+        # Gigue pour que les appelants en attente ne testent pas tous à la fois
+        delay = error.retry_in + random.uniform(0, base)
+    elif isinstance(error, RateLimitError):
+        logger.warning(
+            f"Limite de taux atteinte, tentative {attempt + 1}/{max_retries}: {str(error)}"
+        )
+        # Pour les erreurs de rate limit, on attend plus longtemps
+        delay = decorrelated_jitter(previous_delay, base * 2, config.retry_delay_max)
+    elif (
+        isinstance(error, APIStatusError)
+        and 400 <= error.status_code < 500
+        and error.status_code not in (408, 409)
+    ):
+        # Requête invalide (contexte trop long, paramètre refusé...) : la rejouer
+        # à l'identique échouerait de la même façon
+        logger.error(f"Requête rejetée par l'API ({error.status_code}): {str(error)}")
+        if getattr(error, "code", None) == "context_length_exceeded":
+            raise GPTContextLengthError(f"Contexte trop long: {str(error)}") from error
+        raise GPTAPIError(
+            f"Requête rejetée ({error.status_code}): {type(error).__name__}: {str(error)}"
+        ) from error
+    elif isinstance(error, (APIError, APIConnectionError, Timeout, asyncio.TimeoutError)):
+        logger.warning(f"Erreur API tentative {attempt + 1}/{max_retries}: {str(error)}")
+        delay = decorrelated_jitter(previous_delay, base, config.retry_delay_max)
+    else:
+        # Pour les erreurs inattendues, on les logue et on les relance
+        logger.error(f"Erreur inattendue lors de l'appel GPT: {type(error).__name__}: {str(error)}")
+        raise GPTAPIError(f"Erreur inattendue: {type(error).__name__}: {str(error)}") from error
+
+    hint = retry_after(error)
+    if hint is not None:
+        delay = hint + random.uniform(0, base)
+        logger.debug(f"Retry-After du serveur : {hint:.1f}s")
+
+    if attempt >= max_retries - 1:
+        return None
+    logger.debug(f"Attente de {delay:.2f}s avant nouvelle tentative...")
+    return delay
+
+
+def _fallback_model(
+    error: Exception,
+    step: str,
+    role: str,
+    model: str,
+    prompt_tokens: int,
+    model_override: Optional[str],
+) -> Optional[str]:
+    """
+    Enregistre l'échec d'un appel et choisit un autre modèle si le modèle est indisponible.
+
+    Returns:
+        Le modèle de repli de la route après une erreur 429 ou un disjoncteur
+        ouvert, sinon None (nouvelle tentative sur le même modèle)
+    """
+    router = get_router()
+    if not isinstance(error, (RateLimitError, CircuitOpenError)) or model_override:
+        router.record_error(step, model)
+        return None
+    if isinstance(error, RateLimitError):
+        router.mark_rate_limited(model)
+    fallback = router.select(step, role, prompt_tokens, exclude=(model,))
+    router.record_error(step, model, fallback=fallback is not None)
+    if fallback is not None:
+        logger.warning(f"{model} indisponible ({error}), bascule de l'étape {step} sur {fallback}")
+    return fallback
+
+
+def _estimate_call(
+    prompt: str, role: str, model: str, n: int = 1, step: Optional[str] = None
+) -> Tuple[int, int]:
+    """
+    Compte les tokens d'un appel et vérifie qu'il tient dans la fenêtre de contexte.
+
+    La vérification de la fenêtre porte sur le budget de complétion du rôle
+    (``max_tokens``), mais la réservation de quota porte sur la complétion
+    moyenne mesurée pour l'étape : réserver ``max_tokens`` à chaque appel
+    épuiserait le quota TPM bien avant l'usage réel. L'écart est réconcilié
+    après l'appel (:meth:`RateLimiter.record_usage`).
+
+    Args:
+        prompt: Le prompt à envoyer
+        role: Le rôle de l'agent (détermine le budget de complétion)
+        model: Le modèle appelé
+        n: Nombre de réponses demandées (chacune avec sa complétion)
+        step: Étape du brainstorm (télémétrie de la complétion attendue)
+
+    Returns:
+        Tuple (tokens du prompt, tokens à réserver : prompt + complétions attendues)
+
+    Raises:
+        GPTContextLengthError: Si le prompt et la complétion attendue dépassent
+            la fenêtre de contexte (comptage exact uniquement)
+    """
+    prompt_tokens = estimate_tokens(prompt, model)
+    completion_tokens = config.get_token_budget(role)["completion"]
+    context_window = config.get_context_window(model)
+
+    if prompt_tokens + completion_tokens > context_window:
+        message = (
+            f"Prompt de {prompt_tokens} tokens + {completion_tokens} tokens de complétion "
+            f"au-delà de la fenêtre de {context_window} tokens ({model}, rôle {role})"
+        )
+        if is_exact(model):
+            logger.error(message)
+            raise GPTContextLengthError(message)
+        # Comptage heuristique : l'API reste juge
+        logger.warning(f"{message} (estimation)")
+
+    expected = get_expected_completion(step or role)
+    if expected is not None:
+        completion_tokens = min(completion_tokens, int(round(expected)))
+    return prompt_tokens, prompt_tokens + completion_tokens * max(1, n)
+
+
+def _cache_key(model: str, temperature: float, role: str, prompt: str) -> str:
+    """Clé de cache d'un appel, propre au backend configuré."""
+    return ResponseCache.make_key(model, temperature, role, prompt, backend_type())
+
+
+def _cache_lookup(
+    model: str, temperature: float, role: str, prompt: str
+) -> Tuple[Optional[ResponseCache], Optional[str], Optional[str]]:
+    """
+    Consulte le cache de réponses s'il est activé.
+
+    Returns:
+        Tuple (cache, clé, réponse en cache ou None)
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return None, None, None
+    key = _cache_key(model, temperature, role, prompt)
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info(f"Réponse servie depuis le cache - Modèle: {model}, Rôle: {role}")
+    return cache, key, cached
+
+
+def _final_error(max_retries: int, last_error: Optional[Exception]) -> GPTAPIError:
+    """Construit l'erreur levée après épuisement des tentatives."""
+    logger.error(f"Échec définitif après {max_retries} tentatives")
+    return GPTAPIError(
+        f"Échec GPT après {max_retries} tentatives: {type(last_error).__name__}: {str(last_error)}"
+    )
+
+
+def _complete(
+    client: GPTClient,
+    model: str,
+    prompt: str,
+    temperature: float,
+    estimated_tokens: int,
+    timeout: Optional[float] = None,
+    n: int = 1,
+) -> Tuple[Completion, str]:
+    """
+    Appelle le backend, avec une requête de secours si l'appel traîne (``api.hedging``).
+
+    Args:
+        timeout: Délai maximal de la tentative, transmis au backend
+        n: Nombre de réponses demandées
+
+    Returns:
+        Tuple (complétion retenue, modèle qui l'a produite)
+    """
+    messages = [{"role": "user", "content": prompt}]
+    options: Dict[str, Any] = {"timeout": timeout} if timeout else {}
+    if n > 1:
+        options["n"] = n
+    delay = hedge_delay(get_latency_tracker(), model)
+    if delay is None:
+        return timed(
+            lambda: client.backend.complete(model, messages, temperature, **options), model
+        )(), model
+
+    hedge_model = config.get_hedging_config()["fallback_model"] or model
+    models = (model, hedge_model)
+    rate_limiter = get_rate_limiter()
+
+    def may_hedge() -> bool:
+        # Pas de secours vers un modèle dont le disjoncteur n'est pas fermé
+        breaker = get_circuit_breaker(hedge_model)
+        if breaker is not None and breaker.state != FERME:
+            return False
+        # Un secours qui devrait attendre son quota arriverait trop tard
+        if rate_limiter.expected_wait(hedge_model, estimated_tokens) > 0:
+            return False
+        rate_limiter.acquire(hedge_model, estimated_tokens)
+        return True
+
+    def hedge_request() -> Completion:
+        # Le secours informe le disjoncteur de son modèle, qu'il gagne ou non
+        try:
+            completion = client.backend.complete(hedge_model, messages, temperature, **options)
+        except Exception as e:
+            _record_outcome(hedge_model, e)
+            raise
+        _record_outcome(hedge_model)
+        return completion
+
+    def on_discarded(index: int, completion: Completion) -> None:
+        # Réponse perdante : payée mais inutilisée, comptée à part
+        tokens = completion.prompt_tokens + completion.completion_tokens
+        rate_limiter.record_usage(models[index], estimated_tokens, tokens)
+        client.add_hedge_usage(
+            tokens,
+            config.calculate_cost(
+                models[index], completion.prompt_tokens, completion.completion_tokens
+            ),
+        )
+
+    def on_abandoned(index: int) -> None:
+        # Requête annulée ou en échec : son quota réservé est rendu
+        rate_limiter.record_usage(models[index], estimated_tokens, 0)
+
+    completion, winner, hedged = hedged_call(
+        get_hedge_executor(),
+        timed(lambda: client.backend.complete(model, messages, temperature, **options), model),
+        timed(hedge_request, hedge_model),
+        delay,
+        may_hedge,
+        on_discarded,
+        on_abandoned,
+    )
+    if hedged:
+        client.add_hedge(won=winner == 1)
+    return completion, models[winner]
+
+
 def gpt(
     prompt: str,
     role: str,
     model_override: Optional[str] = None,
     temperature: Optional[float] = None,
     max_retries: Optional[int] = None,
-) -> str:
+    step: Optional[str] = None,
+    n: int = 1,
+) -> Union[str, List[str]]:
     """
     Fonction centrale pour appeler l'API GPT avec retry et calcul des coûts.
 
@@ -124,101 +758,374 @@ def gpt(
         model_override: Permet de forcer un modèle spécifique (optionnel)
         temperature: Température du modèle (par défaut selon la config du rôle)
         max_retries: Nombre de tentatives (par défaut selon la config)
+        step: Étape du brainstorm servant au routage (par défaut le rôle)
+        n: Nombre de réponses candidates demandées en un seul appel (les
+            tokens du prompt ne sont facturés qu'une fois) ; au-delà de 1, ni
+            streaming ni cache
 
     Returns:
-        Le contenu de la réponse de l'API
+        Le contenu de la réponse de l'API, ou la liste des réponses si ``n > 1``
+        (un backend sans support des choix multiples n'en renvoie qu'une)
 
     Raises:
         GPTAPIError: En cas d'échec après toutes les tentatives
+        GPTContextLengthError: Si le prompt dépasse la fenêtre de contexte du modèle
+        BudgetExceededError: Si le budget du run est épuisé
+        GPTTimeoutError: Si l'appel dépasse ``api.call_timeout``
+        DeadlineExceededError: Si l'échéance du run est dépassée
     """
-    # Configuration
-    model = model_override if model_override else config.get_model_for_role(role)
-    if temperature is None:
-        temperature = config.get_temperature_for_role(role)
-    if max_retries is None:
-        max_retries = config.max_retries
+    if n <= 1 and config.get("api.streaming", False):
+        return "".join(
+            gpt_stream(prompt, role, model_override, temperature, max_retries, step)
+        ).strip()
+
+    step = step or role
+    model, temperature, max_retries = _resolve_call_params(
+        prompt, role, step, model_override, temperature, max_retries
+    )
+
+    cache, cache_key, cached = (
+        _cache_lookup(model, temperature, role, prompt) if n <= 1 else (None, None, None)
+    )
+    if cached is not None:
+        return cached
 
-    # Retry avec backoff exponentiel
+    prompt_tokens, estimated_tokens = _estimate_call(prompt, role, model, n, step)
+
+    # Retry avec backoff exponentiel, dans la limite de l'échéance de l'appel
+    deadline = _call_deadline()
     last_error = None
+    delay = None
     for attempt in range(max_retries):
+        timeout = _attempt_timeout(deadline, role, last_error)
         try:
             logger.debug(
                 f"Appel GPT - Modèle: {model}, Rôle: {role}, Tentative: {attempt + 1}/{max_retries}"
             )
 
-            # Appel à l'API OpenAI
+            _check_circuit(model)
+
+            # Respect proactif des quotas RPM/TPM du modèle
+            get_rate_limiter().acquire(model, estimated_tokens)
+
+            # Appel au backend (API OpenAI par défaut)
             client = get_gpt_client()
-            response = client.client.chat.completions.create(
-                model=model, messages=[{"role": "user", "content": prompt}], temperature=temperature
+            started_at = time.monotonic()
+            completion, answered_by = _complete(
+                client, model, prompt, temperature, estimated_tokens, timeout, n
+            )
+            for responder in {model, answered_by}:
+                _record_outcome(responder)
+            content = _record_completion(
+                client, completion, answered_by, step, started_at, estimated_tokens
+            )
+            if n > 1:
+                return [choice.strip() for choice in completion.choices] or [content]
+            if cache is not None:
+                cache.set(cache_key, model, role, content)
+            return content
+
+        except Exception as e:
+            last_error = e
+            _record_outcome(model, e)
+            fallback = _fallback_model(e, step, role, model, prompt_tokens, model_override)
+            if fallback is not None:
+                model = fallback
+                prompt_tokens, estimated_tokens = _estimate_call(prompt, role, model, n, step)
+                if cache is not None:
+                    cache_key = _cache_key(model, temperature, role, prompt)
+                continue
+            delay = _backoff(_retry_delay(e, attempt, max_retries, delay), deadline, role, e)
+            if delay is not None:
+                time.sleep(delay)
+
+    # Dernière tentative échouée
+    raise _final_error(max_retries, last_error)
+
+
+def gpt_stream(
+    prompt: str,
+    role: str,
+    model_override: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_retries: Optional[int] = None,
+    step: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Appelle l'API GPT en streaming et produit les fragments de texte au fil de l'eau.
+
+    Les tentatives (retry) ne sont possibles que tant qu'aucun fragment n'a été
+    produit. L'usage et le coût sont comptabilisés à la fin du flux, et les
+    observateurs enregistrés via :func:`add_stream_listener` sont notifiés
+    (début, fragments, fin avec temps jusqu'au premier token et débit).
+
+    Args:
+        prompt: Le prompt à envoyer à l'API
+        role: Le rôle de l'agent (creatif, critique, revision, etc.)
+        model_override: Permet de forcer un modèle spécifique (optionnel)
+        temperature: Température du modèle (par défaut selon la config du rôle)
+        max_retries: Nombre de tentatives (par défaut selon la config)
+        step: Étape du brainstorm servant au routage (par défaut le rôle)
+
+    Yields:
+        Les fragments de texte de la réponse
+
+    Raises:
+        GPTAPIError: En cas d'échec après toutes les tentatives ou d'interruption du flux
+        BudgetExceededError: Si le budget du run est épuisé
+        GPTTimeoutError: Si l'appel dépasse ``api.call_timeout``
+        DeadlineExceededError: Si l'échéance du run est dépassée
+    """
+    step = step or role
+    model, temperature, max_retries = _resolve_call_params(
+        prompt, role, step, model_override, temperature, max_retries
+    )
+
+    cache, cache_key, cached = _cache_lookup(model, temperature, role, prompt)
+    if cached is not None:
+        yield cached
+        return
+
+    estimated_prompt_tokens, estimated_tokens = _estimate_call(prompt, role, model, step=step)
+
+    deadline = _call_deadline()
+    last_error = None
+    delay = None
+    for attempt in range(max_retries):
+        timeout = _attempt_timeout(deadline, role, last_error)
+        stream_id = next(_stream_ids)
+        chunks: List[str] = []
+        stream = None
+        try:
+            logger.debug(
+                f"Appel GPT (streaming) - Modèle: {model}, Rôle: {role}, "
+                f"Tentative: {attempt + 1}/{max_retries}"
             )
 
-            # Extraction des statistiques
-            usage = response.usage
-            prompt_tokens = usage.prompt_tokens if usage else 0
-            completion_tokens = usage.completion_tokens if usage else 0
+            _check_circuit(model)
+            get_rate_limiter().acquire(model, estimated_tokens)
 
-            # Calcul du coût
-            cost = config.calculate_cost(model, prompt_tokens, completion_tokens)
+            client = get_gpt_client()
+            started_at = time.monotonic()
+            first_token_at = None
+            _notify_stream("on_stream_start", stream_id, role, model)
+
+            stream = client.backend.stream(
+                model,
+                [{"role": "user", "content": prompt}],
+                temperature,
+                **({"timeout": timeout} if timeout else {}),
+            )
 
-            # Mise à jour des statistiques
-            client.add_usage(prompt_tokens, completion_tokens, cost)
+            usage = None
+            for chunk in stream:
+                if chunk.prompt_tokens is not None:
+                    usage = chunk
+                delta = chunk.text
+                if not delta:
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.monotonic()
+                    logger.debug(f"Premier token après {first_token_at - started_at:.2f}s")
+                chunks.append(delta)
+                _notify_stream("on_stream_chunk", stream_id, delta)
+                yield delta
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise _deadline_error(role, None)
 
-            logger.info(
-                f"Appel GPT réussi - Tokens: {prompt_tokens}+{completion_tokens}, Coût: ${cost:.4f}"
+            elapsed = time.monotonic() - started_at
+            _record_outcome(model)
+            content = "".join(chunks)
+            prompt_tokens = usage.prompt_tokens if usage else estimated_prompt_tokens
+            completion_tokens = (
+                usage.completion_tokens if usage else estimate_tokens(content, model)
+            )
+            _record_usage(
+                client,
+                model,
+                step,
+                prompt_tokens,
+                completion_tokens,
+                elapsed,
+                estimated_tokens,
             )
 
-            # Retourner uniquement le contenu de la réponse
-            return response.choices[0].message.content.strip()
+            _notify_stream(
+                "on_stream_end",
+                stream_id,
+                {
+                    "role": role,
+                    "model": model,
+                    "chars": len(content),
+                    "completion_tokens": completion_tokens,
+                    "elapsed": elapsed,
+                    "ttft": (first_token_at - started_at) if first_token_at else None,
+                },
+            )
 
-        except RateLimitError as e:
+            if cache is not None:
+                cache.set(cache_key, model, role, content.strip())
+            return
+
+        except Exception as e:
+            _notify_stream("on_stream_end", stream_id, {"role": role, "model": model, "error": e})
+            _record_outcome(model, e)
+            if isinstance(e, (GPTTimeoutError, DeadlineExceededError)):
+                raise
+            if chunks:
+                # Des fragments ont déjà été transmis : impossible de rejouer l'appel
+                logger.error(f"Flux GPT interrompu après {len(chunks)} fragments: {e}")
+                raise GPTAPIError(f"Flux interrompu: {type(e).__name__}: {str(e)}") from e
             last_error = e
-            logger.warning(
-                f"Limite de taux atteinte, tentative {attempt + 1}/{max_retries}: {str(e)}"
+            fallback = _fallback_model(
+                e, step, role, model, estimated_prompt_tokens, model_override
             )
-            # Pour les erreurs de rate limit, on attend plus longtemps
-            if attempt < max_retries - 1:
-                delay = config.retry_delay_base ** (attempt + 1) * 2
-                logger.debug(f"Attente de {delay}s avant nouvelle tentative...")
+            if fallback is not None:
+                model = fallback
+                estimated_prompt_tokens, estimated_tokens = _estimate_call(
+                    prompt, role, model, step=step
+                )
+                if cache is not None:
+                    cache_key = _cache_key(model, temperature, role, prompt)
+                continue
+            delay = _backoff(_retry_delay(e, attempt, max_retries, delay), deadline, role, e)
+            if delay is not None:
                 time.sleep(delay)
+        finally:
+            if stream is not None and hasattr(stream, "close"):
+                stream.close()
 
-        except (APIError, APIConnectionError, Timeout) as e:
-            last_error = e
-            logger.warning(f"Erreur API tentative {attempt + 1}/{max_retries}: {str(e)}")
+    raise _final_error(max_retries, last_error)
 
-            if attempt < max_retries - 1:
-                # Backoff exponentiel
-                delay = config.retry_delay_base**attempt
-                logger.debug(f"Attente de {delay}s avant nouvelle tentative...")
-                time.sleep(delay)
 
-        except Exception as e:
-            # Pour les erreurs inattendues, on les logue et on les relance
-            logger.error(f"Erreur inattendue lors de l'appel GPT: {type(e).__name__}: {str(e)}")
-            raise GPTAPIError(f"Erreur inattendue: {type(e).__name__}: {str(e)}") from e
+async def agpt(
+    prompt: str,
+    role: str,
+    model_override: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_retries: Optional[int] = None,
+    step: Optional[str] = None,
+) -> str:
+    """
+    Variante asynchrone de :func:`gpt` basée sur ``AsyncOpenAI``.
 
-    # Dernière tentative échouée
-    logger.error(f"Échec définitif après {max_retries} tentatives")
-    raise GPTAPIError(
-        f"Échec GPT après {max_retries} tentatives: {type(last_error).__name__}: {str(last_error)}"
+    Même sémantique de retry, de calcul des coûts et de statistiques que
+    :func:`gpt`, mais sans bloquer de thread : les attentes de backoff
+    utilisent ``asyncio.sleep``.
+
+    Args:
+        prompt: Le prompt à envoyer à l'API
+        role: Le rôle de l'agent (creatif, critique, revision, etc.)
+        model_override: Permet de forcer un modèle spécifique (optionnel)
+        temperature: Température du modèle (par défaut selon la config du rôle)
+        max_retries: Nombre de tentatives (par défaut selon la config)
+        step: Étape du brainstorm servant au routage (par défaut le rôle)
+
+    Returns:
+        Le contenu de la réponse de l'API
+
+    Raises:
+        GPTAPIError: En cas d'échec après toutes les tentatives
+        BudgetExceededError: Si le budget du run est épuisé
+        GPTTimeoutError: Si l'appel dépasse ``api.call_timeout``
+        DeadlineExceededError: Si l'échéance du run est dépassée
+    """
+    step = step or role
+    model, temperature, max_retries = _resolve_call_params(
+        prompt, role, step, model_override, temperature, max_retries
     )
 
+    # Le cache SQLite est synchrone : ses accès passent par un thread pour ne
+    # pas bloquer la boucle d'événements
+    loop = asyncio.get_running_loop()
+    cache, cache_key, cached = await loop.run_in_executor(
+        None, _cache_lookup, model, temperature, role, prompt
+    )
+    if cached is not None:
+        return cached
+
+    prompt_tokens, estimated_tokens = _estimate_call(prompt, role, model, step=step)
+
+    deadline = _call_deadline()
+    last_error = None
+    delay = None
+    for attempt in range(max_retries):
+        timeout = _attempt_timeout(deadline, role, last_error)
+        try:
+            logger.debug(
+                f"Appel GPT async - Modèle: {model}, Rôle: {role}, "
+                f"Tentative: {attempt + 1}/{max_retries}"
+            )
+
+            _check_circuit(model)
+            await get_rate_limiter().acquire_async(model, estimated_tokens)
+
+            client = get_gpt_client()
+            started_at = time.monotonic()
+            # wait_for borne aussi les backends qui ignorent l'option timeout
+            completion = await asyncio.wait_for(
+                client.backend.acomplete(
+                    model,
+                    [{"role": "user", "content": prompt}],
+                    temperature,
+                    **({"timeout": timeout} if timeout else {}),
+                ),
+                timeout,
+            )
+            _record_outcome(model)
+            content = _record_completion(
+                client, completion, model, step, started_at, estimated_tokens
+            )
+            if cache is not None:
+                await loop.run_in_executor(None, cache.set, cache_key, model, role, content)
+            return content
+
+        except Exception as e:
+            last_error = e
+            _record_outcome(model, e)
+            fallback = _fallback_model(e, step, role, model, prompt_tokens, model_override)
+            if fallback is not None:
+                model = fallback
+                prompt_tokens, estimated_tokens = _estimate_call(prompt, role, model, step=step)
+                if cache is not None:
+                    cache_key = _cache_key(model, temperature, role, prompt)
+                continue
+            delay = _backoff(_retry_delay(e, attempt, max_retries, delay), deadline, role, e)
+            if delay is not None:
+                await asyncio.sleep(delay)
+
+    raise _final_error(max_retries, last_error)
+
 
 def get_gpt_stats() -> Dict[str, Any]:
     """Retourne les statistiques globales d'utilisation de l'API."""
-    return get_gpt_client().get_stats()
+    stats = get_gpt_client().get_stats()
+    cache = get_response_cache()
+    if cache is not None:
+        stats.update(cache.get_stats())
+    else:
+        stats.update({"cache_hits": 0, "cache_misses": 0, "cache_hit_rate": 0.0})
+    stats["routes"] = get_router().get_stats()
+    return stats
 
 
 def reset_gpt_stats():
     """Réinitialise les statistiques d'utilisation."""
     get_gpt_client().reset_stats()
+    get_router().reset_stats()
+    cache = get_response_cache()
+    if cache is not None:
+        cache.reset_stats()
     logger.info("Statistiques GPT réinitialisées")
 
 
-@lru_cache(maxsize=128)
-def estimate_tokens(text: str) -> int:
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
     """
-    Estime le nombre de tokens dans un texte (approximation).
+    Compte le nombre de tokens d'un texte pour un modèle.
 
-    Règle approximative : ~1 token pour 4 caractères en français.
+    Exact si ``tiktoken`` est disponible, sinon approximation de ~1 token pour
+    4 caractères en français. Pas de cache sur le texte : l'encodeur est mis en
+    cache par modèle, et hacher des prompts de plusieurs centaines de
+    kilo-octets coûterait autant que les compter.
     """
-    return len(text) // 4
+    return count_tokens(text, model)
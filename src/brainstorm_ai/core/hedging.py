@@ -0,0 +1,191 @@
+"""
+Module de requêtes de secours (hedging) contre la latence de queue.
+
+Lorsqu'un appel dépasse un percentile élevé des latences observées de son
+modèle, une requête identique (éventuellement vers un modèle de repli) est
+lancée en parallèle et la première réponse obtenue est retenue. La requête
+perdante est annulée si elle n'a pas encore démarré ; sinon sa réponse est
+ignorée à son arrivée et son coût est signalé à l'appelant. Une requête
+annulée ou en échec est elle aussi signalée, pour que l'appelant rende le
+quota qu'il lui avait réservé.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Nombre de latences conservées par modèle
+LATENCY_WINDOW = 200
+
+
+class LatencyTracker:
+    """Fenêtre glissante des latences d'appel par modèle."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, model: str, latency: float) -> None:
+        """Enregistre la latence d'un appel terminé."""
+        with self._lock:
+            self._latencies.setdefault(model, deque(maxlen=self._window)).append(latency)
+
+    def percentile(self, model: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Retourne le percentile ``q`` des latences du modèle.
+
+        Returns:
+            La latence en secondes, ou None s'il y a moins de ``min_samples`` mesures
+        """
+        with self._lock:
+            samples = list(self._latencies.get(model, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        return float(np.percentile(samples, q))
+
+
+def hedge_delay(tracker: LatencyTracker, model: str) -> Optional[float]:
+    """
+    Calcule le délai avant la requête de secours d'un appel.
+
+    Returns:
+        Le délai en secondes, ou None si le hedging est désactivé
+    """
+    hedging = config.get_hedging_config()
+    if not hedging["enabled"]:
+        return None
+    delay = tracker.percentile(model, hedging["percentile"], hedging["min_samples"])
+    if delay is None:
+        delay = hedging["initial_delay"]
+    return max(delay, hedging["min_delay"])
+
+
+def _discard(
+    future: Future,
+    index: int,
+    on_discarded: Callable[[int, T], None],
+    on_abandoned: Callable[[int], None],
+) -> None:
+    """Annule une requête perdante, ou signale sa réponse (ou son échec) à son arrivée."""
+    if future.cancel():
+        on_abandoned(index)
+        return
+
+    def done(f: Future) -> None:
+        if f.cancelled() or f.exception() is not None:
+            on_abandoned(index)
+        else:
+            on_discarded(index, f.result())
+
+    future.add_done_callback(done)
+
+
+def hedged_call(
+    executor: ThreadPoolExecutor,
+    primary: Callable[[], T],
+    hedge: Callable[[], T],
+    delay: float,
+    may_hedge: Callable[[], bool] = lambda: True,
+    on_discarded: Optional[Callable[[int, T], None]] = None,
+    on_abandoned: Optional[Callable[[int], None]] = None,
+) -> Tuple[T, int, bool]:
+    """
+    Exécute un appel avec une requête de secours après ``delay`` secondes.
+
+    Args:
+        executor: Pool de threads exécutant les requêtes
+        primary: La requête principale
+        hedge: La requête de secours
+        delay: Délai avant le lancement de la requête de secours
+        may_hedge: Appelé avant le lancement du secours ; False pour y renoncer
+            (ex: quota insuffisant)
+        on_discarded: Appelé avec (index, résultat) pour chaque réponse ignorée
+        on_abandoned: Appelé avec l'index de chaque requête annulée ou en échec,
+            sauf l'erreur de la requête principale propagée à l'appelant
+
+    Returns:
+        Tuple (résultat retenu, index de la requête gagnante : 0 principale,
+        1 secours, vrai si le secours a été lancé)
+
+    Raises:
+        Exception: L'erreur de la requête principale si aucune requête n'aboutit
+    """
+    on_discarded = on_discarded or (lambda *_: None)
+    on_abandoned = on_abandoned or (lambda *_: None)
+    futures: List[Future] = [executor.submit(primary)]
+    done, _ = wait(futures, timeout=delay)
+    if not done and may_hedge():
+        logger.info(f"Requête lente (> {delay:.1f}s) : lancement d'une requête de secours")
+        futures.append(executor.submit(hedge))
+
+    errors: Dict[int, BaseException] = {}
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        winner = None
+        for future in sorted(done, key=futures.index):
+            index = futures.index(future)
+            if future.exception() is not None:
+                errors[index] = future.exception()
+                if index > 0:
+                    on_abandoned(index)
+            elif winner is None:
+                winner = (future.result(), index)
+            else:
+                on_discarded(index, future.result())
+        if winner is not None:
+            if 0 in errors:
+                on_abandoned(0)
+            for future in pending:
+                _discard(future, futures.index(future), on_discarded, on_abandoned)
+            return winner[0], winner[1], len(futures) > 1
+
+    raise errors.get(0) or errors[1]
+
+
+# Instances globales (initialisation lazy)
+_latency_tracker = LatencyTracker()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Retourne le suivi global des latences par modèle."""
+    return _latency_tracker
+
+
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """Retourne le pool de threads des requêtes avec secours."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=config.get_hedging_config()["max_workers"],
+                    thread_name_prefix="hedge",
+                )
+    return _executor
+
+
+def timed(func: Callable[[], T], model: str) -> Callable[[], T]:
+    """Enveloppe une requête pour enregistrer sa latence dans le suivi global."""
+
+    def run() -> T:
+        started_at = time.monotonic()
+        result = func()
+        _latency_tracker.record(model, time.monotonic() - started_at)
+        return result
+
+    return run
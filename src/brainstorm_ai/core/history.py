@@ -0,0 +1,202 @@
+"""
+Module de gestion de l'historique des idées entre les cycles.
+
+L'historique est une fenêtre bornée : les entrées les plus anciennes sont
+retirées quand la taille du texte joint dépasse la limite de contexte, en
+caractères et/ou en tokens. Les entrées anciennes peuvent aussi être
+condensées en un résumé (compaction) pour garder un prompt de taille stable.
+"""
+
+import re
+from collections import deque
+from typing import Callable, Deque, Iterable, Iterator, List, Optional
+
+from .utils import dedupe, extract_numbered_ideas
+
+# En-tête du résumé produit par la compaction de l'historique
+SUMMARY_HEADER = "Résumé des idées déjà proposées :"
+
+_NUMBERING = re.compile(r"^\s*\d+\s*[.)\-:]?\s*")
+
+
+def summarize_extractive(
+    entries: Iterable[str], max_ideas: int = 30, max_idea_chars: int = 200
+) -> str:
+    """
+    Condense des créations en une liste numérotée de leurs idées, sans appel API.
+
+    Les lignes numérotées de chaque entrée (y compris d'un résumé précédent)
+    sont extraites, dédupliquées et tronquées ; seules les ``max_ideas`` plus
+    récentes sont conservées.
+
+    Args:
+        entries: Entrées à condenser, de la plus ancienne à la plus récente
+        max_ideas: Nombre maximal d'idées conservées
+        max_idea_chars: Longueur maximale d'une idée
+
+    Returns:
+        Le résumé, précédé de :data:`SUMMARY_HEADER`
+    """
+    ideas: List[str] = []
+    for entry in entries:
+        lines = extract_numbered_ideas(entry)
+        if not lines:
+            # Entrée sans liste numérotée : on garde sa première ligne
+            lines = [line for line in entry.splitlines() if line.strip()][:1]
+        for line in lines:
+            idea = _NUMBERING.sub("", line.strip())
+            if len(idea) > max_idea_chars:
+                idea = idea[: max_idea_chars - 1].rstrip() + "…"
+            ideas.append(idea)
+
+    ideas = dedupe(ideas)[-max_ideas:]
+    numbered = [f"{i}. {idea}" for i, idea in enumerate(ideas, 1)]
+    return "\n".join([SUMMARY_HEADER, *numbered])
+
+
+class HistoryWindow:
+    """
+    Fenêtre d'historique bornée en caractères et en tokens.
+
+    Les entrées sont stockées dans un ``deque`` avec des compteurs de caractères
+    et de tokens tenus à jour, ce qui rend l'ajout et le retrait en temps
+    constant amorti (chaque entrée n'est tokenisée qu'une fois, à l'ajout).
+    Le texte joint n'est reconstruit que lorsqu'il est demandé après une
+    modification.
+    """
+
+    def __init__(
+        self,
+        max_chars: Optional[int] = None,
+        entries: Iterable[str] = (),
+        separator: str = "\n",
+        max_tokens: Optional[int] = None,
+        token_counter: Optional[Callable[[str], int]] = None,
+    ):
+        """
+        Args:
+            max_chars: Taille maximale du texte joint (None = illimitée)
+            entries: Entrées initiales
+            separator: Séparateur utilisé pour joindre les entrées
+            max_tokens: Nombre maximal de tokens du texte joint (None = illimité)
+            token_counter: Fonction de comptage des tokens d'une entrée
+                (par défaut ~4 caractères par token)
+        """
+        self.max_chars = max_chars
+        self.max_tokens = max_tokens
+        self.separator = separator
+        self._count_tokens = token_counter or (lambda text: len(text) // 4)
+        self._entries: Deque[str] = deque()
+        self._entry_tokens: Deque[int] = deque()
+        self._chars = 0
+        self._tokens = 0
+        self._joined: Optional[str] = None
+        for entry in entries:
+            self._push(entry)
+        self.trim()
+
+    def _push(self, entry: str) -> None:
+        tokens = self._count_tokens(entry)
+        self._entries.append(entry)
+        self._entry_tokens.append(tokens)
+        self._chars += len(entry)
+        self._tokens += tokens
+        self._joined = None
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self._entry_tokens.clear()
+        self._chars = 0
+        self._tokens = 0
+        self._joined = None
+
+    def _pop_oldest(self) -> str:
+        entry = self._entries.popleft()
+        self._chars -= len(entry)
+        self._tokens -= self._entry_tokens.popleft()
+        self._joined = None
+        return entry
+
+    @property
+    def joined_length(self) -> int:
+        """Longueur du texte joint, sans le construire."""
+        if not self._entries:
+            return 0
+        return self._chars + len(self.separator) * (len(self._entries) - 1)
+
+    @property
+    def token_count(self) -> int:
+        """Nombre de tokens des entrées (séparateurs négligés)."""
+        return self._tokens
+
+    def _over_limit(self) -> bool:
+        if self.max_chars is not None and self.joined_length > self.max_chars:
+            return True
+        return self.max_tokens is not None and self._tokens > self.max_tokens
+
+    def append(self, entry: str) -> None:
+        """Ajoute une entrée puis retire les plus anciennes si une limite est dépassée."""
+        self._push(entry)
+        self.trim()
+
+    def trim(self) -> int:
+        """
+        Retire les entrées les plus anciennes jusqu'à respecter les limites.
+
+        Returns:
+            Le nombre d'entrées retirées
+        """
+        removed = 0
+        while self._entries and self._over_limit():
+            self._pop_oldest()
+            removed += 1
+        return removed
+
+    def compact(self, summarize: Callable[[List[str]], str], keep_recent: int) -> int:
+        """
+        Remplace les entrées anciennes par un résumé unique placé en tête.
+
+        Args:
+            summarize: Fonction qui condense une liste d'entrées en un texte
+            keep_recent: Nombre d'entrées récentes conservées telles quelles
+
+        Returns:
+            Le nombre d'entrées condensées (0 si rien à condenser)
+        """
+        old_count = len(self._entries) - max(keep_recent, 0)
+        if old_count < 2:
+            # Au plus une entrée ancienne (souvent le résumé précédent) : rien à gagner
+            return 0
+        entries = list(self._entries)
+        summary = summarize(entries[:old_count])
+        self._clear()
+        for entry in [summary, *entries[old_count:]]:
+            self._push(entry)
+        self.trim()
+        return old_count
+
+    @property
+    def joined(self) -> str:
+        """Texte joint des entrées (construit à la demande puis mis en cache)."""
+        if self._joined is None:
+            self._joined = self.separator.join(self._entries)
+        return self._joined
+
+    def __str__(self) -> str:
+        return self.joined
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __getitem__(self, index: int) -> str:
+        return self._entries[index]
+
+    def __repr__(self) -> str:
+        return (
+            f"HistoryWindow(entries={len(self)}, chars={self.joined_length}, "
+            f"tokens={self._tokens}, max_chars={self.max_chars}, "
+            f"max_tokens={self.max_tokens})"
+        )
@@ -0,0 +1,433 @@
+"""
+Module d'index persistant des idées déjà générées lors des runs précédents.
+
+Chaque idée est résumée par une signature MinHash (calculée avec NumPy sur
+ses 3-grammes de mots) et rangée dans une table LSH par bandes : une requête
+ne compare la nouvelle idée qu'aux quelques candidates partageant une bande,
+en temps quasi constant quelle que soit la taille de l'index.
+
+L'index est alimenté par les logs exportés (``data/logs/*.json`` ou
+``*.yaml``) et sauvegardé dans un fichier JSON, mis à jour de façon
+incrémentale lorsque de nouveaux logs apparaissent. Chaque idée garde la
+portée de son run (objectif, contexte, contraintes) : un plan n'est
+retrouvé que pour un brainstorm de même portée.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+from .config import config
+from .types import ApplicationLog
+
+logger = logging.getLogger(__name__)
+
+# Signature d'un texte vide : supérieure à toute valeur de hachage (32 bits)
+_EMPTY_HASH = np.uint64(np.iinfo(np.uint64).max)
+_SHIFT = np.uint64(32)
+
+_WORD = re.compile(r"\w+")
+
+INDEX_VERSION = 2
+
+
+def run_scope(objectif: str, contexte: str, contraintes: str) -> str:
+    """
+    Empreinte de la portée d'un run (objectif, contexte et contraintes normalisés).
+
+    Returns:
+        Une empreinte hexadécimale courte
+    """
+    parts = [" ".join(_WORD.findall(text.lower())) for text in (objectif, contexte, contraintes)]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _shingles(text: str, size: int = 3) -> np.ndarray:
+    """Hash (crc32) des n-grammes de mots d'un texte normalisé."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i : i + size]) for i in range(len(words) - size + 1)]
+    return np.unique(np.array([zlib.crc32(g.encode("utf-8")) for g in grams], dtype=np.uint64))
+
+
+class MinHasher:
+    """Calcul vectorisé de signatures MinHash."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        """
+        Args:
+            num_perm: Nombre de permutations (longueur de la signature)
+            seed: Graine des permutations (doit rester stable pour un même index)
+        """
+        self.num_perm = num_perm
+        rng = np.random.default_rng(seed)
+        # Hachage multiply-shift : (a * h + b) mod 2^64 (débordement natif des
+        # uint64), dont on garde les 32 bits de poids fort ; a impair
+        self._a = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64)
+        self._a |= np.uint64(1)
+        self._b = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Calcule la signature MinHash d'un texte.
+
+        Returns:
+            Tableau de ``num_perm`` entiers (valeur maximale si le texte est vide)
+        """
+        shingles = _shingles(text)
+        if shingles.size == 0:
+            return np.full(self.num_perm, _EMPTY_HASH, dtype=np.uint64)
+        hashed = (np.outer(self._a, shingles) + self._b[:, None]) >> _SHIFT
+        return hashed.min(axis=1)
+
+
+@dataclass
+class IdeaMatch:
+    """Idée d'un run précédent proche d'une nouvelle idée."""
+
+    idee: str
+    similarity: float
+    source: str
+    application: Optional[ApplicationLog] = None
+    scope: str = ""
+
+
+@dataclass
+class _Entry:
+    idee: str
+    source: str
+    application: Optional[ApplicationLog] = None
+    signature: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.uint64))
+    scope: str = ""
+
+
+class IdeaIndex:
+    """Index MinHash/LSH persistant des idées et plans des runs précédents."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        num_perm: int = 128,
+        bands: int = 32,
+        seed: int = 1,
+    ):
+        """
+        Args:
+            path: Fichier JSON de l'index (None = index en mémoire uniquement)
+            num_perm: Longueur des signatures MinHash
+            bands: Nombre de bandes LSH (``num_perm`` doit en être un multiple)
+            seed: Graine des permutations MinHash
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) doit être un multiple de bands ({bands})")
+        self.path = Path(path) if path else None
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.seed = seed
+        self.hasher = MinHasher(num_perm, seed)
+        self._entries: List[_Entry] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._sources: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows : (band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def _insert(self, entry: _Entry) -> None:
+        position = len(self._entries)
+        self._entries.append(entry)
+        for band, key in enumerate(self._band_keys(entry.signature)):
+            self._buckets[band].setdefault(key, []).append(position)
+        self._dirty = True
+
+    def add(
+        self,
+        idee: str,
+        source: str = "",
+        application: Optional[ApplicationLog] = None,
+        scope: str = "",
+    ) -> None:
+        """
+        Ajoute une idée (et éventuellement son plan développé) à l'index.
+
+        Args:
+            idee: Texte de l'idée
+            source: Origine de l'idée (ex: nom du log)
+            application: Log d'application de l'idée, si elle a été développée
+            scope: Portée du run d'origine (:func:`run_scope`)
+        """
+        if not idee.strip():
+            return
+        entry = _Entry(idee, source, application, self.hasher.signature(idee), scope)
+        with self._lock:
+            self._insert(entry)
+
+    def query(
+        self, texte: str, threshold: float = 0.8, limit: Optional[int] = 5
+    ) -> List[IdeaMatch]:
+        """
+        Recherche les idées indexées proches d'un texte.
+
+        Args:
+            texte: Le texte recherché (idée ou création)
+            threshold: Similarité de Jaccard estimée minimale (0-1)
+            limit: Nombre maximal de résultats (None = tous)
+
+        Returns:
+            Les idées proches, de la plus similaire à la moins similaire
+        """
+        signature = self.hasher.signature(texte)
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+            matches = []
+            for position in candidates:
+                entry = self._entries[position]
+                similarity = float(np.mean(entry.signature == signature))
+                if similarity >= threshold:
+                    matches.append(
+                        IdeaMatch(
+                            entry.idee, similarity, entry.source, entry.application, entry.scope
+                        )
+                    )
+        matches.sort(key=lambda match: match.similarity, reverse=True)
+        return matches if limit is None else matches[:limit]
+
+    def find_developed(
+        self, idee: str, threshold: float = 0.8, scope: Optional[str] = None
+    ) -> Optional[IdeaMatch]:
+        """
+        Retourne l'idée déjà développée (avec plan) la plus proche, ou None.
+
+        Args:
+            idee: L'idée recherchée
+            threshold: Similarité de Jaccard estimée minimale (0-1)
+            scope: Portée du run courant ; seules les idées d'un run de même
+                portée sont retenues (None = toutes)
+        """
+        for match in self.query(idee, threshold, limit=None):
+            if match.application is not None and scope in (None, match.scope):
+                return match
+        return None
+
+    def add_log(self, log: Dict[str, Any], source: str) -> int:
+        """
+        Indexe les idées d'un log de brainstorm exporté.
+
+        Les idées développées sont indexées avec leur plan ; les idées des
+        créations de chaque cycle sont indexées sans plan.
+
+        Returns:
+            Le nombre d'idées ajoutées
+        """
+        scope = run_scope(
+            log.get("objectif") or "", log.get("contexte") or "", log.get("contraintes") or ""
+        )
+        added = 0
+        for application in log.get("application") or []:
+            # Une idée dont le développement a échoué n'a pas de plan à réutiliser
+            if application.get("idee") and not application.get("erreur"):
+                self.add(application["idee"], source, application, scope)
+                added += 1
+        for cycle in log.get("logs") or []:
+            for ligne in (cycle.get("creation") or "").splitlines():
+                ligne = ligne.strip()
+                if ligne and ligne[0].isdigit():
+                    self.add(ligne, source, scope=scope)
+                    added += 1
+        return added
+
+    def sync(self, logs_dir: str) -> int:
+        """
+        Indexe les logs exportés qui ne l'ont pas encore été (ou ont changé).
+
+        Un run exporté en JSON et en YAML n'est indexé qu'une fois (JSON prioritaire).
+
+        Args:
+            logs_dir: Dossier des logs exportés
+
+        Returns:
+            Le nombre d'idées ajoutées
+        """
+        directory = Path(logs_dir)
+        if not directory.is_dir():
+            return 0
+
+        runs: Dict[str, Path] = {}
+        for pattern in ("*.yaml", "*.yml", "*.json"):
+            for path in directory.glob(pattern):
+                runs[path.stem] = path  # le JSON, parcouru en dernier, l'emporte
+
+        added = 0
+        with self._lock:
+            for stem, path in sorted(runs.items()):
+                mtime = path.stat().st_mtime
+                if self._sources.get(stem) == mtime:
+                    continue
+                if stem in self._sources:
+                    # Log modifié : on repart des entrées des autres sources
+                    self._remove_source(stem)
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        log = json.load(f) if path.suffix == ".json" else yaml.safe_load(f)
+                except (OSError, ValueError, yaml.YAMLError) as e:
+                    logger.warning(f"Log ignoré par l'index d'idées ({path}): {e}")
+                    continue
+                if isinstance(log, dict):
+                    added += self.add_log(log, stem)
+                self._sources[stem] = mtime
+                self._dirty = True
+
+        if added:
+            logger.info(f"Index d'idées : {added} idée(s) ajoutée(s) depuis {directory}")
+        return added
+
+    def _remove_source(self, source: str) -> None:
+        entries = [entry for entry in self._entries if entry.source != source]
+        self._entries = []
+        self._buckets = [{} for _ in range(self.bands)]
+        for entry in entries:
+            self._insert(entry)
+        self._sources.pop(source, None)
+
+    def save(self) -> None:
+        """Enregistre l'index sur disque s'il a été modifié."""
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            data = {
+                "version": INDEX_VERSION,
+                "num_perm": self.hasher.num_perm,
+                "bands": self.bands,
+                "seed": self.seed,
+                "sources": self._sources,
+                "entries": [
+                    {
+                        "idee": entry.idee,
+                        "source": entry.source,
+                        "application": entry.application,
+                        "signature": entry.signature.tolist(),
+                        "scope": entry.scope,
+                    }
+                    for entry in self._entries
+                ],
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            tmp_path.replace(self.path)
+            self._dirty = False
+        logger.debug(f"Index d'idées enregistré : {self.path} ({len(self)} idées)")
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Index d'idées illisible, reconstruction ({self.path}): {e}")
+            return
+
+        params = (data.get("num_perm"), data.get("bands"), data.get("seed"))
+        if data.get("version") != INDEX_VERSION or params != (
+            self.hasher.num_perm,
+            self.bands,
+            self.seed,
+        ):
+            logger.info("Paramètres de l'index d'idées modifiés, reconstruction")
+            return
+
+        for item in data.get("entries", []):
+            signature = np.array(item["signature"], dtype=np.uint64)
+            self._insert(
+                _Entry(
+                    item["idee"],
+                    item["source"],
+                    item.get("application"),
+                    signature,
+                    item.get("scope", ""),
+                )
+            )
+        self._sources = data.get("sources", {})
+        self._dirty = False
+
+
+# Instance globale de l'index (initialisation lazy)
+_idea_index: Optional[IdeaIndex] = None
+_idea_index_lock = threading.Lock()
+
+
+def get_idea_index() -> Optional[IdeaIndex]:
+    """
+    Retourne l'index des idées, synchronisé avec les logs exportés.
+
+    Returns:
+        L'index, ou None s'il est désactivé dans la configuration
+    """
+    global _idea_index
+    index_config = config.get_idea_index_config()
+    if not index_config.get("enabled", False):
+        return None
+
+    if _idea_index is None:
+        with _idea_index_lock:
+            if _idea_index is None:
+                index = IdeaIndex(
+                    index_config["path"],
+                    num_perm=index_config["num_perm"],
+                    bands=index_config["bands"],
+                )
+                index.sync(config.logs_dir)
+                index.save()
+                _idea_index = index
+    return _idea_index
+
+
+def split_known_ideas(
+    idees: List[str],
+    index: Optional[IdeaIndex],
+    threshold: float,
+    scope: Optional[str] = None,
+) -> Tuple[List[Tuple[int, str]], Dict[int, IdeaMatch]]:
+    """
+    Sépare les idées déjà développées lors d'un run précédent des nouvelles.
+
+    Args:
+        idees: Les idées à développer
+        index: L'index des idées (None = aucune idée connue)
+        threshold: Similarité minimale pour considérer une idée comme déjà développée
+        scope: Portée du run courant (:func:`run_scope`) ; None = tous les runs
+
+    Returns:
+        Tuple (idées nouvelles avec leur numéro 1-based, {numéro: correspondance})
+    """
+    nouvelles: List[Tuple[int, str]] = []
+    connues: Dict[int, IdeaMatch] = {}
+    for idx, idee in enumerate(idees, 1):
+        match = index.find_developed(idee, threshold, scope) if index is not None else None
+        if match is None:
+            nouvelles.append((idx, idee))
+        else:
+            connues[idx] = match
+    return nouvelles, connues
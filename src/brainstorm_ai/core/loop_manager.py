@@ -3,138 +3,532 @@ import json
 import logging
 import os
 import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from ..agents.application import (
+    AgentApplication,
     prompt_critique_plan,
     prompt_defense_plan,
     prompt_plan,
     prompt_revision_plan,
 )
-from ..agents.creative import prompt_creatif, prompt_defense
+from ..agents.creative import budget_historique, prompt_creatif, prompt_defense
 from ..agents.critic import prompt_critique, prompt_replique
 from ..agents.revision import prompt_revision
-from ..agents.score import prompt_score
+from ..agents.score import AgentScore, prompt_score, prompt_score_lot
+from ..agents.summary import prompt_resume
 from ..agents.synthesis import prompt_synthese
+from .batch import BatchRequest, batch_enabled, run_batch
+from .budget import get_budget_guard
 from .config import config
+from .convergence import (
+    ARRET_BUDGET_DEPASSE,
+    ARRET_CYCLES_MAX,
+    ARRET_DELAI_DEPASSE,
+    ConvergenceMonitor,
+)
 from .exporter import export_json, export_markdown, export_yaml
-from .gpt import get_gpt_stats
+from .gpt import (
+    BudgetExceededError,
+    DeadlineExceededError,
+    GPTError,
+    add_stream_listener,
+    get_gpt_stats,
+    remove_stream_listener,
+    run_deadline_exceeded,
+    set_run_deadline,
+)
+from .history import SUMMARY_HEADER, HistoryWindow, summarize_extractive
+from .idea_index import get_idea_index, run_scope, split_known_ideas
 from .progress_tracker import ProgressTracker
+from .scheduler import Step, run_steps
+from .similarity import collapse_near_duplicates
+from .telemetry import get_telemetry_store
+from .tokenizer import count_tokens
 from .types import ApplicationLog, BrainstormLog, CycleLog
 from .utils import dedupe
 
 logger = logging.getLogger(__name__)
 
 
-def limiter_historique(historique: List[str]) -> List[str]:
-    """Réduit la taille du contexte historique en supprimant les plus anciennes entrées."""
+def limiter_historique(
+    historique: Union[List[str], HistoryWindow],
+    max_tokens: Optional[int] = None,
+) -> Union[List[str], HistoryWindow]:
+    """
+    Réduit la taille du contexte historique en supprimant les plus anciennes entrées.
+
+    Accepte une liste (modifiée sur place) ou une :class:`HistoryWindow`. Pour une
+    liste, les longueurs sont calculées une seule fois puis décrémentées, sans
+    reconstruire le texte à chaque retrait.
+
+    Args:
+        historique: L'historique à réduire
+        max_tokens: Budget de tokens de l'historique (None = limite en caractères seule),
+            compté avec le tokenizer du modèle créatif
+    """
     max_context_chars = config.max_context_chars
-    contenu = "\n".join(historique)
-    while len(contenu) > max_context_chars and historique:
-        historique.pop(0)
-        contenu = "\n".join(historique)
+
+    if isinstance(historique, HistoryWindow):
+        historique.max_chars = max_context_chars
+        historique.max_tokens = max_tokens
+        historique.trim()
+        return historique
+
+    longueur = sum(len(entree) for entree in historique) + max(len(historique) - 1, 0)
+    tokens = [0] * len(historique)
+    if max_tokens is not None:
+        model = config.get_model_for_role("creatif")
+        tokens = [count_tokens(entree, model) for entree in historique]
+    total_tokens = sum(tokens)
+
+    retraits = 0
+    while retraits < len(historique) and (
+        longueur > max_context_chars or (max_tokens is not None and total_tokens > max_tokens)
+    ):
+        longueur -= len(historique[retraits]) + (1 if retraits < len(historique) - 1 else 0)
+        total_tokens -= tokens[retraits]
+        retraits += 1
+    del historique[:retraits]
+    return historique
+
+
+def compacter_historique(
+    historique: Union[List[str], HistoryWindow],
+) -> Union[List[str], HistoryWindow]:
+    """
+    Condense les créations anciennes de l'historique en une liste d'idées compacte.
+
+    Les ``keep_recent`` dernières créations sont conservées en entier ; les
+    précédentes (y compris le résumé d'une compaction antérieure) sont
+    remplacées par un résumé unique en tête d'historique. Le résumé est
+    extractif (local) ou produit par le rôle ``resume`` selon la configuration ;
+    en cas d'échec de l'appel, le résumé extractif est utilisé.
+
+    Args:
+        historique: L'historique à compacter (liste modifiée sur place ou HistoryWindow)
+
+    Returns:
+        L'historique compacté
+    """
+    compaction = config.get_history_compaction_config()
+    if not compaction["enabled"] or len(historique) < compaction["min_entries"]:
+        return historique
+
+    max_idees = compaction["max_ideas"]
+
+    def resumer(entrees: List[str]) -> str:
+        resume_extractif = summarize_extractive(
+            entrees, max_ideas=max_idees, max_idea_chars=compaction["max_idea_chars"]
+        )
+        if compaction["strategy"] != "llm":
+            return resume_extractif
+        try:
+            # Le résumé extractif sert d'entrée : le modèle fusionne sans relire tout le texte
+            return f"{SUMMARY_HEADER}\n{prompt_resume(resume_extractif, max_idees)}"
+        except GPTError as e:
+            logger.warning(
+                f"Résumé de l'historique par le modèle impossible, repli extractif : {e}"
+            )
+            return resume_extractif
+
+    keep_recent = compaction["keep_recent"]
+    if isinstance(historique, HistoryWindow):
+        condensees = historique.compact(resumer, keep_recent)
+    else:
+        condensees = max(len(historique) - keep_recent, 0)
+        if condensees >= 2:
+            historique[:condensees] = [resumer(historique[:condensees])]
+        else:
+            condensees = 0
+
+    if condensees:
+        logger.info(f"Historique compacté : {condensees} entrées condensées en un résumé")
     return historique
 
 
+# Interruptions du run : les résultats déjà obtenus sont exportés
+INTERRUPTIONS = (BudgetExceededError, DeadlineExceededError)
+
+
+def _raison_interruption(error: Exception) -> str:
+    """Raison d'arrêt enregistrée pour une interruption du run."""
+    return ARRET_DELAI_DEPASSE if isinstance(error, DeadlineExceededError) else ARRET_BUDGET_DEPASSE
+
+
+def _etape_optionnelle(nom: str, func: Callable[..., str]) -> Callable[..., str]:
+    """
+    Enveloppe une étape dont aucune étape obligatoire ne dépend.
+
+    En mode économique (budget presque épuisé), l'étape est sautée si elle
+    figure dans ``api.budget.skip_steps`` et produit un texte vide.
+    """
+
+    def etape(*args, **kwargs) -> str:
+        if get_budget_guard().should_skip(nom):
+            logger.info(f"Étape '{nom}' sautée (mode économique)")
+            return ""
+        return func(*args, **kwargs)
+
+    return etape
+
+
 def traiter_cycle(
     objectif: str,
     contexte: str,
     contraintes: str,
-    historique: List[str],
+    historique: Union[List[str], HistoryWindow],
     cycle_num: int,
     progress_tracker: Optional[ProgressTracker] = None,
 ) -> CycleLog:
-    """Traite un cycle complet de brainstorming."""
-    historique = limiter_historique(historique)
+    """
+    Traite un cycle complet de brainstorming.
 
-    # Étape 1: Créatif
-    if progress_tracker:
-        progress_tracker.start_cycle_step(0)
-    creation = prompt_creatif(objectif, contexte, contraintes, "\n".join(historique))
-    if progress_tracker:
-        progress_tracker.complete_cycle_step(0)
+    Les étapes sont déclarées avec leurs dépendances et exécutées par
+    l'ordonnanceur : défense et révision ne dépendent que de la critique,
+    réplique et score ne dépendent respectivement que de la défense et de la
+    révision, elles peuvent donc s'exécuter en parallèle.
 
-    historique.append(creation)
+    Le score n'est calculé ici qu'avec ``advanced.scoring.mode: inline`` : en
+    tâche de fond, les révisions de plusieurs cycles sont évaluées ensemble
+    par :func:`run_brainstorm_loop` ; en mode lot (``api.batch``), les révisions de tous les
+    cycles sont évaluées ensemble par :func:`scorer_cycles_par_lot`.
+    """
+    # Les créations anciennes sont condensées, puis l'historique occupe au plus
+    # les tokens laissés libres par le reste du prompt
+    historique = compacter_historique(historique)
+    historique = limiter_historique(
+        historique, max_tokens=budget_historique(objectif, contexte, contraintes)
+    )
+    if isinstance(historique, HistoryWindow):
+        contexte_historique = historique.joined
+    else:
+        contexte_historique = "\n".join(historique)
+
+    def creer() -> str:
+        creation = prompt_creatif(objectif, contexte, contraintes, contexte_historique)
+        # Ajoutée dès sa génération : conservée même si une étape suivante échoue
+        historique.append(creation)
+        return creation
+
+    steps = [
+        Step("creation", creer, index=0),
+        Step("critique", lambda creation: prompt_critique(creation), ("creation",), index=1),
+        Step(
+            "defense",
+            _etape_optionnelle(
+                "defense", lambda creation, critique: prompt_defense(creation, critique)
+            ),
+            ("creation", "critique"),
+            index=2,
+        ),
+        Step(
+            "replique",
+            _etape_optionnelle(
+                "replique",
+                lambda creation, defense: prompt_replique(defense, creation) if defense else "",
+            ),
+            ("creation", "defense"),
+            index=3,
+        ),
+        Step(
+            "revision",
+            lambda creation, critique: prompt_revision(creation, critique),
+            ("creation", "critique"),
+            index=4,
+        ),
+    ]
+    if _mode_score() == "inline":
+        steps.append(
+            Step(
+                "score",
+                lambda revision: validate_score(prompt_score(revision)),
+                ("revision",),
+                index=5,
+            )
+        )
 
-    # Étape 2: Critique
-    if progress_tracker:
-        progress_tracker.start_cycle_step(1)
-    critique = prompt_critique(creation)
-    if progress_tracker:
-        progress_tracker.complete_cycle_step(1)
+    results = run_steps(
+        steps,
+        on_start=(lambda step: progress_tracker.start_cycle_step(step.index))
+        if progress_tracker
+        else None,
+        on_complete=(lambda step: progress_tracker.complete_cycle_step(step.index))
+        if progress_tracker
+        else None,
+        parallel=config.parallel_steps,
+    )
 
-    # Étape 3: Défense
-    if progress_tracker:
-        progress_tracker.start_cycle_step(2)
-    defense = prompt_defense(creation, critique)
-    if progress_tracker:
-        progress_tracker.complete_cycle_step(2)
+    return {
+        "cycle": cycle_num,
+        "creation": results["creation"],
+        "critique": results["critique"],
+        "defense": results["defense"],
+        "replique": results["replique"],
+        "revision": results["revision"],
+        "score": results.get("score", {}),
+    }
 
-    # Étape 4: Réplique
-    if progress_tracker:
-        progress_tracker.start_cycle_step(3)
-    replique = prompt_replique(defense, creation)
-    if progress_tracker:
-        progress_tracker.complete_cycle_step(3)
 
-    # Étape 5: Révision
-    if progress_tracker:
-        progress_tracker.start_cycle_step(4)
-    revision = prompt_revision(creation, critique)
-    if progress_tracker:
-        progress_tracker.complete_cycle_step(4)
+def _mode_score() -> str:
+    """Mode de calcul des scores des cycles : ``inline``, ``background`` ou ``batch``."""
+    return "batch" if batch_enabled() else config.get_scoring_config()["mode"]
 
-    # Étape 6: Score
-    if progress_tracker:
-        progress_tracker.start_cycle_step(5)
-    score_json = prompt_score(revision)
-    score = validate_score(score_json)
-    if progress_tracker:
-        progress_tracker.complete_cycle_step(5)
 
-    return {
-        "cycle": cycle_num,
-        "creation": creation,
-        "critique": critique,
-        "defense": defense,
-        "replique": replique,
-        "revision": revision,
-        "score": score,
-    }
+def _scorer_revisions(
+    revisions: List[str], progress_tracker: Optional[ProgressTracker] = None
+) -> List[dict]:
+    """
+    Évalue des révisions par appels groupés (tâche de fond du mode ``background``).
 
+    Chaque appel évalue jusqu'à ``advanced.scoring.batch_size`` révisions
+    (``AgentScore.evaluer_lot``).
 
-def run_brainstorm_loop(objectif, contexte, contraintes, cycles=3):
-    historique = []
-    logs = []
+    Returns:
+        Un score par révision, dans leur ordre
+    """
+    taille = max(1, config.get_scoring_config()["batch_size"])
+    scores: List[dict] = []
+    for debut in range(0, len(revisions), taille):
+        groupe = revisions[debut : debut + taille]
+        if progress_tracker:
+            for _ in groupe:
+                progress_tracker.start_cycle_step(5)
+        scores.extend(validate_scores_batch(prompt_score_lot(groupe), len(groupe)))
+        if progress_tracker:
+            for _ in groupe:
+                progress_tracker.complete_cycle_step(5)
+    return scores
+
+
+def _recuperer_scores(
+    scores_en_cours: Dict[Tuple[int, ...], Future],
+    logs: List[CycleLog],
+    convergence: ConvergenceMonitor,
+    attendre: bool = False,
+) -> Optional[Exception]:
+    """
+    Reporte dans les logs les scores calculés en tâche de fond.
+
+    Args:
+        scores_en_cours: Tâches de score par groupe de numéros de cycle (les
+            tâches récupérées en sont retirées)
+        logs: Les logs des cycles, complétés en place avec leur score
+        convergence: Moniteur de convergence, informé des scores reçus
+        attendre: Si True, attend la fin de toutes les tâches (avant la synthèse) ;
+            sinon seules les tâches déjà terminées sont récupérées
+
+    Returns:
+        L'interruption (budget ou échéance) levée par une tâche, le cas échéant
+    """
+    interruption = None
+    for cycles, tache in list(scores_en_cours.items()):
+        if not (attendre or tache.done()):
+            continue
+        del scores_en_cours[cycles]
+        try:
+            scores = tache.result()
+        except INTERRUPTIONS as e:
+            # Les cycles gardent le score de repli
+            logger.error(f"Scores des cycles {list(cycles)} interrompus : {e}")
+            interruption = e
+            scores = [validate_score("") for _ in cycles]
+        for cycle, score in zip(cycles, scores):
+            logs[cycle - 1]["score"] = score
+            convergence.record_score(cycle, score)
+    return interruption
+
+
+def scorer_cycles_par_lot(
+    logs: List[CycleLog], progress_tracker: Optional[ProgressTracker] = None
+) -> None:
+    """
+    Évalue les révisions de tous les cycles en un seul lot (mode ``api.batch``).
+
+    Chaque requête du lot évalue jusqu'à ``advanced.scoring.batch_size``
+    révisions à la fois (``AgentScore.evaluer_lot``) : un run de quelques
+    cycles ne coûte qu'un appel de score.
+
+    Args:
+        logs: Les logs des cycles, complétés en place avec leur score
+        progress_tracker: Tracker de progression optionnel
+    """
+    agent = AgentScore()
+    taille = max(1, config.get_scoring_config()["batch_size"])
+    groupes = [logs[i : i + taille] for i in range(0, len(logs), taille)]
+    requests = [
+        BatchRequest(
+            f"score-{n}",
+            agent.render_lot([log["revision"] for log in groupe]),
+            agent.role,
+            "score",
+        )
+        for n, groupe in enumerate(groupes, 1)
+    ]
+    if progress_tracker:
+        for _ in logs:
+            progress_tracker.start_cycle_step(5)
+    reponses = run_batch(requests)
+    for n, groupe in enumerate(groupes, 1):
+        for log, score in zip(groupe, validate_scores_batch(reponses[f"score-{n}"], len(groupe))):
+            log["score"] = score
+            if progress_tracker:
+                progress_tracker.complete_cycle_step(5)
 
+
+def run_brainstorm_loop(objectif, contexte, contraintes, cycles=3):
     # Initialiser le tracker de progression
     progress_tracker = ProgressTracker(cycles, config.top_ideas_count)
     progress_tracker.start_brainstorm()
 
-    # Cycles de brainstorming
-    for i in range(1, cycles + 1):
-        progress_tracker.start_cycle(i)
-        log = traiter_cycle(objectif, contexte, contraintes, historique, i, progress_tracker)
-        logs.append(log)
+    # Le listener est enregistré dans core.gpt pour tout le processus : il est
+    # retiré même si le run échoue, sans quoi le run suivant l'afficherait en double
+    add_stream_listener(progress_tracker)
+    try:
+        # L'échéance est globale elle aussi : un run en échec ne doit pas la
+        # laisser en place pour le suivant
+        set_run_deadline(config.run_timeout)
+        try:
+            _executer_brainstorm(objectif, contexte, contraintes, cycles, progress_tracker)
+        finally:
+            set_run_deadline(None)
+    finally:
+        remove_stream_listener(progress_tracker)
+
+    # Terminer le suivi de progression
+    progress_tracker.finish()
+
+
+def _executer_brainstorm(
+    objectif: str,
+    contexte: str,
+    contraintes: str,
+    cycles: int,
+    progress_tracker: ProgressTracker,
+) -> None:
+    """Cycles, synthèse, traitement des idées et statistiques d'un run."""
+    historique = HistoryWindow(
+        config.max_context_chars,
+        token_counter=partial(count_tokens, model=config.get_model_for_role("creatif")),
+    )
+    logs = []
 
-        logger.info(f"=== Cycle {i} ===")
-        logger.info(f"{config.get_emoji('creatif')} [Créatif]\n{log['creation']}")
-        logger.info(f"{config.get_emoji('critique')} [Critique]\n{log['critique']}")
-        logger.info(f"{config.get_emoji('defense')} [Défense]\n{log['defense']}")
-        logger.info(f"{config.get_emoji('replique')} [Réplique]\n{log['replique']}")
-        logger.info(f"{config.get_emoji('revision')} [Révision]\n{log['revision']}")
+    # Cycles de brainstorming, interrompus dès que le brainstorm a convergé
+    convergence = ConvergenceMonitor.from_config()
+    convergence.start(get_gpt_stats())
+    raison_arret = ARRET_CYCLES_MAX
+
+    # Scores en tâche de fond : le cycle suivant démarre dès la révision
+    # disponible. Les révisions en attente sont évaluées ensemble (un appel
+    # groupé par batch_size révisions) : avant la synthèse, ou dès qu'aucun
+    # groupe n'est en cours si l'arrêt sur plateau a besoin des scores
+    scoreur = None
+    if _mode_score() == "background":
+        scoreur = ThreadPoolExecutor(max_workers=1, thread_name_prefix="score")
+    scores_en_cours: Dict[Tuple[int, ...], Future] = {}
+    a_scorer: List[int] = []
+
+    def soumettre_scores() -> None:
+        cycles_groupe = tuple(a_scorer)
+        a_scorer.clear()
+        scores_en_cours[cycles_groupe] = scoreur.submit(
+            _scorer_revisions, [logs[c - 1]["revision"] for c in cycles_groupe], progress_tracker
+        )
+
+    try:
+        for i in range(1, cycles + 1):
+            progress_tracker.start_cycle(i)
+            try:
+                log = traiter_cycle(
+                    objectif, contexte, contraintes, historique, i, progress_tracker
+                )
+            except INTERRUPTIONS as e:
+                # Le cycle interrompu est perdu, les précédents seront exportés
+                logger.error(f"Cycle {i} interrompu : {e}")
+                raison_arret = _raison_interruption(e)
+                progress_tracker.stop_cycles_early(i - 1, raison_arret)
+                break
+            logs.append(log)
+            if scoreur:
+                a_scorer.append(i)
+
+            logger.info(f"=== Cycle {i} ===")
+            logger.info(f"{config.get_emoji('creatif')} [Créatif]\n{log['creation']}")
+            logger.info(f"{config.get_emoji('critique')} [Critique]\n{log['critique']}")
+            logger.info(f"{config.get_emoji('defense')} [Défense]\n{log['defense']}")
+            logger.info(f"{config.get_emoji('replique')} [Réplique]\n{log['replique']}")
+            logger.info(f"{config.get_emoji('revision')} [Révision]\n{log['revision']}")
+
+            raison = convergence.observe(log, get_gpt_stats())
+
+            if scoreur and not scores_en_cours and convergence.needs_scores(i):
+                soumettre_scores()
+            # Scores déjà reçus, sans attendre ceux en cours
+            interruption = _recuperer_scores(scores_en_cours, logs, convergence)
+            if interruption is not None:
+                raison_arret = _raison_interruption(interruption)
+                progress_tracker.stop_cycles_early(i, raison_arret)
+                break
+            # Les scores reçus peuvent révéler un plateau que observe n'a pas vu
+            raison = raison or convergence.check_plateau()
+
+            if raison is not None:
+                if i < cycles:
+                    raison_arret = raison
+                    progress_tracker.stop_cycles_early(i, raison)
+                break
+
+        if scoreur:
+            interruption = _recuperer_scores(scores_en_cours, logs, convergence, attendre=True)
+            if interruption is not None:
+                raison_arret = _raison_interruption(interruption)
+            if a_scorer and raison_arret not in (ARRET_BUDGET_DEPASSE, ARRET_DELAI_DEPASSE):
+                soumettre_scores()
+                interruption = _recuperer_scores(scores_en_cours, logs, convergence, attendre=True)
+                if interruption is not None:
+                    raison_arret = _raison_interruption(interruption)
+            # Les cycles restés sans score (run interrompu) reçoivent le score de repli
+            for log in logs:
+                log["score"] = log["score"] or validate_score("")
+    finally:
+        if scoreur:
+            # Après une erreur, les scores encore en attente sont abandonnés
+            for tache in scores_en_cours.values():
+                tache.cancel()
+            scoreur.shutdown(wait=False)
+
+    if _mode_score() == "batch" and logs:
+        try:
+            scorer_cycles_par_lot(logs, progress_tracker)
+        except INTERRUPTIONS as e:
+            # Les cycles sans score reçoivent le score de repli
+            logger.error(f"Scores des cycles interrompus : {e}")
+            raison_arret = _raison_interruption(e)
+            for log in logs:
+                log["score"] = log["score"] or validate_score("")
 
     # Synthèse
     progress_tracker.start_synthesis()
     revisions_uniques = dedupe([log["revision"] for log in logs])
-    synthese = prompt_synthese(revisions_uniques, config.top_ideas_count)
+    if config.detect_redundancy:
+        # Une même idée révisée à plusieurs cycles n'est envoyée qu'une fois à la synthèse
+        revisions_uniques = collapse_near_duplicates(revisions_uniques, config.similarity_threshold)
+    synthese = ""
+    if raison_arret not in (ARRET_BUDGET_DEPASSE, ARRET_DELAI_DEPASSE):
+        try:
+            synthese = prompt_synthese(revisions_uniques, config.top_ideas_count)
+        except INTERRUPTIONS as e:
+            logger.error(f"Synthèse interrompue : {e}")
+            raison_arret = _raison_interruption(e)
     progress_tracker.complete_synthesis()
 
     logger.info(f"{config.get_emoji('synthese')} [Synthèse Finale]\n" + synthese)
 
     # Traitement des idées et sauvegarde avec progression
-    save_full_log(objectif, contexte, contraintes, logs, synthese, progress_tracker)
+    save_full_log(objectif, contexte, contraintes, logs, synthese, progress_tracker, raison_arret)
 
     if config.show_token_usage:
         stats = get_gpt_stats()
@@ -144,76 +538,271 @@ def run_brainstorm_loop(objectif, contexte, contraintes, cycles=3):
             f"📝 Tokens utilisés : {stats['total_tokens']} (entrée: {stats['prompt_tokens']}, sortie: {stats['completion_tokens']})"
         )
         logger.info(f"💰 Coût total : ${stats['total_cost']:.4f}")
+        if stats["cache_hits"] or stats["cache_misses"]:
+            logger.info(
+                f"🗄️ Cache : {stats['cache_hits']} hits / {stats['cache_misses']} misses "
+                f"(taux: {stats['cache_hit_rate']:.0%})"
+            )
+        if stats["hedged_calls"]:
+            logger.info(
+                f"🏁 Secours : {stats['hedged_calls']} lancés, {stats['hedge_wins']} gagnants, "
+                f"${stats['hedge_cost']:.4f} de réponses ignorées"
+            )
+        pool = stats["http_pool"]
+        if pool.get("requests"):
+            logger.info(
+                f"🔌 Connexions HTTP : {pool['connections_opened']} ouvertes pour "
+                f"{pool['requests']} requêtes (réutilisation: {pool['connection_reuse_rate']:.0%}), "
+                f"pic {pool['peak_in_flight']}/{pool['max_connections']}, "
+                f"{pool['saturated_requests']} requêtes en attente de connexion"
+            )
+        for route, route_stats in sorted(stats["routes"].items()):
+            logger.info(
+                f"🔀 {route} : {route_stats['calls']} appels, ${route_stats['cost']:.4f}, "
+                f"{route_stats['avg_latency']:.2f}s en moyenne, "
+                f"{route_stats['errors']} erreurs, {route_stats['fallbacks']} bascules"
+            )
+
+
+def _process_idea(
+    idx: int, idee: str, progress_tracker: Optional[ProgressTracker] = None
+) -> ApplicationLog:
+    """
+    Développe une idée : plan → critique du plan → défense ∥ révision du plan.
 
-    # Terminer le suivi de progression
-    progress_tracker.finish()
+    Args:
+        idx: Numéro de l'idée (1-based)
+        idee: L'idée à traiter
+        progress_tracker: Tracker de progression optionnel
+
+    Returns:
+        Le log d'application de l'idée
+    """
+    if progress_tracker:
+        progress_tracker.start_idea(idx, idee)
+
+    logger.info(f"Traitement de l'idée {idx}: {idee[:50]}...")
+    logger.info(f"{config.get_emoji('application')} Traitement de l'idée sélectionnée :\n{idee}")
+
+    steps = [
+        Step("plan", lambda: prompt_plan(idee), index=0),
+        Step("critique", lambda plan: prompt_critique_plan(plan), ("plan",), index=1),
+        Step(
+            "defense",
+            _etape_optionnelle(
+                "defense_plan", lambda plan, critique: prompt_defense_plan(plan, critique)
+            ),
+            ("plan", "critique"),
+            index=2,
+        ),
+        Step(
+            "revision",
+            lambda plan, critique: prompt_revision_plan(plan, critique),
+            ("plan", "critique"),
+            index=3,
+        ),
+    ]
+
+    results = run_steps(
+        steps,
+        on_start=(lambda step: progress_tracker.start_idea_step(step.index))
+        if progress_tracker
+        else None,
+        on_complete=(lambda step: progress_tracker.complete_idea_step(step.index))
+        if progress_tracker
+        else None,
+        parallel=config.parallel_steps,
+    )
+
+    logger.info(f"{config.get_emoji('success')} Plan final révisé :\n{results['revision']}")
 
+    return {
+        "idee": idee,
+        "plan_initial": results["plan"],
+        "critique": results["critique"],
+        "defense": results["defense"],
+        "revision": results["revision"],
+    }
 
-def process_ideas(
-    idees: List[str], progress_tracker: Optional[ProgressTracker] = None
-) -> List[ApplicationLog]:
+
+def _process_ideas_par_lot(
+    idees: List[Tuple[int, str]], progress_tracker: Optional[ProgressTracker] = None
+) -> Dict[int, ApplicationLog]:
     """
-    Traite chaque idée sélectionnée pour créer des plans détaillés.
+    Traite les idées phase par phase, chaque phase étant soumise en un lot.
+
+    Les plans de toutes les idées forment un premier lot, leurs critiques un
+    deuxième, puis défenses et révisions (qui ne dépendent que du plan et de
+    sa critique) un troisième.
 
     Args:
-        idees: Liste des idées à traiter
+        idees: Les idées à traiter, avec leur numéro
         progress_tracker: Tracker de progression optionnel
 
     Returns:
-        Liste des logs d'application
+        Les logs d'application, par numéro d'idée
     """
-    application_logs = []
-
-    for idx, idee in enumerate(idees, 1):
+    agent = AgentApplication()
+
+    def lot(phases: Dict[str, Tuple[int, Dict[int, str]]]) -> Dict[str, Dict[int, str]]:
+        """Soumet les prompts de chaque étape et de chaque idée en un lot."""
+        requests = [
+            BatchRequest(f"{step}-{idx}", prompt, agent.role, step)
+            for step, (_, prompts) in phases.items()
+            for idx, prompt in prompts.items()
+        ]
+        if progress_tracker:
+            for index, prompts in phases.values():
+                for _ in prompts:
+                    progress_tracker.start_idea_step(index)
+        reponses = run_batch(requests)
+        if progress_tracker:
+            for index, prompts in phases.values():
+                for _ in prompts:
+                    progress_tracker.complete_idea_step(index)
+        return {
+            step: {idx: reponses[f"{step}-{idx}"] for idx in prompts}
+            for step, (_, prompts) in phases.items()
+        }
+
+    for idx, idee in idees:
         if progress_tracker:
             progress_tracker.start_idea(idx, idee)
-
-        logger.info(f"Traitement de l'idée {idx}: {idee[:50]}...")
-        logger.info(
-            f"{config.get_emoji('application')} Traitement de l'idée sélectionnée :\n{idee}"
+    logger.info(f"Traitement de {len(idees)} idées par lots")
+
+    plans = lot({"plan": (0, {idx: agent.render("plan", idee=idee) for idx, idee in idees})})[
+        "plan"
+    ]
+    critiques = lot(
+        {
+            "critique_plan": (
+                1,
+                {idx: agent.render("critique_plan", plan=plans[idx]) for idx, _ in idees},
+            )
+        }
+    )["critique_plan"]
+
+    phases = {
+        "revision_plan": (
+            3,
+            {
+                idx: agent.render("revision_plan", plan=plans[idx], critique=critiques[idx])
+                for idx, _ in idees
+            },
         )
+    }
+    if get_budget_guard().should_skip("defense_plan"):
+        logger.info("Étape 'defense_plan' sautée (mode économique)")
+    else:
+        phases["defense_plan"] = (
+            2,
+            {
+                idx: agent.render("defense_plan", plan=plans[idx], critique=critiques[idx])
+                for idx, _ in idees
+            },
+        )
+    reponses = lot(phases)
+    defenses = reponses.get("defense_plan", {})
+
+    resultats: Dict[int, ApplicationLog] = {}
+    for idx, idee in idees:
+        revision = reponses["revision_plan"][idx]
+        logger.info(f"{config.get_emoji('success')} Plan final révisé (idée {idx}) :\n{revision}")
+        resultats[idx] = {
+            "idee": idee,
+            "plan_initial": plans[idx],
+            "critique": critiques[idx],
+            "defense": defenses.get(idx, ""),
+            "revision": revision,
+        }
+    return resultats
 
-        # Étape 1: Plan
-        if progress_tracker:
-            progress_tracker.start_idea_step(0)
-        plan = prompt_plan(idee)
-        if progress_tracker:
-            progress_tracker.complete_idea_step(0)
 
-        # Étape 2: Critique du plan
-        if progress_tracker:
-            progress_tracker.start_idea_step(1)
-        critique_plan = prompt_critique_plan(plan)
-        if progress_tracker:
-            progress_tracker.complete_idea_step(1)
+def process_ideas(
+    idees: List[str],
+    progress_tracker: Optional[ProgressTracker] = None,
+    scope: Optional[str] = None,
+) -> List[ApplicationLog]:
+    """
+    Traite chaque idée sélectionnée pour créer des plans détaillés.
 
-        # Étape 3: Défense du plan
-        if progress_tracker:
-            progress_tracker.start_idea_step(2)
-        defense_plan = prompt_defense_plan(plan, critique_plan)
-        if progress_tracker:
-            progress_tracker.complete_idea_step(2)
+    Les idées déjà développées lors d'un run précédent de même portée (index
+    d'idées) sont signalées, réutilisées ou écartées sans appel API selon
+    ``advanced.idea_index.mode``.
+    Les autres étant indépendantes, elles sont traitées en parallèle par au
+    plus ``general.idea_workers`` workers, ou phase par phase en lots si
+    ``api.batch`` est activé. L'ordre des logs retournés correspond toujours à
+    l'ordre des idées en entrée.
 
-        # Étape 4: Révision du plan
-        if progress_tracker:
-            progress_tracker.start_idea_step(3)
-        plan_revise = prompt_revision_plan(plan, critique_plan)
-        if progress_tracker:
-            progress_tracker.complete_idea_step(3)
+    Args:
+        idees: Liste des idées à traiter
+        progress_tracker: Tracker de progression optionnel
+        scope: Portée du run (:func:`~.idea_index.run_scope`) ; seuls les plans
+            d'un run de même portée sont retrouvés (None = tous les runs)
 
-        application_logs.append(
-            {
+    Returns:
+        Liste des logs d'application
+    """
+    index_config = config.get_idea_index_config()
+    nouvelles, connues = split_known_ideas(
+        idees, get_idea_index(), index_config["threshold"], scope
+    )
+
+    resultats: Dict[int, ApplicationLog] = {}
+
+    def traiter(idx: int, idee: str) -> None:
+        try:
+            resultats[idx] = _process_idea(idx, idee, progress_tracker)
+        except INTERRUPTIONS as e:
+            # L'idée est écartée, les idées déjà développées restent exportées
+            logger.error(f"Idée {idx} non développée : {e}")
+        except GPTError as e:
+            # L'échec d'une idée n'empêche pas le retour des autres
+            logger.error(f"Échec du développement de l'idée {idx} : {e}")
+            resultats[idx] = {
                 "idee": idee,
-                "plan_initial": plan,
-                "critique": critique_plan,
-                "defense": defense_plan,
-                "revision": plan_revise,
+                "plan_initial": "",
+                "critique": "",
+                "defense": "",
+                "revision": "",
+                "erreur": str(e),
             }
-        )
 
-        logger.info(f"{config.get_emoji('success')} Plan final révisé :\n{plan_revise}")
+    for idx, match in connues.items():
+        idee = idees[idx - 1]
+        logger.info(
+            f"Idée {idx} déjà développée ({match.source}, similarité {match.similarity:.2f})"
+        )
+        if index_config["mode"] == "annotate":
+            # Signalée seulement : l'idée est développée comme une nouvelle
+            nouvelles.append((idx, idee))
+            continue
+        if index_config["mode"] == "skip":
+            if progress_tracker:
+                progress_tracker.skip_idea(idx, idee, f"déjà développée ({match.source})")
+            continue
+        if progress_tracker:
+            progress_tracker.skip_idea(idx, idee, f"plan réutilisé ({match.source})")
+        resultats[idx] = {**match.application, "idee": idee}
 
-    return application_logs
+    nouvelles.sort()
+    workers = min(config.idea_workers, len(nouvelles))
+    if batch_enabled() and nouvelles:
+        try:
+            resultats.update(_process_ideas_par_lot(nouvelles, progress_tracker))
+        except INTERRUPTIONS as e:
+            logger.error(f"Idées non développées : {e}")
+    elif workers <= 1:
+        for idx, idee in nouvelles:
+            traiter(idx, idee)
+    else:
+        logger.info(f"Traitement de {len(nouvelles)} idées avec {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="idea") as executor:
+            futures = [executor.submit(traiter, idx, idee) for idx, idee in nouvelles]
+            for future in futures:
+                future.result()
+
+    return [resultats[idx] for idx in sorted(resultats)]
 
 
 def save_full_log(
@@ -223,6 +812,7 @@ def save_full_log(
     logs: List[CycleLog],
     synthese: str,
     progress_tracker: Optional[ProgressTracker] = None,
+    raison_arret: str = ARRET_CYCLES_MAX,
 ) -> None:
     """
     Sauvegarde les résultats complets du brainstorming.
@@ -234,12 +824,15 @@ def save_full_log(
         logs: Les logs de tous les cycles
         synthese: La synthèse finale
         progress_tracker: Tracker de progression optionnel
+        raison_arret: Raison de la fin de la phase de cycles
     """
     log_data: BrainstormLog = {
         "objectif": objectif,
         "contexte": contexte,
         "contraintes": contraintes,
         "date": datetime.datetime.now().isoformat(),
+        "cycles_executes": len(logs),
+        "raison_arret": raison_arret,
         "logs": logs,
         "synthese_finale": synthese,
         "application": [],
@@ -257,13 +850,17 @@ def save_full_log(
         progress_tracker.start_idea_processing(len(lignes))
 
     # Traiter chaque idée
-    application_logs = process_ideas(lignes, progress_tracker)
+    application_logs = process_ideas(
+        lignes, progress_tracker, run_scope(objectif, contexte, contraintes)
+    )
 
     # Export des idées dans des fichiers séparés si activé
     if config.get("export.save_individual_ideas", True):
         try:
             os.makedirs(config.exports_dir, exist_ok=True)
             for idx, app_log in enumerate(application_logs, 1):
+                if app_log.get("erreur"):
+                    continue
                 idee = app_log["idee"]
                 safe_title = re.sub(r"[^a-zA-Z0-9_\-]", "_", idee[:40]).strip("_")
                 # Utiliser le format configuré ou format par défaut
@@ -352,6 +949,12 @@ Ce projet a été développé et affiné par un système de brainstorming multi-
             logger.error(f"Erreur lors de la création du dossier {config.exports_dir}: {e}")
 
     log_data["application"] = application_logs
+    if get_budget_guard().exceeded:
+        log_data["raison_arret"] = ARRET_BUDGET_DEPASSE
+        logger.warning("Budget dépassé : export partiel des résultats")
+    elif run_deadline_exceeded():
+        log_data["raison_arret"] = ARRET_DELAI_DEPASSE
+        logger.warning("Échéance du run dépassée : export partiel des résultats")
 
     # Démarrer l'export
     if progress_tracker:
@@ -389,36 +992,111 @@ Ce projet a été développé et affiné par un système de brainstorming multi-
     except OSError as e:
         logger.error(f"Erreur lors de la création du dossier de logs {config.logs_dir}: {e}")
 
+    # Les idées de ce run deviennent réutilisables par les runs suivants
+    index = get_idea_index()
+    if index is not None:
+        try:
+            index.sync(config.logs_dir)
+            index.save()
+        except OSError as e:
+            logger.error(f"Erreur lors de la mise à jour de l'index d'idées: {e}")
+
+    # Les mesures de ce run affinent l'estimation des runs suivants
+    telemetry = get_telemetry_store()
+    if telemetry is not None:
+        try:
+            telemetry.save()
+        except OSError as e:
+            logger.error(f"Erreur lors de l'enregistrement de la télémétrie: {e}")
+
     # Terminer l'export
     if progress_tracker:
         progress_tracker.complete_export()
 
 
-def validate_score(score_json: str) -> dict:
-    """Validation et nettoyage des scores avec fallback intelligent."""
+def _normaliser_score(score: Any) -> Optional[dict]:
+    """Borne les notes d'un objet de scores ; None s'il est invalide."""
     score_config = config.get_score_validation_config()
     min_val = score_config["min_value"]
     max_val = score_config["max_value"]
     required_keys = score_config["required_keys"]
-    fallback_val = score_config["fallback_value"]
 
+    # Validation des clés requises
+    if not isinstance(score, dict) or not all(key in score for key in required_keys):
+        return None
+    score = {key: value for key, value in score.items() if key != "id"}
     try:
-        score = json.loads(score_json)
-        # Validation des clés requises
-        if all(key in score for key in required_keys):
-            # Validation des valeurs
-            for key in required_keys:
-                score[key] = max(min_val, min(max_val, int(score[key])))
-            score["total"] = sum(score[key] for key in required_keys)
-            return score
-    except (json.JSONDecodeError, ValueError, KeyError):
-        pass
-    # Fallback avec score configuré
+        # Validation des valeurs
+        for key in required_keys:
+            score[key] = max(min_val, min(max_val, int(score[key])))
+    except (TypeError, ValueError):
+        return None
+    score["total"] = sum(score[key] for key in required_keys)
+    return score
+
+
+def _score_de_repli() -> dict:
+    """Score attribué quand l'évaluation est inexploitable."""
+    score_config = config.get_score_validation_config()
+    required_keys = score_config["required_keys"]
+    fallback_val = score_config["fallback_value"]
     fallback_score = dict.fromkeys(required_keys, fallback_val)
     fallback_score["total"] = fallback_val * len(required_keys)
     return fallback_score
 
 
+def validate_score(score_json: str) -> dict:
+    """Validation et nettoyage des scores avec fallback intelligent."""
+    try:
+        score = _normaliser_score(json.loads(score_json))
+    except json.JSONDecodeError:
+        score = None
+    # Fallback avec score configuré
+    return score if score is not None else _score_de_repli()
+
+
+def validate_scores_batch(scores_json: str, count: int) -> List[dict]:
+    """
+    Valide la réponse d'une évaluation groupée (``AgentScore.evaluer_lot``).
+
+    Le tableau JSON est extrait de la réponse (texte éventuel autour ignoré) ;
+    chaque entrée est associée à sa proposition par son ``id`` (à défaut par
+    sa position) et validée indépendamment : une entrée absente ou invalide
+    reçoit le score de repli sans invalider les autres.
+
+    Args:
+        scores_json: La réponse de l'évaluation groupée
+        count: Nombre de propositions évaluées
+
+    Returns:
+        Un score par proposition, dans leur ordre
+    """
+    try:
+        entries = json.loads(scores_json[scores_json.index("[") : scores_json.rindex("]") + 1])
+    except ValueError:
+        entries = []
+    if not isinstance(entries, list):
+        entries = []
+
+    by_id: Dict[int, Any] = {}
+    for position, entry in enumerate(entries, 1):
+        ident = entry.get("id", position) if isinstance(entry, dict) else position
+        try:
+            ident = int(ident)
+        except (TypeError, ValueError):
+            ident = position
+        by_id.setdefault(ident, entry)
+
+    scores = []
+    for i in range(1, count + 1):
+        score = _normaliser_score(by_id.get(i))
+        if score is None:
+            logger.warning(f"Score de la proposition {i} invalide dans l'évaluation groupée")
+            score = _score_de_repli()
+        scores.append(score)
+    return scores
+
+
 def extract_top_ideas_robust(synthese_text: str, count: int = 3) -> list[str]:
     """Extraction robuste des meilleures idées avec plusieurs stratégies."""
     strategies = config.get_idea_extraction_strategies()
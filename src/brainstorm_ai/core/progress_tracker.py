@@ -5,6 +5,8 @@ Affiche la progression en temps réel et gère les statistiques.
 
 import logging
 import sys
+import threading
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -33,6 +35,12 @@ class ProgressTracker:
 
         self.completed_steps = 0
         self.current_stage = ""
+        self.active_steps: List[str] = []  # Étapes en cours (peuvent se chevaucher)
+        self._lock = threading.RLock()
+
+        # Flux de réponses en cours (streaming) : débit et temps jusqu'au premier token
+        self.active_streams: Dict[int, Dict[str, Any]] = {}
+        self._last_stream_refresh = 0.0
         self.start_time = datetime.now()
         self.session_costs: List[Dict[str, Any]] = []
 
@@ -58,9 +66,24 @@ class ProgressTracker:
 
     def update_stage(self, stage: str):
         """Met à jour l'étape actuelle."""
-        self.current_stage = stage
-        self.completed_steps += 1
-        self._display_progress()
+        with self._lock:
+            self.current_stage = stage
+            self.completed_steps += 1
+            self._display_progress()
+
+    def _start_step(self, label: str):
+        """Ajoute une étape aux étapes actives et met à jour l'affichage."""
+        with self._lock:
+            self.active_steps.append(label)
+            self.update_stage(" ∥ ".join(self.active_steps))
+
+    def _complete_step(self, label: str):
+        """Retire une étape des étapes actives."""
+        with self._lock:
+            if label in self.active_steps:
+                self.active_steps.remove(label)
+            if self.active_steps:
+                self.current_stage = " ∥ ".join(self.active_steps)
 
     def add_cost(self, model: str, input_tokens: int, output_tokens: int, cost: float):
         """
@@ -72,25 +95,26 @@ class ProgressTracker:
             output_tokens: Nombre de tokens de sortie
             cost: Coût en dollars
         """
-        self.session_costs.append(
-            {
-                "model": model,
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "cost": cost,
-                "timestamp": datetime.now(),
-            }
-        )
+        with self._lock:
+            self.session_costs.append(
+                {
+                    "model": model,
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "cost": cost,
+                    "timestamp": datetime.now(),
+                }
+            )
 
-        self.total_input_tokens += input_tokens
-        self.total_output_tokens += output_tokens
-        self.total_cost += cost
+            self.total_input_tokens += input_tokens
+            self.total_output_tokens += output_tokens
+            self.total_cost += cost
 
         logger.debug(f"Coût ajouté: {model} - ${cost:.4f} ({input_tokens}+{output_tokens} tokens)")
 
     def _display_progress(self):
         """Affiche la barre de progression."""
-        progress = self.completed_steps / self.total_steps
+        progress = min(1.0, self.completed_steps / self.total_steps)
         bar_length = 50
         filled = int(bar_length * progress)
         bar = "█" * filled + "░" * (bar_length - filled)
@@ -108,10 +132,73 @@ class ProgressTracker:
         else:
             time_str = ""
 
-        status_line = f"[{bar}] {progress * 100:.1f}% | {self.current_stage}{time_str}"
+        status_line = (
+            f"[{bar}] {progress * 100:.1f}% | {self.current_stage}{time_str}"
+            f"{self._format_streams()}"
+        )
         sys.stdout.write(f"\r{status_line}")
         sys.stdout.flush()
 
+    def _format_streams(self) -> str:
+        """Résume les flux en cours : caractères reçus, débit et premier token."""
+        if not self.active_streams:
+            return ""
+        now = time.monotonic()
+        chars = sum(st["chars"] for st in self.active_streams.values())
+        rate = sum(
+            st["chars"] / (now - st["first_token_at"])
+            for st in self.active_streams.values()
+            # Débit calculé après 0.5s de flux pour éviter les valeurs aberrantes
+            if st["first_token_at"] and now - st["first_token_at"] >= 0.5
+        )
+        waiting = [now - st["started_at"] for st in self.active_streams.values() if not st["ttft"]]
+        if waiting:
+            return f" | ⏳ 1er token attendu depuis {max(waiting):.1f}s"
+        ttft = max(st["ttft"] for st in self.active_streams.values())
+        return f" | ⚡ {chars} car, {rate:.0f} car/s, TTFT {ttft:.1f}s"
+
+    def on_stream_start(self, stream_id: int, role: str, model: str):
+        """Début d'une réponse en streaming (observateur de ``core.gpt``)."""
+        with self._lock:
+            self.active_streams[stream_id] = {
+                "role": role,
+                "model": model,
+                "chars": 0,
+                "started_at": time.monotonic(),
+                "first_token_at": None,
+                "ttft": None,
+            }
+
+    def on_stream_chunk(self, stream_id: int, text: str):
+        """Réception d'un fragment : met à jour le débit (affichage limité à 5 Hz)."""
+        with self._lock:
+            stream = self.active_streams.get(stream_id)
+            if stream is None:
+                return
+            now = time.monotonic()
+            if stream["first_token_at"] is None:
+                stream["first_token_at"] = now
+                stream["ttft"] = now - stream["started_at"]
+            stream["chars"] += len(text)
+            if now - self._last_stream_refresh >= 0.2:
+                self._last_stream_refresh = now
+                self._display_progress()
+
+    def on_stream_end(self, stream_id: int, stats: Dict[str, Any]):
+        """Fin d'une réponse en streaming."""
+        with self._lock:
+            self.active_streams.pop(stream_id, None)
+        if "error" in stats:
+            return
+        elapsed = stats.get("elapsed") or 0.0
+        throughput = stats["completion_tokens"] / elapsed if elapsed > 0 else 0.0
+        ttft = stats.get("ttft")
+        ttft_str = f"{ttft:.2f}s" if ttft is not None else "n/a"
+        logger.debug(
+            f"Flux {stats['role']} ({stats['model']}) terminé : {stats['chars']} car, "
+            f"{throughput:.1f} tokens/s, TTFT {ttft_str}"
+        )
+
     def start_brainstorm(self):
         """Marque le début du brainstorming."""
         self._log_console(f"\n{config.get_emoji('start')} === DÉBUT DU BRAINSTORM ===")
@@ -131,6 +218,23 @@ class ProgressTracker:
         self._log_console(f"\n\n{config.get_emoji('cycle')} === CYCLE {cycle_num} ===")
         logger.info(f"Début du cycle {cycle_num}")
 
+    def stop_cycles_early(self, cycles_done: int, reason: str):
+        """
+        Retire de la progression les cycles non exécutés après un arrêt anticipé.
+
+        Args:
+            cycles_done: Nombre de cycles exécutés
+            reason: Raison de l'arrêt
+        """
+        with self._lock:
+            skipped = self.total_cycles - cycles_done
+            self.total_steps -= skipped * 5
+            self.total_cycles = cycles_done
+        self._log_console(
+            f"\n⏹️ Arrêt anticipé après {cycles_done} cycle(s) ({reason}), "
+            f"{skipped} cycle(s) économisé(s)"
+        )
+
     def log_step(self, step_name: str, content: str):
         """
         Log une étape avec son contenu.
@@ -154,7 +258,7 @@ class ProgressTracker:
         """
         step_names = ["Créatif", "Critique", "Défense", "Réplique", "Révision", "Score"]
         step_name = step_names[step_num] if step_num < len(step_names) else f"Étape {step_num}"
-        self.update_stage(f"Cycle - {step_name}")
+        self._start_step(f"Cycle - {step_name}")
         logger.debug(f"Début de l'étape {step_num}: {step_name}")
 
     def complete_cycle_step(self, step_num: int):
@@ -166,6 +270,7 @@ class ProgressTracker:
         """
         step_names = ["Créatif", "Critique", "Défense", "Réplique", "Révision", "Score"]
         step_name = step_names[step_num] if step_num < len(step_names) else f"Étape {step_num}"
+        self._complete_step(f"Cycle - {step_name}")
         logger.debug(f"Fin de l'étape {step_num}: {step_name}")
 
     def start_idea_step(self, step_num: int):
@@ -177,7 +282,7 @@ class ProgressTracker:
         """
         step_names = ["Plan", "Critique Plan", "Défense Plan", "Révision Plan"]
         step_name = step_names[step_num] if step_num < len(step_names) else f"Étape {step_num}"
-        self.update_stage(f"Idée - {step_name}")
+        self._start_step(f"Idée - {step_name}")
         logger.debug(f"Début de l'étape idée {step_num}: {step_name}")
 
     def complete_idea_step(self, step_num: int):
@@ -189,6 +294,7 @@ class ProgressTracker:
         """
         step_names = ["Plan", "Critique Plan", "Défense Plan", "Révision Plan"]
         step_name = step_names[step_num] if step_num < len(step_names) else f"Étape {step_num}"
+        self._complete_step(f"Idée - {step_name}")
         logger.debug(f"Fin de l'étape idée {step_num}: {step_name}")
 
     def start_idea(self, idea_num: int, idea_text: str):
@@ -203,6 +309,22 @@ class ProgressTracker:
         self._log_console(f"\n💡 Traitement de l'idée {idea_num}: {idea_preview}")
         logger.info(f"Traitement de l'idée {idea_num}")
 
+    def skip_idea(self, idea_num: int, idea_text: str, reason: str):
+        """
+        Marque une idée comme traitée sans appel API (ex: plan réutilisé d'un run précédent).
+
+        Args:
+            idea_num: Numéro de l'idée
+            idea_text: Texte de l'idée
+            reason: Raison affichée
+        """
+        idea_preview = idea_text[:50] + "..." if len(idea_text) > 50 else idea_text
+        self._log_console(f"\n♻️ Idée {idea_num} {reason}: {idea_preview}")
+        with self._lock:
+            # Les 4 étapes de l'idée comptent comme terminées
+            self.completed_steps += 3
+            self.update_stage(f"Idée {idea_num} - {reason}")
+
     def complete_synthesis(self):
         """Marque la fin de la synthèse."""
         logger.info("Synthèse terminée")
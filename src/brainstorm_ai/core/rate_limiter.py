@@ -0,0 +1,171 @@
+"""
+Module de limitation de débit proactive par modèle.
+
+Chaque modèle dispose de deux seaux à jetons (token buckets) : un pour les
+requêtes par minute (RPM) et un pour les tokens par minute (TPM). Les appels
+réservent leur quota avant d'être envoyés, ce qui évite de déclencher des
+erreurs 429 lorsque plusieurs cycles ou idées s'exécutent en parallèle.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Seau à jetons avec réservation.
+
+    Une réservation peut rendre le solde négatif : l'appelant reçoit alors le
+    délai à attendre, et les appelants suivants se placent derrière lui.
+    Non thread-safe : la synchronisation est assurée par ``ModelRateLimiter``.
+    """
+
+    def __init__(self, capacity: float, per_seconds: float = 60.0):
+        """
+        Args:
+            capacity: Nombre de jetons disponibles par période
+            per_seconds: Durée de la période en secondes
+        """
+        self.capacity = float(capacity)
+        self.refill_rate = self.capacity / per_seconds
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        self.updated_at = now
+
+    def reserve(self, amount: float, now: Optional[float] = None) -> float:
+        """
+        Réserve des jetons et retourne le délai d'attente nécessaire (en secondes).
+
+        Une demande supérieure à la capacité est plafonnée à la capacité pour
+        ne jamais attendre plus d'une période.
+        """
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.refill_rate
+
+    def wait_time(self, amount: float, now: Optional[float] = None) -> float:
+        """Délai qu'imposerait une réservation de ``amount`` jetons, sans réserver."""
+        now = time.monotonic() if now is None else now
+        tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        missing = min(amount, self.capacity) - tokens
+        return missing / self.refill_rate if missing > 0 else 0.0
+
+    def adjust(self, delta: float) -> None:
+        """Corrige le solde après coup (delta positif = jetons consommés en plus)."""
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class ModelRateLimiter:
+    """Limiteur RPM/TPM pour un modèle donné."""
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """Réserve une requête et ``tokens`` tokens, retourne le délai à attendre."""
+        with self._lock:
+            now = time.monotonic()
+            wait_requests = self.requests.reserve(1, now) if self.requests else 0.0
+            wait_tokens = self.tokens.reserve(tokens, now) if self.tokens else 0.0
+            return max(wait_requests, wait_tokens)
+
+    def expected_wait(self, tokens: int) -> float:
+        """Délai qu'imposerait l'appel, sans consommer de quota."""
+        with self._lock:
+            now = time.monotonic()
+            wait_requests = self.requests.wait_time(1, now) if self.requests else 0.0
+            wait_tokens = self.tokens.wait_time(tokens, now) if self.tokens else 0.0
+            return max(wait_requests, wait_tokens)
+
+    def adjust_tokens(self, delta: int) -> None:
+        """Réconcilie l'estimation avec l'usage réel."""
+        if self.tokens is None:
+            return
+        with self._lock:
+            self.tokens.adjust(delta)
+
+
+class RateLimiter:
+    """Registre de limiteurs par modèle, utilisable depuis des threads ou asyncio."""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, int]]] = None):
+        """
+        Args:
+            limits: Dictionnaire {modèle: {"rpm": int, "tpm": int}}
+        """
+        self._limiters: Dict[str, ModelRateLimiter] = {}
+        for model, model_limits in (limits or {}).items():
+            model_limits = model_limits or {}
+            self._limiters[model] = ModelRateLimiter(
+                rpm=model_limits.get("rpm"), tpm=model_limits.get("tpm")
+            )
+
+    def _reserve(self, model: str, tokens: int) -> float:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            return 0.0
+        delay = limiter.reserve(tokens)
+        if delay > 0:
+            logger.debug(f"Limitation de débit {model} : attente de {delay:.2f}s")
+        return delay
+
+    def acquire(self, model: str, tokens: int) -> float:
+        """
+        Attend (bloquant) que le quota du modèle permette l'appel.
+
+        Returns:
+            Le délai attendu en secondes
+        """
+        delay = self._reserve(model, tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, model: str, tokens: int) -> float:
+        """Variante asynchrone de :meth:`acquire` (n'occupe pas la boucle d'événements)."""
+        delay = self._reserve(model, tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def expected_wait(self, model: str, tokens: int) -> float:
+        """Délai d'attente de quota qu'imposerait un appel au modèle (0 si non limité)."""
+        limiter = self._limiters.get(model)
+        return limiter.expected_wait(tokens) if limiter is not None else 0.0
+
+    def record_usage(self, model: str, estimated_tokens: int, actual_tokens: int) -> None:
+        """Corrige la réservation d'un appel avec le nombre de tokens réellement consommés."""
+        limiter = self._limiters.get(model)
+        if limiter is not None:
+            limiter.adjust_tokens(actual_tokens - estimated_tokens)
+
+
+# Instance globale (initialisation lazy)
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Retourne le limiteur de débit configuré sous ``api.rate_limits``."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter(config.get("api.rate_limits", {}))
+    return _rate_limiter
@@ -0,0 +1,210 @@
+"""
+Module de résilience des appels API : disjoncteur et backoff adaptatif.
+
+Un disjoncteur (circuit breaker) partagé par modèle coupe les appels après
+une série d'échecs transitoires (erreurs serveur, connexions, timeouts) :
+tous les threads cessent alors de solliciter le point d'accès défaillant.
+Après le délai de récupération, quelques appels de test (état semi-ouvert)
+décident de la réouverture ou d'une nouvelle coupure.
+
+Les attentes entre tentatives suivent un backoff à gigue décorrélée, qui
+évite que des appelants parallèles ne réessaient tous au même instant, et
+respectent les indications ``Retry-After`` du serveur.
+"""
+
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# États du disjoncteur
+FERME = "closed"
+OUVERT = "open"
+SEMI_OUVERT = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Exception levée quand le disjoncteur d'un modèle refuse un appel."""
+
+    def __init__(self, model: str, retry_in: float):
+        super().__init__(f"Disjoncteur ouvert pour {model}, nouvel essai dans {retry_in:.1f}s")
+        self.model = model
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Disjoncteur thread-safe d'un modèle."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        """
+        Args:
+            name: Nom du point d'accès protégé (modèle)
+            failure_threshold: Échecs consécutifs provoquant l'ouverture
+            recovery_timeout: Durée (s) d'ouverture avant les appels de test
+            half_open_max_calls: Appels de test simultanés en état semi-ouvert
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._state = FERME
+        self._failures = 0
+        self._opened_until = 0.0
+        self._trial_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """État courant (``closed``, ``open`` ou ``half_open``)."""
+        with self._lock:
+            self._refresh(time.monotonic())
+            return self._state
+
+    def _refresh(self, now: float) -> None:
+        if self._state == OUVERT and now >= self._opened_until:
+            self._state = SEMI_OUVERT
+            self._trial_calls = 0
+            logger.info(f"Disjoncteur {self.name} semi-ouvert : appels de test autorisés")
+
+    def before_call(self) -> None:
+        """
+        Autorise un appel ou le refuse.
+
+        Raises:
+            CircuitOpenError: Si le disjoncteur est ouvert, ou si les appels de
+                test de l'état semi-ouvert sont déjà en cours
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            if self._state == OUVERT:
+                raise CircuitOpenError(self.name, self._opened_until - now)
+            if self._state == SEMI_OUVERT:
+                if self._trial_calls >= self.half_open_max_calls:
+                    raise CircuitOpenError(self.name, self.recovery_timeout / 10)
+                self._trial_calls += 1
+
+    def record_success(self) -> None:
+        """Enregistre un appel réussi (referme le disjoncteur)."""
+        with self._lock:
+            if self._state != FERME:
+                logger.info(f"Disjoncteur {self.name} refermé")
+            self._state = FERME
+            self._failures = 0
+            self._trial_calls = 0
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        """
+        Enregistre un échec transitoire.
+
+        Args:
+            retry_after: Délai indiqué par le serveur ; ouvre le disjoncteur au
+                moins pour cette durée
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._failures += 1
+            if self._state == SEMI_OUVERT or self._failures >= self.failure_threshold:
+                duration = max(self.recovery_timeout, retry_after or 0.0)
+                if self._state != OUVERT:
+                    logger.warning(
+                        f"Disjoncteur {self.name} ouvert pour {duration:.0f}s "
+                        f"après {self._failures} échec(s)"
+                    )
+                self._state = OUVERT
+                self._opened_until = max(self._opened_until, now + duration)
+                self._trial_calls = 0
+
+
+def decorrelated_jitter(previous: Optional[float], base: float, cap: float) -> float:
+    """
+    Calcule le délai suivant d'un backoff à gigue décorrélée.
+
+    Args:
+        previous: Délai précédent (None pour la première attente)
+        base: Délai minimal
+        cap: Délai maximal
+
+    Returns:
+        Un délai tiré uniformément entre ``base`` et trois fois le délai précédent
+    """
+    upper = max(base, (previous or base) * 3)
+    return min(cap, random.uniform(base, upper))
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """
+    Extrait le délai d'attente indiqué par le serveur dans une erreur HTTP.
+
+    Les en-têtes ``retry-after-ms`` puis ``retry-after`` (secondes ou date
+    HTTP) sont consultés.
+
+    Returns:
+        Le délai en secondes, ou None sans indication exploitable
+    """
+    response = getattr(error, "response", None)
+    headers: Any = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+# Disjoncteurs par modèle
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(model: str) -> Optional[CircuitBreaker]:
+    """
+    Retourne le disjoncteur partagé d'un modèle.
+
+    Returns:
+        Le disjoncteur, ou None s'ils sont désactivés (``api.circuit_breaker``)
+    """
+    breaker_config = config.get_circuit_breaker_config()
+    if not breaker_config["enabled"]:
+        return None
+    breaker = _breakers.get(model)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(model)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    model,
+                    failure_threshold=breaker_config["failure_threshold"],
+                    recovery_timeout=breaker_config["recovery_timeout"],
+                    half_open_max_calls=breaker_config["half_open_max_calls"],
+                )
+                _breakers[model] = breaker
+    return breaker
@@ -0,0 +1,218 @@
+"""
+Module de routage des appels vers les modèles.
+
+Chaque étape du brainstorm (``creatif``, ``critique``, ``replique``,
+``score``...) dispose d'une route : une liste de modèles par ordre de
+préférence (``api.routing.routes``, à défaut le modèle du rôle). Pour chaque
+appel, le routeur choisit le premier modèle de la route qui :
+
+- tient le prompt et la complétion attendue dans sa fenêtre de contexte ;
+- n'a pas renvoyé d'erreur 429 récemment ni de disjoncteur ouvert ;
+- n'imposerait pas une attente de quota (RPM/TPM) excessive ;
+- respecte l'objectif de latence, s'il est défini.
+
+Passé une fraction du budget du run, le modèle le moins cher de la route est
+privilégié, sauf pour les étapes dont le modèle est fixé dans
+``agents.models`` : ce modèle reste le premier choix. Des statistiques par route (étape, modèle) permettent d'ajuster
+le compromis coût/débit à partir des runs réels.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from .budget import get_budget_guard
+from .config import config
+from .rate_limiter import get_rate_limiter
+from .resilience import OUVERT, get_circuit_breaker
+
+logger = logging.getLogger(__name__)
+
+# Poids de la dernière mesure dans la moyenne glissante des latences
+LATENCY_SMOOTHING = 0.2
+
+
+class ModelRouter:
+    """Choix du modèle de chaque appel et statistiques par route."""
+
+    def __init__(
+        self,
+        downgrade_at: float = 0.5,
+        rate_limit_cooldown: float = 30.0,
+        max_queue_wait: float = 30.0,
+        latency_slo: Optional[float] = None,
+    ):
+        """
+        Args:
+            downgrade_at: Part du budget consommée à partir de laquelle le modèle
+                le moins cher de la route est choisi
+            rate_limit_cooldown: Durée (s) pendant laquelle un modèle ayant
+                renvoyé une erreur 429 est évité
+            max_queue_wait: Attente de quota maximale (s) avant de passer au
+                modèle suivant de la route
+            latency_slo: Latence moyenne maximale (s) d'un modèle (None = sans objectif)
+        """
+        self.downgrade_at = downgrade_at
+        self.rate_limit_cooldown = rate_limit_cooldown
+        self.max_queue_wait = max_queue_wait
+        self.latency_slo = latency_slo
+        self._cooldowns: Dict[str, float] = {}
+        self._latencies: Dict[str, float] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _price(model: str) -> float:
+        pricing = config.get_model_pricing(model)
+        return pricing["input"] + pricing["output"]
+
+    def _fits(self, model: str, role: str, prompt_tokens: int) -> bool:
+        completion = config.get_token_budget(role)["completion"]
+        return prompt_tokens + completion <= config.get_context_window(model)
+
+    def _rejection(self, model: str, prompt_tokens: int) -> Optional[str]:
+        """Raison d'écarter un modèle, ou None s'il est utilisable."""
+        now = time.monotonic()
+        with self._lock:
+            cooldown = self._cooldowns.get(model, 0.0)
+            latency = self._latencies.get(model)
+        if cooldown > now:
+            return f"erreur 429 récente ({cooldown - now:.0f}s restantes)"
+        breaker = get_circuit_breaker(model)
+        if breaker is not None and breaker.state == OUVERT:
+            return "disjoncteur ouvert"
+        if self.latency_slo is not None and latency is not None and latency > self.latency_slo:
+            return f"latence {latency:.1f}s > objectif {self.latency_slo}s"
+        wait = get_rate_limiter().expected_wait(model, prompt_tokens)
+        if wait > self.max_queue_wait:
+            return f"attente de quota de {wait:.1f}s"
+        return None
+
+    def select(
+        self, step: str, role: str, prompt_tokens: int, exclude: Iterable[str] = ()
+    ) -> Optional[str]:
+        """
+        Choisit le modèle d'un appel.
+
+        Args:
+            step: L'étape du brainstorm (ex: ``replique``)
+            role: Le rôle de l'agent appelant
+            prompt_tokens: Taille du prompt en tokens
+            exclude: Modèles à écarter (ex: modèle qui vient d'échouer)
+
+        Returns:
+            Le modèle choisi, ou None si la route n'a plus de candidat
+        """
+        excluded = set(exclude)
+        candidates = [m for m in config.get_route_models(step, role) if m not in excluded]
+        if not candidates:
+            return None
+
+        # Un modèle dont la fenêtre est trop petite n'est gardé qu'en dernier recours
+        fitting = [m for m in candidates if self._fits(m, role, prompt_tokens)]
+        candidates = fitting or candidates[:1]
+
+        explicit = config.get_explicit_model(step, role)
+        if explicit is None and get_budget_guard().usage_ratio() >= self.downgrade_at:
+            candidates = sorted(candidates, key=self._price)
+
+        for model in candidates[:-1]:
+            reason = self._rejection(model, prompt_tokens)
+            if reason is None:
+                return model
+            logger.info(f"Routage {step} : {model} écarté ({reason})")
+            self._count(step, model, "skipped")
+        return candidates[-1]
+
+    def mark_rate_limited(self, model: str) -> None:
+        """Évite un modèle pendant ``rate_limit_cooldown`` secondes après une erreur 429."""
+        with self._lock:
+            self._cooldowns[model] = time.monotonic() + self.rate_limit_cooldown
+
+    def _count(self, step: str, model: str, key: str, amount: float = 1) -> None:
+        with self._lock:
+            route = self._stats.setdefault(
+                f"{step}/{model}",
+                {
+                    "calls": 0,
+                    "errors": 0,
+                    "skipped": 0,
+                    "fallbacks": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "cost": 0.0,
+                    "latency": 0.0,
+                },
+            )
+            route[key] += amount
+
+    def record_call(
+        self,
+        step: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cost: float,
+        latency: float,
+    ) -> None:
+        """Comptabilise un appel réussi sur la route (étape, modèle)."""
+        self._count(step, model, "calls")
+        self._count(step, model, "prompt_tokens", prompt_tokens)
+        self._count(step, model, "completion_tokens", completion_tokens)
+        self._count(step, model, "cost", cost)
+        self._count(step, model, "latency", latency)
+        with self._lock:
+            previous = self._latencies.get(model)
+            self._latencies[model] = (
+                latency if previous is None else previous + LATENCY_SMOOTHING * (latency - previous)
+            )
+
+    def record_error(self, step: str, model: str, fallback: bool = False) -> None:
+        """Comptabilise un échec sur la route, et la bascule éventuelle vers un autre modèle."""
+        self._count(step, model, "errors")
+        if fallback:
+            self._count(step, model, "fallbacks")
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Retourne les statistiques par route ``étape/modèle``.
+
+        Returns:
+            Appels, erreurs, modèles écartés, bascules, tokens, coût et latence
+            moyenne de chaque route
+        """
+        with self._lock:
+            stats = {route: dict(values) for route, values in self._stats.items()}
+        for values in stats.values():
+            calls = values["calls"]
+            latency = values.pop("latency")
+            values["cost"] = round(values["cost"], 4)
+            values["avg_latency"] = round(latency / calls, 3) if calls else 0.0
+        return stats
+
+    def reset_stats(self) -> None:
+        """Réinitialise les statistiques par route."""
+        with self._lock:
+            self._stats.clear()
+
+
+# Instance globale (initialisation lazy)
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> ModelRouter:
+    """Retourne le routeur configuré sous ``api.routing``."""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                routing = config.get_routing_config()
+                _router = ModelRouter(
+                    downgrade_at=routing["downgrade_at"],
+                    rate_limit_cooldown=routing["rate_limit_cooldown"],
+                    max_queue_wait=routing["max_queue_wait"],
+                    latency_slo=routing["latency_slo"],
+                )
+    return _router
@@ -0,0 +1,133 @@
+"""
+Module d'ordonnancement des étapes de brainstorming.
+
+Exécute un graphe d'étapes (DAG) en lançant en parallèle toutes les étapes
+dont les dépendances sont satisfaites.
+"""
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerError(Exception):
+    """Exception levée pour un graphe d'étapes invalide."""
+
+    pass
+
+
+@dataclass
+class Step:
+    """
+    Étape d'un graphe d'exécution.
+
+    La fonction reçoit en arguments nommés les résultats des étapes dont
+    elle dépend (un argument par nom de dépendance).
+    """
+
+    name: str
+    func: Callable[..., Any]
+    depends_on: Tuple[str, ...] = field(default_factory=tuple)
+    index: Optional[int] = None  # Index de progression (optionnel)
+
+
+def _validate_steps(steps: List[Step]) -> Dict[str, Step]:
+    """Vérifie l'unicité des noms, les dépendances et l'absence de cycle."""
+    by_name: Dict[str, Step] = {}
+    for step in steps:
+        if step.name in by_name:
+            raise SchedulerError(f"Étape dupliquée : {step.name}")
+        by_name[step.name] = step
+
+    for step in steps:
+        for dep in step.depends_on:
+            if dep not in by_name:
+                raise SchedulerError(f"Dépendance inconnue '{dep}' pour l'étape '{step.name}'")
+
+    # Détection de cycle par tri topologique
+    resolved: set = set()
+    remaining = list(steps)
+    while remaining:
+        ready = [s for s in remaining if all(d in resolved for d in s.depends_on)]
+        if not ready:
+            names = ", ".join(s.name for s in remaining)
+            raise SchedulerError(f"Dépendances cycliques entre les étapes : {names}")
+        for s in ready:
+            resolved.add(s.name)
+            remaining.remove(s)
+
+    return by_name
+
+
+def run_steps(
+    steps: List[Step],
+    max_workers: Optional[int] = None,
+    on_start: Optional[Callable[[Step], None]] = None,
+    on_complete: Optional[Callable[[Step], None]] = None,
+    parallel: bool = True,
+) -> Dict[str, Any]:
+    """
+    Exécute un graphe d'étapes en respectant les dépendances.
+
+    Args:
+        steps: Liste des étapes à exécuter
+        max_workers: Nombre maximal d'étapes simultanées (par défaut : nombre d'étapes)
+        on_start: Callback appelé au lancement de chaque étape
+        on_complete: Callback appelé à la fin de chaque étape
+        parallel: Si False, exécute les étapes séquentiellement dans l'ordre de la liste
+
+    Returns:
+        Dictionnaire {nom de l'étape: résultat}
+
+    Raises:
+        SchedulerError: Si le graphe est invalide
+        Exception: La première exception levée par une étape
+    """
+    by_name = _validate_steps(steps)
+    results: Dict[str, Any] = {}
+
+    def _execute(step: Step) -> Any:
+        if on_start:
+            on_start(step)
+        kwargs = {dep: results[dep] for dep in step.depends_on}
+        result = step.func(**kwargs)
+        if on_complete:
+            on_complete(step)
+        return result
+
+    if not parallel:
+        pending = list(steps)
+        while pending:
+            step = next(s for s in pending if all(d in results for d in s.depends_on))
+            results[step.name] = _execute(step)
+            pending.remove(step)
+        return results
+
+    workers = max_workers or len(steps) or 1
+    pending = list(steps)
+    running: Dict[Future, Step] = {}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="step") as executor:
+        try:
+            while pending or running:
+                # Lancer toutes les étapes prêtes
+                ready = [s for s in pending if all(d in results for d in s.depends_on)]
+                for step in ready:
+                    pending.remove(step)
+                    running[executor.submit(_execute, step)] = step
+                    logger.debug(f"Étape lancée : {step.name}")
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    results[step.name] = future.result()
+                    logger.debug(f"Étape terminée : {step.name}")
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+
+    return {name: results[name] for name in by_name}
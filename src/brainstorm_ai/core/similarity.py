@@ -0,0 +1,172 @@
+"""
+Module de détection locale de redondance entre textes.
+
+Les textes sont représentés par des vecteurs TF-IDF de n-grammes de mots
+hachés (unigrammes et bigrammes), puis comparés par une matrice de similarité
+cosinus calculée en une seule multiplication matricielle NumPy. Aucun appel
+API n'est nécessaire.
+"""
+
+import logging
+import re
+import zlib
+from typing import List, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Nombre de classes de hachage des n-grammes (collisions négligeables pour quelques textes)
+HASH_BUCKETS = 2**20
+
+_WORD = re.compile(r"\w+")
+
+
+def _ngrams(text: str) -> List[str]:
+    """Unigrammes et bigrammes de mots (mots de plus de 2 lettres, en minuscules)."""
+    words = [word for word in _WORD.findall(text.lower()) if len(word) > 2]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def vectorize(texts: Sequence[str]) -> np.ndarray:
+    """
+    Calcule les vecteurs TF-IDF normalisés des textes.
+
+    Les n-grammes sont hachés (crc32, stable entre processus) puis seules les
+    colonnes effectivement présentes sont conservées, ce qui garde une matrice
+    compacte quel que soit le nombre de classes de hachage.
+
+    Args:
+        texts: Les textes à vectoriser
+
+    Returns:
+        Matrice (nombre de textes × vocabulaire) de vecteurs de norme 1
+        (vecteur nul pour un texte sans mot)
+    """
+    rows: List[int] = []
+    hashes: List[int] = []
+    for i, text in enumerate(texts):
+        features = [zlib.crc32(ngram.encode("utf-8")) % HASH_BUCKETS for ngram in _ngrams(text)]
+        rows.extend([i] * len(features))
+        hashes.extend(features)
+
+    if not hashes:
+        return np.zeros((len(texts), 0), dtype=np.float64)
+
+    vocabulary, columns = np.unique(np.asarray(hashes), return_inverse=True)
+    counts = np.zeros((len(texts), len(vocabulary)), dtype=np.float64)
+    np.add.at(counts, (np.asarray(rows), columns), 1.0)
+
+    # TF sous-linéaire et IDF lissé
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(texts)) / (1 + document_frequency)) + 1.0
+    vectors = np.log1p(counts) * idf
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def cosine_matrix(texts: Sequence[str]) -> np.ndarray:
+    """
+    Calcule la matrice de similarité cosinus entre tous les textes.
+
+    Args:
+        texts: Les textes à comparer
+
+    Returns:
+        Matrice symétrique (n × n) de similarités dans [0, 1]
+    """
+    vectors = vectorize(texts)
+    return np.clip(vectors @ vectors.T, 0.0, 1.0)
+
+
+def collapse_near_duplicates(texts: Sequence[str], threshold: float) -> List[str]:
+    """
+    Retire les textes quasi identiques à un autre texte conservé.
+
+    Les textes sont parcourus du plus récent au plus ancien : une révision
+    ultérieure, généralement plus aboutie, est gardée et les versions
+    antérieures trop proches (similarité ≥ ``threshold``) sont écartées.
+    L'ordre d'origine des textes conservés est préservé.
+
+    Args:
+        texts: Les textes, du plus ancien au plus récent
+        threshold: Seuil de similarité cosinus à partir duquel deux textes sont redondants
+
+    Returns:
+        Les textes conservés
+    """
+    if len(texts) < 2:
+        return list(texts)
+
+    similarities = cosine_matrix(texts)
+    kept: List[int] = []
+    for i in range(len(texts) - 1, -1, -1):
+        if kept and similarities[i, kept].max() >= threshold:
+            logger.debug(f"Texte {i + 1} redondant (similarité {similarities[i, kept].max():.2f})")
+            continue
+        kept.append(i)
+
+    kept.sort()
+    removed = len(texts) - len(kept)
+    if removed:
+        logger.info(
+            f"Redondance : {removed} texte(s) sur {len(texts)} écarté(s) (seuil {threshold})"
+        )
+    return [texts[i] for i in kept]
+
+
+def select_candidates(
+    candidates: Sequence[str],
+    references: Sequence[str],
+    keep: int,
+    strategy: str = "diverse",
+) -> List[str]:
+    """
+    Sélectionne les meilleures réponses candidates d'un appel à plusieurs choix.
+
+    La nouveauté d'un candidat est 1 - sa similarité cosinus maximale avec les
+    textes de référence (ex: l'historique des idées).
+
+    - ``novelty`` : les ``keep`` candidats les plus nouveaux
+    - ``diverse`` : sélection gloutonne du candidat le plus éloigné à la fois
+      des références et des candidats déjà retenus (évite de garder deux
+      variantes de la même idée)
+
+    Args:
+        candidates: Les réponses candidates
+        references: Les textes déjà connus
+        keep: Nombre de candidats conservés
+        strategy: ``novelty`` ou ``diverse``
+
+    Returns:
+        Les candidats retenus, du plus au moins nouveau
+    """
+    candidates = [c for c in candidates if c.strip()]
+    if len(candidates) <= 1:
+        return list(candidates)
+
+    references = [r for r in references if r.strip()]
+    similarities = cosine_matrix([*references, *candidates])
+    offset = len(references)
+    # Proximité de chaque candidat avec le texte de référence le plus proche
+    closest = (
+        similarities[offset:, :offset].max(axis=1) if references else np.zeros(len(candidates))
+    )
+
+    selected: List[int] = []
+    for _ in range(min(keep, len(candidates))):
+        remaining = [i for i in range(len(candidates)) if i not in selected]
+        if strategy == "diverse" and selected:
+            rows = [offset + i for i in remaining]
+            cols = [offset + j for j in selected]
+            proximity = np.maximum(closest[remaining], similarities[np.ix_(rows, cols)].max(axis=1))
+        else:
+            proximity = closest[remaining]
+        selected.append(remaining[int(np.argmin(proximity))])
+
+    logger.debug(
+        f"Candidats retenus : {[i + 1 for i in selected]} sur {len(candidates)} "
+        f"(nouveauté {[round(1 - float(closest[i]), 2) for i in selected]})"
+    )
+    return [candidates[i] for i in selected]
@@ -0,0 +1,180 @@
+"""
+Module de télémétrie persistante des appels API.
+
+Chaque appel réussi (tokens de prompt et de complétion, latence) est
+enregistré par étape du brainstorm (``creatif``, ``defense``, ``plan``...,
+à défaut le rôle de l'agent) : un même rôle sert des étapes de tailles très
+différentes, comme la génération et la défense de l'agent créatif. Les
+dernières mesures de chaque étape sont
+conservées dans un fichier JSON d'un run à l'autre et servent à estimer le
+coût et la durée d'un brainstorm avant son lancement
+(:meth:`Config.estimate_total_cost`).
+"""
+
+import json
+import logging
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# Version 2 : mesures par étape (et non plus par rôle)
+TELEMETRY_VERSION = 2
+
+# Mesure d'un appel : (tokens du prompt, tokens de complétion, latence en secondes)
+Sample = Tuple[int, int, float]
+
+
+class TelemetryStore:
+    """Historique borné des mesures d'appels API, par étape."""
+
+    def __init__(self, path: Optional[str] = None, max_samples: int = 500):
+        """
+        Args:
+            path: Fichier JSON de la télémétrie (None = mémoire uniquement)
+            max_samples: Nombre de mesures conservées par étape (les plus récentes)
+        """
+        self.path = Path(path) if path else None
+        self.max_samples = max_samples
+        self._samples: Dict[str, Deque[Sample]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def record(self, step: str, prompt_tokens: int, completion_tokens: int, latency: float) -> None:
+        """
+        Enregistre la mesure d'un appel réussi.
+
+        Args:
+            step: L'étape de l'appel (à défaut le rôle de l'agent appelant)
+            prompt_tokens: Tokens du prompt facturés
+            completion_tokens: Tokens de complétion facturés
+            latency: Durée de l'appel en secondes
+        """
+        with self._lock:
+            samples = self._samples.setdefault(step, deque(maxlen=self.max_samples))
+            samples.append((prompt_tokens, completion_tokens, round(latency, 3)))
+            self._dirty = True
+
+    def expected_completion(self, step: str) -> Optional[float]:
+        """Moyenne des tokens de complétion mesurés pour l'étape (None sans mesure)."""
+        with self._lock:
+            samples = self._samples.get(step)
+            if not samples:
+                return None
+            return sum(s[1] for s in samples) / len(samples)
+
+    def step_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Calcule les distributions mesurées de chaque étape.
+
+        Returns:
+            Par étape : nombre de mesures, minimum, moyenne et p90 des tokens de
+            prompt, moyenne et p90 des tokens de complétion et de la latence
+        """
+        with self._lock:
+            snapshot = {step: list(samples) for step, samples in self._samples.items()}
+
+        stats = {}
+        for step, samples in snapshot.items():
+            if not samples:
+                continue
+            values = np.array(samples, dtype=np.float64)
+            prompt, completion, latency = values[:, 0], values[:, 1], values[:, 2]
+            stats[step] = {
+                "samples": len(samples),
+                "prompt_min": float(prompt.min()),
+                "prompt_mean": float(prompt.mean()),
+                "prompt_p90": float(np.percentile(prompt, 90)),
+                "completion_mean": float(completion.mean()),
+                "completion_p90": float(np.percentile(completion, 90)),
+                "latency_mean": float(latency.mean()),
+                "latency_p90": float(np.percentile(latency, 90)),
+            }
+        return stats
+
+    def save(self) -> None:
+        """Enregistre la télémétrie sur disque si elle a été modifiée."""
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            data = {
+                "version": TELEMETRY_VERSION,
+                "steps": {
+                    step: [list(s) for s in samples] for step, samples in self._samples.items()
+                },
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            tmp_path.replace(self.path)
+            self._dirty = False
+        logger.debug(f"Télémétrie enregistrée : {self.path}")
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Télémétrie illisible, ignorée ({self.path}): {e}")
+            return
+        if data.get("version") != TELEMETRY_VERSION:
+            return
+
+        for step, samples in (data.get("steps") or {}).items():
+            self._samples[step] = deque(
+                ((int(p), int(c), float(t)) for p, c, t in samples), maxlen=self.max_samples
+            )
+
+
+# Instance globale (initialisation lazy)
+_telemetry_store: Optional[TelemetryStore] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry_store() -> Optional[TelemetryStore]:
+    """
+    Retourne le magasin de télémétrie configuré sous ``advanced.telemetry``.
+
+    Returns:
+        Le magasin, ou None si la télémétrie est désactivée
+    """
+    global _telemetry_store
+    telemetry_config = config.get_telemetry_config()
+    if not telemetry_config.get("enabled", False):
+        return None
+
+    if _telemetry_store is None:
+        with _telemetry_lock:
+            if _telemetry_store is None:
+                _telemetry_store = TelemetryStore(
+                    telemetry_config["path"], telemetry_config["max_samples"]
+                )
+    return _telemetry_store
+
+
+def get_step_stats() -> Dict[str, Dict[str, float]]:
+    """Retourne les distributions mesurées par étape ({} sans télémétrie)."""
+    store = get_telemetry_store()
+    return store.step_stats() if store is not None else {}
+
+
+def record_call(step: str, prompt_tokens: int, completion_tokens: int, latency: float) -> None:
+    """Enregistre un appel dans la télémétrie si elle est activée."""
+    store = get_telemetry_store()
+    if store is not None:
+        store.record(step, prompt_tokens, completion_tokens, latency)
+
+
+def get_expected_completion(step: str) -> Optional[float]:
+    """Complétion moyenne mesurée pour l'étape (None sans télémétrie ni mesure)."""
+    store = get_telemetry_store()
+    return store.expected_completion(step) if store is not None else None
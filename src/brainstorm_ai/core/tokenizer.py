@@ -0,0 +1,115 @@
+"""
+Module de comptage des tokens par modèle.
+
+Utilise ``tiktoken`` (dépendance optionnelle) avec un encodeur mis en cache
+par modèle. Si ``tiktoken`` est absent ou si l'encodage ne peut pas être
+chargé (ex: pas d'accès réseau pour télécharger les tables BPE), le comptage
+se replie sur l'heuristique ~4 caractères par token.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    tiktoken = None
+
+# Encodage utilisé pour les modèles inconnus de tiktoken
+DEFAULT_ENCODING = "o200k_base"
+
+# Nombre moyen de caractères par token pour l'heuristique de repli
+CHARS_PER_TOKEN = 4
+
+_encoders: Dict[str, Optional[Any]] = {}
+_encoders_lock = threading.Lock()
+
+
+def _load_encoder(model: str) -> Optional[Any]:
+    """Charge l'encodeur tiktoken d'un modèle, ou None s'il est indisponible."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception as e:
+        logger.warning(f"Tokenizer indisponible pour {model}, estimation heuristique : {e}")
+        return None
+    try:
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        logger.warning(f"Tokenizer indisponible pour {model}, estimation heuristique : {e}")
+        return None
+
+
+def get_encoder(model: Optional[str] = None) -> Optional[Any]:
+    """
+    Retourne l'encodeur du modèle (chargé une seule fois par modèle).
+
+    Args:
+        model: Nom du modèle (par défaut le modèle par défaut de la configuration)
+
+    Returns:
+        L'encodeur tiktoken, ou None si le comptage exact est indisponible
+    """
+    model = model or config.get_model_for_role("default")
+    try:
+        return _encoders[model]
+    except KeyError:
+        pass
+    with _encoders_lock:
+        if model not in _encoders:
+            _encoders[model] = _load_encoder(model)
+        return _encoders[model]
+
+
+def is_exact(model: Optional[str] = None) -> bool:
+    """Indique si le comptage des tokens du modèle est exact (tokenizer disponible)."""
+    return get_encoder(model) is not None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Compte les tokens d'un texte pour un modèle.
+
+    Args:
+        text: Le texte à compter
+        model: Nom du modèle (détermine l'encodage)
+
+    Returns:
+        Le nombre de tokens (exact avec tiktoken, estimé sinon)
+    """
+    if not text:
+        return 0
+    encoder = get_encoder(model)
+    if encoder is None:
+        return len(text) // CHARS_PER_TOKEN
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def prompt_token_budget(role: str, model: Optional[str] = None) -> int:
+    """
+    Nombre maximal de tokens de prompt pour un rôle.
+
+    Le budget est le minimum entre le budget de prompt configuré pour le rôle
+    et la fenêtre de contexte du modèle diminuée de la complétion attendue.
+
+    Args:
+        role: Le rôle de l'agent
+        model: Le modèle utilisé (par défaut celui du rôle)
+
+    Returns:
+        Le nombre de tokens disponibles pour le prompt
+    """
+    model = model or config.get_model_for_role(role)
+    budget = config.get_token_budget(role)
+    available = config.get_context_window(model) - budget["completion"]
+    if budget.get("prompt"):
+        available = min(available, budget["prompt"])
+    return max(available, 0)
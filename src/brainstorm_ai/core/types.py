@@ -41,9 +41,7 @@ class CycleLog(TypedDict):
     score: ScoreDict
 
 
-class ApplicationLog(TypedDict):
-    """Structure d'un log d'application."""
-
+class _ApplicationLogBase(TypedDict):
     idee: str
     plan_initial: str
     critique: str
@@ -51,6 +49,13 @@ class ApplicationLog(TypedDict):
     revision: str
 
 
+class ApplicationLog(_ApplicationLogBase, total=False):
+    """Structure d'un log d'application."""
+
+    # Présent si le développement de l'idée a échoué (étapes vides)
+    erreur: str
+
+
 class BrainstormLog(TypedDict):
     """Structure complète d'un log de brainstorm."""
 
@@ -58,6 +63,9 @@ class BrainstormLog(TypedDict):
     contexte: str
     contraintes: str
     date: str
+    cycles_executes: int
+    # cycles_max, plateau_score, nouveaute_faible, budget_epuise, budget_depasse, delai_depasse
+    raison_arret: str
     logs: List[CycleLog]
     synthese_finale: str
     application: List[ApplicationLog]
@@ -0,0 +1,61 @@
+"""Fixtures communes des tests."""
+
+import copy
+
+import pytest
+
+from brainstorm_ai.core import (
+    batch,
+    budget,
+    idea_index,
+    rate_limiter,
+    resilience,
+    router,
+    telemetry,
+)
+from brainstorm_ai.core.backends import LatencyModel, SyntheticBackend
+from brainstorm_ai.core.config import config
+from brainstorm_ai.core.gpt import get_gpt_client
+
+# Instances globales construites à partir de la configuration (chemins, quotas,
+# backend) : chaque test repart d'instances neuves
+SINGLETONS = [
+    (batch, "_batch_runner", None),
+    (budget, "_budget_guard", None),
+    (idea_index, "_idea_index", None),
+    (rate_limiter, "_rate_limiter", None),
+    (router, "_router", None),
+    (telemetry, "_telemetry_store", None),
+]
+
+
+@pytest.fixture
+def cfg(tmp_path, monkeypatch):
+    """Configuration isolée : les fichiers du run vont dans ``tmp_path``, les
+    modifications et les instances globales créées pendant le test sont
+    annulées à la fin du test."""
+    sauvegarde = copy.deepcopy(config._config)
+    for module, nom, valeur in SINGLETONS:
+        monkeypatch.setattr(module, nom, valeur)
+    monkeypatch.setattr(resilience, "_breakers", {})
+    config.set("export.paths.logs_dir", str(tmp_path / "logs"))
+    config.set("export.paths.exports_dir", str(tmp_path / "exports"))
+    config.set("advanced.idea_index.path", str(tmp_path / "idea_index.json"))
+    config.set("advanced.telemetry.path", str(tmp_path / "telemetry.json"))
+    config.set("api.cache.enabled", False)
+    config.set("api.rate_limits", {})
+    yield config
+    config._config = sauvegarde
+
+
+@pytest.fixture
+def synthetic(cfg, monkeypatch):
+    """Backend synthétique sans latence à la place de l'API OpenAI ; le backend
+    précédent est rétabli à la fin du test."""
+    monkeypatch.setenv("BRAINSTORM_BACKEND", "synthetic")
+    client = get_gpt_client()
+    backend = SyntheticBackend(latency=LatencyModel("fixed", 0.0), seed=1)
+    # Remplacement direct : set_backend() fermerait le backend à rétablir
+    monkeypatch.setattr(client, "_backend", backend)
+    yield backend
+    backend.close()
@@ -0,0 +1,72 @@
+"""Tests des backends de complétion."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from brainstorm_ai.core.backends import (
+    BackendError,
+    RecordingBackend,
+    ReplayBackend,
+    SyntheticBackend,
+    request_key,
+)
+
+
+def messages(texte):
+    return [{"role": "user", "content": texte}]
+
+
+PROMPTS = [messages(f"Génère des idées sur le sujet {i}") for i in range(6)]
+
+
+def test_synthetic_independent_of_call_order():
+    dans_l_ordre = SyntheticBackend(seed=7)
+    a_l_envers = SyntheticBackend(seed=7)
+
+    attendu = [dans_l_ordre.complete("gpt-4o", m, 0.7).content for m in PROMPTS]
+    inverse = [a_l_envers.complete("gpt-4o", m, 0.7).content for m in reversed(PROMPTS)]
+
+    assert attendu == inverse[::-1]
+
+
+def test_synthetic_deterministic_with_concurrent_calls():
+    backend = SyntheticBackend(seed=7)
+    attendu = [SyntheticBackend(seed=7).complete("gpt-4o", m, 0.7).content for m in PROMPTS]
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        contenus = list(executor.map(lambda m: backend.complete("gpt-4o", m, 0.7).content, PROMPTS))
+
+    assert contenus == attendu
+
+
+def test_synthetic_seed_changes_output():
+    a = SyntheticBackend(seed=1).complete("gpt-4o", PROMPTS[0], 0.7)
+    b = SyntheticBackend(seed=2).complete("gpt-4o", PROMPTS[0], 0.7)
+
+    assert a.content != b.content
+
+
+def test_request_key_depends_on_n():
+    m = PROMPTS[0]
+
+    assert request_key("gpt-4o", m, 0.7) == request_key("gpt-4o", m, 0.7, n=1)
+    assert request_key("gpt-4o", m, 0.7, n=3) != request_key("gpt-4o", m, 0.7)
+
+
+def test_replay_distinguishes_n(tmp_path):
+    cassette = tmp_path / "cassette.jsonl"
+    recorder = RecordingBackend(SyntheticBackend(seed=3), str(cassette))
+    simple = recorder.complete("gpt-4o", PROMPTS[0], 0.7)
+    multiple = recorder.complete("gpt-4o", PROMPTS[0], 0.7, n=3)
+
+    replay = ReplayBackend(str(cassette))
+
+    rejoue_multiple = replay.complete("gpt-4o", PROMPTS[0], 0.7, n=3)
+    rejoue_simple = replay.complete("gpt-4o", PROMPTS[0], 0.7)
+    assert rejoue_multiple.choices == multiple.choices
+    assert len(rejoue_multiple.choices) == 3
+    assert rejoue_simple.content == simple.content
+    assert rejoue_simple.choices == []
+    with pytest.raises(BackendError):
+        replay.complete("gpt-4o", PROMPTS[0], 0.7, n=2)
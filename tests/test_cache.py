@@ -0,0 +1,114 @@
+"""Tests du cache persistant des réponses."""
+
+import pytest
+
+from brainstorm_ai.core import cache
+from brainstorm_ai.core.cache import ResponseCache
+
+
+class Horloge:
+    """Remplace le module ``time`` du cache par une horloge pilotée."""
+
+    def __init__(self):
+        self.maintenant = 1_000_000.0
+
+    def time(self):
+        return self.maintenant
+
+
+@pytest.fixture
+def horloge(monkeypatch):
+    instance = Horloge()
+    monkeypatch.setattr(cache, "time", instance)
+    return instance
+
+
+@pytest.fixture
+def ouvrir(tmp_path):
+    caches = []
+
+    def factory(**options):
+        instance = ResponseCache(str(tmp_path / "responses.sqlite"), **options)
+        caches.append(instance)
+        return instance
+
+    yield factory
+    for instance in caches:
+        instance.close()
+
+
+def test_key_depends_on_every_field():
+    base = ResponseCache.make_key("gpt-4o", 0.7, "creatif", "prompt")
+
+    assert base == ResponseCache.make_key("gpt-4o", 0.7, "creatif", "prompt")
+    assert base != ResponseCache.make_key("gpt-4o-mini", 0.7, "creatif", "prompt")
+    assert base != ResponseCache.make_key("gpt-4o", 0.2, "creatif", "prompt")
+    assert base != ResponseCache.make_key("gpt-4o", 0.7, "critique", "prompt")
+    assert base != ResponseCache.make_key("gpt-4o", 0.7, "creatif", "prompt 2")
+
+
+def test_hit_miss_and_persistence(ouvrir):
+    reponses = ouvrir()
+    assert reponses.get("a") is None
+    reponses.set("a", "gpt-4o", "creatif", "réponse")
+    reponses.close()
+
+    reponses = ouvrir()
+    assert reponses.get("a") == "réponse"
+    assert reponses.get_stats() == {"cache_hits": 1, "cache_misses": 0, "cache_hit_rate": 1.0}
+
+
+def test_expired_entry_is_a_miss(ouvrir, horloge):
+    reponses = ouvrir(max_age_days=1)
+    reponses.set("a", "gpt-4o", "creatif", "réponse")
+
+    horloge.maintenant += 86400 - 1
+    assert reponses.get("a") == "réponse"
+    horloge.maintenant += 2
+    assert reponses.get("a") is None
+    assert len(reponses) == 0
+
+
+def test_expired_entries_evicted_on_write(ouvrir, horloge):
+    reponses = ouvrir(max_age_days=1)
+    reponses.set("ancienne", "gpt-4o", "creatif", "1")
+    horloge.maintenant += 86400 + 1
+
+    reponses.set("nouvelle", "gpt-4o", "creatif", "2")
+
+    assert len(reponses) == 1
+    assert reponses.get("nouvelle") == "2"
+
+
+def test_least_recently_used_evicted(ouvrir, horloge):
+    reponses = ouvrir(max_entries=2, max_age_days=0)
+    for key in ("a", "b"):
+        reponses.set(key, "gpt-4o", "creatif", key)
+        horloge.maintenant += 1
+    # Une lecture rafraîchit l'entrée : "b" devient la moins récemment utilisée
+    reponses.get("a")
+    horloge.maintenant += 1
+
+    reponses.set("c", "gpt-4o", "creatif", "c")
+
+    assert len(reponses) == 2
+    assert reponses.get("b") is None
+    assert reponses.get("a") == "a"
+    assert reponses.get("c") == "c"
+
+
+def test_unlimited_cache_keeps_everything(ouvrir, horloge):
+    reponses = ouvrir(max_entries=0, max_age_days=0)
+    for index in range(20):
+        reponses.set(str(index), "gpt-4o", "creatif", str(index))
+        horloge.maintenant += 86400 * 365
+
+    assert len(reponses) == 20
+    assert reponses.get("0") == "0"
+
+
+def test_key_depends_on_backend():
+    reelle = ResponseCache.make_key("gpt-4o", 0.7, "creatif", "prompt")
+
+    assert reelle == ResponseCache.make_key("gpt-4o", 0.7, "creatif", "prompt", "openai")
+    assert reelle != ResponseCache.make_key("gpt-4o", 0.7, "creatif", "prompt", "synthetic")
@@ -0,0 +1,100 @@
+"""Tests du moniteur d'arrêt anticipé."""
+
+from brainstorm_ai.core.convergence import (
+    ARRET_BUDGET,
+    ARRET_NOUVEAUTE_FAIBLE,
+    ARRET_PLATEAU_SCORE,
+    ConvergenceMonitor,
+)
+
+
+def cycle(creation, total=None):
+    return {"creation": creation, "score": {"total": total} if total is not None else {}}
+
+
+def test_record_score_before_observe():
+    monitor = ConvergenceMonitor()
+
+    monitor.record_score(1, {"total": 25})
+    monitor.observe(cycle("une idée"), {})
+
+    assert monitor.totals == [25.0]
+
+
+def test_record_score_after_observe():
+    monitor = ConvergenceMonitor()
+    monitor.observe(cycle("une idée"), {})
+    assert monitor.totals == [None]
+
+    monitor.record_score(1, {"total": 25})
+
+    assert monitor.totals == [25.0]
+
+
+def observer(monitor, totals, stats=None):
+    """Observe un cycle par score (créations distinctes), retourne les raisons d'arrêt."""
+    return [
+        monitor.observe(cycle(f"idée numéro {index}", total), stats or {})
+        for index, total in enumerate(totals)
+    ]
+
+
+def test_plateau_after_patience_cycles():
+    monitor = ConvergenceMonitor(patience=2, min_score_gain=1.0, novelty_threshold=0.0)
+
+    assert observer(monitor, [20, 24, 24.5, 24]) == [None, None, None, ARRET_PLATEAU_SCORE]
+
+
+def test_score_gain_resets_plateau():
+    monitor = ConvergenceMonitor(patience=2, min_score_gain=1.0, novelty_threshold=0.0)
+
+    assert observer(monitor, [20, 20.5, 22, 22.5, 22.5]) == [None] * 4 + [ARRET_PLATEAU_SCORE]
+
+
+def test_plateau_waits_for_min_cycles():
+    monitor = ConvergenceMonitor(min_cycles=4, patience=1, novelty_threshold=0.0)
+
+    assert observer(monitor, [20, 20, 20, 20]) == [None, None, None, ARRET_PLATEAU_SCORE]
+
+
+def test_plateau_ignores_unscored_cycles():
+    # Score en tâche de fond : seuls les premiers cycles évalués comptent
+    monitor = ConvergenceMonitor(patience=2, novelty_threshold=0.0)
+
+    assert observer(monitor, [20, 24, None, None]) == [None] * 4
+    monitor.record_score(3, {"total": 24.5})
+    assert monitor.observe(cycle("idée numéro 4"), {}) is None
+    monitor.record_score(4, {"total": 24})
+    assert monitor.observe(cycle("idée numéro 5"), {}) == ARRET_PLATEAU_SCORE
+
+
+def test_disabled_monitor_never_stops_on_plateau():
+    monitor = ConvergenceMonitor(enabled=False, patience=1)
+
+    assert observer(monitor, [20, 20, 20, 20]) == [None] * 4
+
+
+def test_low_novelty_stops():
+    monitor = ConvergenceMonitor(novelty_threshold=0.5)
+
+    assert monitor.observe(cycle("Créer un réseau de pistes cyclables sécurisées"), {}) is None
+    raison = monitor.observe(cycle("Créer un réseau de pistes cyclables sécurisées !"), {})
+
+    assert raison == ARRET_NOUVEAUTE_FAIBLE
+    assert monitor.novelties[-1] < 0.5
+
+
+def test_budget_for_one_more_cycle():
+    monitor = ConvergenceMonitor(max_cost=1.0, novelty_threshold=0.0)
+    monitor.start({"total_cost": 0.1})
+
+    assert monitor.observe(cycle("première idée", 20), {"total_cost": 0.4}) is None
+    # 0.3 $ par cycle : un cycle de plus dépasserait 1 $
+    assert monitor.observe(cycle("deuxième idée", 30), {"total_cost": 0.75}) == ARRET_BUDGET
+
+
+def test_early_stopping_is_opt_in(cfg):
+    assert not ConvergenceMonitor.from_config().enabled
+
+    cfg.set("general.early_stopping", None)
+    assert not ConvergenceMonitor.from_config().enabled
@@ -0,0 +1,60 @@
+"""Tests du client GPT (backend synthétique)."""
+
+import asyncio
+import importlib
+import threading
+
+from brainstorm_ai.core.cache import ResponseCache
+
+# ``core.gpt`` est masqué par la fonction ``gpt`` réexportée par ``core``
+gpt_module = importlib.import_module("brainstorm_ai.core.gpt")
+
+
+class CacheTrace(ResponseCache):
+    """Cache qui note le thread de chaque accès."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.current_thread())
+        return super().get(key)
+
+    def set(self, key, model, role, response):
+        self.threads.append(threading.current_thread())
+        super().set(key, model, role, response)
+
+
+def test_agpt_cache_off_event_loop(synthetic, tmp_path, monkeypatch):
+    cache = CacheTrace(str(tmp_path / "responses.sqlite"))
+    monkeypatch.setattr(gpt_module, "get_response_cache", lambda: cache)
+
+    async def appeler():
+        boucle = threading.current_thread()
+        premiere = await gpt_module.agpt("Une idée", role="creatif")
+        seconde = await gpt_module.agpt("Une idée", role="creatif")
+        return boucle, premiere, seconde
+
+    boucle, premiere, seconde = asyncio.run(appeler())
+    cache.close()
+
+    assert premiere == seconde
+    assert len(cache.threads) == 3
+    assert boucle not in cache.threads
+
+
+def test_synthetic_responses_not_served_to_openai(synthetic, tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"))
+    monkeypatch.setattr(gpt_module, "get_response_cache", lambda: cache)
+    gpt_module.gpt("Une idée", role="creatif")
+    gpt_module.gpt("Une idée", role="creatif")
+    assert cache.hits == 1
+
+    # Même appel avec le backend réel : la réponse synthétique n'est pas servie
+    monkeypatch.setenv("BRAINSTORM_BACKEND", "openai")
+    gpt_module.gpt("Une idée", role="creatif")
+
+    assert cache.hits == 1
+    assert len(cache) == 2
+    cache.close()
@@ -0,0 +1,163 @@
+"""Tests des requêtes de secours (hedging)."""
+
+import importlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from brainstorm_ai.core import rate_limiter, resilience
+from brainstorm_ai.core.backends import Completion, CompletionBackend
+from brainstorm_ai.core.hedging import hedged_call
+from brainstorm_ai.core.rate_limiter import RateLimiter
+
+gpt_module = importlib.import_module("brainstorm_ai.core.gpt")
+
+
+def lente(resultat, delai=0.2):
+    def requete():
+        time.sleep(delai)
+        return resultat
+
+    return requete
+
+
+def en_echec():
+    raise RuntimeError("échec")
+
+
+@pytest.fixture
+def executeur():
+    pool = ThreadPoolExecutor(max_workers=2)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+class ExecuteurSature:
+    """Exécute la première requête ; les suivantes restent en file (annulables)."""
+
+    def __init__(self):
+        self.soumises = 0
+
+    def submit(self, fn):
+        tache = Future()
+        if not self.soumises:
+            threading.Thread(target=lambda: tache.set_result(fn())).start()
+        self.soumises += 1
+        return tache
+
+
+def test_cancelled_hedge_is_abandoned():
+    abandonnees = []
+
+    resultat = hedged_call(
+        ExecuteurSature(),
+        lente("principale", 0.05),
+        lambda: "secours",
+        0.01,
+        on_abandoned=abandonnees.append,
+    )
+
+    assert resultat == ("principale", 0, True)
+    assert abandonnees == [1]
+
+
+def test_failed_requests_are_abandoned(executeur):
+    abandonnees = []
+
+    resultat = hedged_call(
+        executeur, lente("principale"), en_echec, 0.01, on_abandoned=abandonnees.append
+    )
+    assert resultat == ("principale", 0, True)
+    assert abandonnees == [1]
+
+    abandonnees.clear()
+
+    def principale_en_echec():
+        time.sleep(0.05)
+        raise RuntimeError("échec")
+
+    resultat = hedged_call(
+        executeur, principale_en_echec, lente("secours", 0.1), 0.01, on_abandoned=abandonnees.append
+    )
+    assert resultat == ("secours", 1, True)
+    assert abandonnees == [0]
+
+
+def test_late_loser_reported_once(executeur):
+    ignorees, abandonnees = [], []
+    fini = threading.Event()
+
+    def secours():
+        time.sleep(0.1)
+        fini.set()
+        return "secours"
+
+    hedged_call(
+        executeur,
+        lente("principale", 0.05),
+        secours,
+        0.01,
+        on_discarded=lambda index, resultat: ignorees.append((index, resultat)),
+        on_abandoned=abandonnees.append,
+    )
+    assert fini.wait(1)
+    executeur.shutdown(wait=True)
+
+    assert ignorees == [(1, "secours")]
+    assert abandonnees == []
+
+
+class BackendLent(CompletionBackend):
+    """La requête principale traîne, le secours échoue aussitôt."""
+
+    def __init__(self):
+        self.appels = []
+
+    def complete(self, model, messages, temperature, **options):
+        self.appels.append(model)
+        if model == "gpt-4o-mini":
+            raise RuntimeError("secours en échec")
+        time.sleep(0.2)
+        return Completion("réponse", 100, 50, model)
+
+
+@pytest.fixture
+def secours(synthetic, cfg, monkeypatch):
+    cfg.set(
+        "api.hedging",
+        {
+            "enabled": True,
+            "initial_delay": 0.02,
+            "min_delay": 0.01,
+            "fallback_model": "gpt-4o-mini",
+        },
+    )
+    backend = BackendLent()
+    client = gpt_module.get_gpt_client()
+    monkeypatch.setattr(client, "_backend", backend)
+    return client, backend
+
+
+def test_abandoned_hedge_quota_refunded(secours, monkeypatch):
+    client, backend = secours
+    quotas = RateLimiter({"gpt-4o-mini": {"tpm": 6000}})
+    monkeypatch.setattr(rate_limiter, "_rate_limiter", quotas)
+
+    gpt_module._complete(client, "gpt-4o", "prompt", 0.5, 3000)
+
+    assert backend.appels == ["gpt-4o", "gpt-4o-mini"]
+    assert quotas.expected_wait("gpt-4o-mini", 6000) == 0.0
+
+
+def test_no_hedge_towards_open_breaker(secours):
+    client, backend = secours
+    breaker = resilience.get_circuit_breaker("gpt-4o-mini")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    _, repondu_par = gpt_module._complete(client, "gpt-4o", "prompt", 0.5, 3000)
+
+    assert repondu_par == "gpt-4o"
+    assert backend.appels == ["gpt-4o"]
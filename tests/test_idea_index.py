@@ -0,0 +1,145 @@
+"""Tests de l'index MinHash/LSH des idées."""
+
+import random
+
+import pytest
+
+from brainstorm_ai.core.idea_index import IdeaIndex, run_scope, split_known_ideas
+
+VOCABULAIRE = [f"mot{i}" for i in range(2000)]
+
+
+def idee_aleatoire(rng, longueur=20):
+    return " ".join(rng.choice(VOCABULAIRE) for _ in range(longueur))
+
+
+def variante(rng, idee):
+    """Remplace un mot de l'idée (similarité de Jaccard d'environ 0.7)."""
+    mots = idee.split()
+    mots[rng.randrange(len(mots))] = "remplace"
+    return " ".join(mots)
+
+
+def application(idee):
+    return {"idee": idee, "plan_initial": "plan", "critique": "", "defense": "", "revision": ""}
+
+
+def test_lsh_recall_on_near_duplicates():
+    rng = random.Random(0)
+    index = IdeaIndex()
+    idees = [idee_aleatoire(rng) for _ in range(200)]
+    for idee in idees:
+        index.add(idee, "run")
+
+    retrouvees = sum(
+        any(m.idee == idee for m in index.query(variante(rng, idee), threshold=0.5))
+        for idee in idees
+    )
+
+    assert retrouvees / len(idees) >= 0.95
+
+
+def test_unrelated_idea_not_found():
+    rng = random.Random(1)
+    index = IdeaIndex()
+    for _ in range(200):
+        index.add(idee_aleatoire(rng), "run")
+
+    assert index.query(idee_aleatoire(rng), threshold=0.5) == []
+
+
+def test_exact_match_similarity():
+    index = IdeaIndex()
+    index.add("une plateforme de covoiturage pour les zones rurales", "run")
+
+    [match] = index.query("Une plateforme de covoiturage pour les zones rurales !")
+
+    assert match.similarity == 1.0
+
+
+def test_find_developed_respects_scope():
+    idee = "une plateforme de covoiturage pour les zones rurales"
+    portee = run_scope("Mobilité", "Campagne", "Budget serré")
+    index = IdeaIndex()
+    index.add(idee, "run", application(idee), portee)
+
+    assert index.find_developed(idee, scope=portee) is not None
+    assert index.find_developed(idee, scope=run_scope("Mobilité", "Ville", "")) is None
+    assert index.find_developed(idee) is not None
+
+
+def test_query_without_limit_and_developed_behind_many_matches():
+    idee = "une plateforme de covoiturage pour les zones rurales"
+    index = IdeaIndex()
+    for n in range(8):
+        index.add(idee, f"run{n}")
+    index.add(idee, "run8", application(idee))
+
+    assert len(index.query(idee)) == 5
+    assert len(index.query(idee, limit=None)) == 9
+    assert index.find_developed(idee).source == "run8"
+
+
+def test_run_scope_normalises_text():
+    assert run_scope("Mobilité  rurale", "Contexte.", "") == run_scope(
+        "mobilité rurale", "contexte", ""
+    )
+    assert run_scope("a", "b", "") != run_scope("a", "", "b")
+
+
+def test_add_log_skips_failed_ideas_and_scopes_entries():
+    log = {
+        "objectif": "Objectif",
+        "contexte": "Contexte",
+        "contraintes": "",
+        "application": [
+            application("idée développée avec succès pour le test"),
+            {**application("idée dont le développement a échoué"), "erreur": "panne"},
+        ],
+        "logs": [{"creation": "1. première idée créée\\nTexte libre"}],
+    }
+    index = IdeaIndex()
+
+    assert index.add_log(log, "run") == 2
+    portee = run_scope("Objectif", "Contexte", "")
+    assert index.find_developed("idée développée avec succès pour le test", scope=portee)
+    assert index.find_developed("idée dont le développement a échoué") is None
+
+
+def test_save_and_reload(tmp_path):
+    idee = "une plateforme de covoiturage pour les zones rurales"
+    path = tmp_path / "index.json"
+    index = IdeaIndex(str(path))
+    index.add(idee, "run", application(idee), "portee")
+    index.save()
+
+    recharge = IdeaIndex(str(path))
+
+    assert len(recharge) == 1
+    assert recharge.find_developed(idee, scope="portee").application["plan_initial"] == "plan"
+
+
+def test_parameter_change_rebuilds(tmp_path):
+    path = tmp_path / "index.json"
+    index = IdeaIndex(str(path))
+    index.add("une idée quelconque à indexer", "run")
+    index.save()
+
+    assert len(IdeaIndex(str(path), num_perm=64, bands=16)) == 0
+
+
+def test_invalid_bands():
+    with pytest.raises(ValueError):
+        IdeaIndex(num_perm=100, bands=32)
+
+
+def test_split_known_ideas():
+    idee = "une plateforme de covoiturage pour les zones rurales"
+    index = IdeaIndex()
+    index.add(idee, "run", application(idee), "portee")
+
+    nouvelles, connues = split_known_ideas([idee, "une tout autre idée"], index, 0.8, "portee")
+
+    assert nouvelles == [(2, "une tout autre idée")]
+    assert list(connues) == [1]
+    assert split_known_ideas([idee], None, 0.8) == ([(1, idee)], {})
@@ -0,0 +1,296 @@
+"""Tests de la boucle de brainstorming (backend synthétique)."""
+
+import importlib
+import json
+from concurrent.futures import Future
+
+import pytest
+
+from brainstorm_ai.core import loop_manager
+from brainstorm_ai.core.convergence import ConvergenceMonitor
+from brainstorm_ai.core.gpt import GPTError
+from brainstorm_ai.core.idea_index import IdeaIndex
+
+# ``core.gpt`` est masqué par la fonction ``gpt`` réexportée par ``core``
+gpt_module = importlib.import_module("brainstorm_ai.core.gpt")
+
+
+class ExecuteurImmediat:
+    """Exécute chaque tâche dès sa soumission : le score est prêt avant la fin du cycle."""
+
+    def __init__(self, *args, **kwargs):
+        self.arrete = False
+
+    def submit(self, fn, *args, **kwargs):
+        tache = Future()
+        try:
+            tache.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            tache.set_exception(e)
+        return tache
+
+    def shutdown(self, wait=True):
+        self.arrete = True
+
+
+@pytest.fixture
+def run(synthetic, monkeypatch):
+    """Lance la boucle et retourne ``(logs, raison_arret)`` sans exporter."""
+    resultat = {}
+
+    def save_full_log(objectif, contexte, contraintes, logs, synthese, tracker, raison):
+        resultat.update(logs=logs, raison=raison)
+
+    monkeypatch.setattr(loop_manager, "save_full_log", save_full_log)
+
+    def lancer(cycles=3):
+        loop_manager.run_brainstorm_loop("objectif", "contexte", "contraintes", cycles)
+        return resultat["logs"], resultat["raison"]
+
+    return lancer
+
+
+def test_background_score_ready_before_observe(run, cfg, monkeypatch):
+    cfg.set("advanced.scoring.mode", "background")
+    cfg.set("general.early_stopping.enabled", True)
+    monkeypatch.setattr(loop_manager, "ThreadPoolExecutor", ExecuteurImmediat)
+
+    logs, _ = run(3)
+
+    assert logs
+    assert all("total" in log["score"] for log in logs)
+
+
+def test_background_scores_joined_before_synthesis(run, cfg):
+    cfg.set("advanced.scoring.mode", "background")
+    cfg.set("general.early_stopping.enabled", False)
+
+    logs, raison = run(3)
+
+    assert raison == "cycles_max"
+    assert [log["cycle"] for log in logs] == [1, 2, 3]
+    assert all("total" in log["score"] for log in logs)
+
+
+@pytest.mark.parametrize("mode", ["inline", "background"])
+def test_plateau_detected_in_every_scoring_mode(run, cfg, monkeypatch, mode):
+    cfg.set("advanced.scoring.mode", mode)
+    cfg.set(
+        "general.early_stopping",
+        {"enabled": True, "min_cycles": 2, "patience": 2, "novelty_threshold": 0.0},
+    )
+    monkeypatch.setattr(loop_manager, "ThreadPoolExecutor", ExecuteurImmediat)
+    score = {"impact": 6, "faisabilite": 6, "originalite": 6, "clarte": 6}
+    monkeypatch.setattr(loop_manager, "prompt_score", lambda revision: json.dumps(score))
+    monkeypatch.setattr(
+        loop_manager,
+        "prompt_score_lot",
+        lambda revisions: json.dumps([dict(score, id=i) for i in range(1, len(revisions) + 1)]),
+    )
+
+    logs, raison = run(5)
+
+    assert raison == "plateau_score"
+    assert len(logs) == 3
+
+
+def test_background_revisions_scored_in_grouped_calls(run, cfg, monkeypatch):
+    cfg.set("advanced.scoring.mode", "background")
+    cfg.set("advanced.scoring.batch_size", 2)
+    appels = []
+
+    def prompt_score(revision):
+        raise AssertionError("appel de score par cycle en tâche de fond")
+
+    prompt_score_lot = loop_manager.prompt_score_lot
+
+    def compter_lot(revisions):
+        appels.append(len(revisions))
+        return prompt_score_lot(revisions)
+
+    monkeypatch.setattr(loop_manager, "prompt_score", prompt_score)
+    monkeypatch.setattr(loop_manager, "prompt_score_lot", compter_lot)
+
+    logs, _ = run(5)
+
+    assert appels == [2, 2, 1]
+    assert all(log["score"] for log in logs)
+
+
+def test_score_executor_shut_down_on_error(run, cfg, monkeypatch):
+    cfg.set("advanced.scoring.mode", "background")
+    executeurs = []
+
+    def executeur(*args, **kwargs):
+        executeurs.append(ExecuteurImmediat())
+        return executeurs[-1]
+
+    traiter_cycle = loop_manager.traiter_cycle
+
+    def cycle_en_echec(objectif, contexte, contraintes, historique, cycle_num, tracker=None):
+        if cycle_num == 2:
+            raise GPTError("panne")
+        return traiter_cycle(objectif, contexte, contraintes, historique, cycle_num, tracker)
+
+    monkeypatch.setattr(loop_manager, "ThreadPoolExecutor", executeur)
+    monkeypatch.setattr(loop_manager, "traiter_cycle", cycle_en_echec)
+
+    with pytest.raises(GPTError):
+        run(3)
+
+    assert executeurs[0].arrete
+
+
+def test_stream_listener_removed_on_error(run, monkeypatch):
+    def cycle_en_echec(*args, **kwargs):
+        raise GPTError("panne")
+
+    monkeypatch.setattr(loop_manager, "traiter_cycle", cycle_en_echec)
+
+    with pytest.raises(GPTError):
+        run(2)
+
+    assert gpt_module._stream_listeners == []
+
+
+def test_run_deadline_cleared_on_error(run, cfg, monkeypatch):
+    cfg.set("api.run_timeout", 600)
+
+    def cycle_en_echec(*args, **kwargs):
+        raise GPTError("panne")
+
+    monkeypatch.setattr(loop_manager, "traiter_cycle", cycle_en_echec)
+
+    with pytest.raises(GPTError):
+        run(2)
+
+    assert gpt_module._run_deadline is None
+
+
+def test_creation_kept_in_history_when_later_step_fails(synthetic, monkeypatch):
+    def critique_en_echec(creation):
+        raise GPTError("panne")
+
+    monkeypatch.setattr(loop_manager, "prompt_critique", critique_en_echec)
+    historique = []
+
+    with pytest.raises(GPTError):
+        loop_manager.traiter_cycle("objectif", "contexte", "contraintes", historique, 1)
+
+    assert len(historique) == 1
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_failed_idea_does_not_drop_others(cfg, monkeypatch, workers):
+    cfg.set("general.idea_workers", workers)
+
+    def process_idea(idx, idee, progress_tracker=None):
+        if idx == 2:
+            raise GPTError("panne")
+        return {"idee": idee, "plan_initial": "plan", "critique": "", "defense": "", "revision": ""}
+
+    monkeypatch.setattr(loop_manager, "_process_idea", process_idea)
+
+    logs = loop_manager.process_ideas(["idée un", "idée deux", "idée trois"])
+
+    assert [log["idee"] for log in logs] == ["idée un", "idée deux", "idée trois"]
+    assert logs[1]["erreur"] == "panne"
+    assert "erreur" not in logs[0] and logs[2]["plan_initial"] == "plan"
+
+
+@pytest.mark.parametrize(
+    "mode, portee, plan",
+    [
+        ("annotate", "portee", "nouveau plan"),
+        ("reuse", "portee", "ancien plan"),
+        ("reuse", "autre portee", "nouveau plan"),
+        ("skip", "portee", None),
+    ],
+)
+def test_known_idea_handling(cfg, monkeypatch, mode, portee, plan):
+    idee = "une plateforme de covoiturage pour les zones rurales"
+    index = IdeaIndex()
+    ancien = {
+        "idee": idee,
+        "plan_initial": "ancien plan",
+        "critique": "",
+        "defense": "",
+        "revision": "",
+    }
+    index.add(idee, "run", ancien, "portee")
+    cfg.set("advanced.idea_index.mode", mode)
+    monkeypatch.setattr(loop_manager, "get_idea_index", lambda: index)
+    monkeypatch.setattr(
+        loop_manager,
+        "_process_idea",
+        lambda idx, idee, progress_tracker=None: {**ancien, "plan_initial": "nouveau plan"},
+    )
+
+    logs = loop_manager.process_ideas([idee], scope=portee)
+
+    assert [log["plan_initial"] for log in logs] == ([plan] if plan else [])
+
+
+def test_recuperer_scores_before_observe():
+    convergence = ConvergenceMonitor(enabled=True)
+    tache = Future()
+    tache.set_result([{"total": 30}])
+    logs = [{"cycle": 1, "creation": "idée", "score": {}}]
+    scores_en_cours = {(1,): tache}
+
+    assert loop_manager._recuperer_scores(scores_en_cours, logs, convergence) is None
+
+    assert logs[0]["score"] == {"total": 30}
+    assert not scores_en_cours
+    convergence.observe(logs[0], {})
+    assert convergence.totals == [30.0]
+
+
+def notes(valeur, **extra):
+    return {
+        "impact": valeur,
+        "faisabilite": valeur,
+        "originalite": valeur,
+        "clarte": valeur,
+        **extra,
+    }
+
+
+REPLI = {**notes(6), "total": 24}
+
+
+def test_scores_batch_matched_by_id(cfg):
+    reponse = json.dumps([notes(8, id=2), notes(4, id=1)])
+
+    scores = loop_manager.validate_scores_batch(f"Voici les scores :\n{reponse}\nFin.", 2)
+
+    assert [score["total"] for score in scores] == [16, 32]
+    assert all("id" not in score for score in scores)
+
+
+def test_scores_batch_partial_array(cfg):
+    scores = loop_manager.validate_scores_batch(json.dumps([notes(8)]), 3)
+
+    assert scores == [{**notes(8), "total": 32}, REPLI, REPLI]
+
+
+def test_scores_batch_invalid_entry_keeps_others(cfg):
+    entrees = [
+        notes(9, id=1),
+        {"id": 2, "impact": 7},
+        notes("élevé", id=3),
+        notes(15, id="4"),
+        "pas un objet",
+    ]
+
+    scores = loop_manager.validate_scores_batch(json.dumps(entrees), 5)
+
+    assert scores == [{**notes(9), "total": 36}, REPLI, REPLI, {**notes(10), "total": 40}, REPLI]
+
+
+@pytest.mark.parametrize(
+    "reponse",
+    ["", "pas de JSON", "[{'impact': 8}", '{"impact": 8}', '[{"impact": 8,]', "] puis ["],
+)
+def test_scores_batch_malformed_response(cfg, reponse):
+    assert loop_manager.validate_scores_batch(reponse, 2) == [REPLI, REPLI]
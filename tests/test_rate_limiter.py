@@ -0,0 +1,112 @@
+"""Tests de la limitation de débit et de la réservation de quota."""
+
+import importlib
+
+import pytest
+
+from brainstorm_ai.core import rate_limiter, telemetry
+from brainstorm_ai.core.rate_limiter import ModelRateLimiter, RateLimiter, TokenBucket
+from brainstorm_ai.core.router import ModelRouter
+from brainstorm_ai.core.telemetry import TelemetryStore
+
+gpt_module = importlib.import_module("brainstorm_ai.core.gpt")
+
+
+@pytest.fixture
+def limiteur(monkeypatch):
+    """Remplace le limiteur global par un limiteur de test."""
+
+    def installer(limits):
+        instance = RateLimiter(limits)
+        monkeypatch.setattr(rate_limiter, "_rate_limiter", instance)
+        return instance
+
+    return installer
+
+
+@pytest.fixture
+def mesures(cfg, monkeypatch):
+    """Télémétrie en mémoire, vide au départ."""
+    cfg.set("advanced.telemetry.enabled", True)
+    store = TelemetryStore()
+    monkeypatch.setattr(telemetry, "_telemetry_store", store)
+    return store
+
+
+def test_bucket_reserve_and_wait():
+    bucket = TokenBucket(600, per_seconds=60)  # 10 jetons par seconde
+    bucket.updated_at = 0.0
+
+    assert bucket.reserve(500, now=0.0) == 0.0
+    assert bucket.wait_time(200, now=0.0) == pytest.approx(10.0)
+    assert bucket.reserve(200, now=0.0) == pytest.approx(10.0)
+    # Les réservations suivantes se placent derrière la précédente
+    assert bucket.reserve(100, now=5.0) == pytest.approx(15.0)
+
+
+def test_bucket_caps_oversized_request():
+    bucket = TokenBucket(100, per_seconds=60)
+    bucket.updated_at = 0.0
+
+    assert bucket.wait_time(10_000, now=0.0) == 0.0
+    assert bucket.reserve(10_000, now=0.0) == 0.0
+    assert bucket.wait_time(100, now=0.0) == pytest.approx(60.0)
+
+
+def test_bucket_adjust_never_exceeds_capacity():
+    bucket = TokenBucket(100)
+    bucket.adjust(-1_000)
+
+    assert bucket.tokens == 100
+    bucket.adjust(30)
+    assert bucket.tokens == 70
+
+
+def test_model_limiter_waits_for_slowest_bucket():
+    limiteur = ModelRateLimiter(rpm=60, tpm=600)
+
+    assert limiteur.reserve(600) == 0.0
+    assert limiteur.expected_wait(60) == pytest.approx(6.0, abs=0.1)
+
+
+def test_record_usage_returns_unused_tokens():
+    limiteur = RateLimiter({"gpt-4o": {"tpm": 1000}})
+    limiteur.acquire("gpt-4o", 1000)
+    assert limiteur.expected_wait("gpt-4o", 500) > 0
+
+    limiteur.record_usage("gpt-4o", 1000, 400)
+
+    assert limiteur.expected_wait("gpt-4o", 500) == 0.0
+    assert limiteur.expected_wait("gpt-4o-mini", 10**9) == 0.0
+
+
+def test_reservation_uses_measured_completion(mesures):
+    budget = gpt_module.config.get_token_budget("creatif")["completion"]
+    prompt_tokens, reserves = gpt_module._estimate_call("idée", "creatif", "gpt-4o", step="defense")
+    assert reserves == prompt_tokens + budget
+
+    for completion in (300, 500):
+        mesures.record("defense", 1000, completion, 1.0)
+
+    _, reserves = gpt_module._estimate_call("idée", "creatif", "gpt-4o", step="defense")
+    assert reserves == prompt_tokens + 400
+    _, reserves = gpt_module._estimate_call("idée", "creatif", "gpt-4o", n=3, step="defense")
+    assert reserves == prompt_tokens + 3 * 400
+    # Une mesure au-delà du budget reste plafonnée par le budget
+    mesures.record("creatif", 1000, 10 * budget, 1.0)
+    _, reserves = gpt_module._estimate_call("idée", "creatif", "gpt-4o")
+    assert reserves == prompt_tokens + budget
+
+
+def test_router_skips_model_with_long_queue(cfg, limiteur):
+    cfg.set("api.routing.enabled", True)
+    cfg.set("api.routing.routes", {"score": ["gpt-4o-mini", "gpt-4o"]})
+    cfg.set("agents.models", {"default": "gpt-4o"})
+    quotas = limiteur({"gpt-4o-mini": {"tpm": 6000}})
+    router = ModelRouter(max_queue_wait=30)
+
+    assert router.select("score", "score", 1000) == "gpt-4o-mini"
+    quotas.acquire("gpt-4o-mini", 6000)
+    # 4000 tokens manquants à 100 jetons/s : 40 s d'attente > 30 s
+    assert router.select("score", "score", 4000) == "gpt-4o"
+    assert router.select("score", "score", 2000) == "gpt-4o-mini"
@@ -0,0 +1,120 @@
+"""Tests du disjoncteur et de la lecture des délais Retry-After."""
+
+import email.utils
+from types import SimpleNamespace
+
+import pytest
+
+from brainstorm_ai.core import resilience
+from brainstorm_ai.core.resilience import (
+    FERME,
+    OUVERT,
+    SEMI_OUVERT,
+    CircuitBreaker,
+    CircuitOpenError,
+    decorrelated_jitter,
+    retry_after,
+)
+
+
+class Horloge:
+    """Remplace le module ``time`` de la résilience par une horloge pilotée."""
+
+    def __init__(self):
+        self.maintenant = 1_700_000_000.0
+
+    def monotonic(self):
+        return self.maintenant
+
+    def time(self):
+        return self.maintenant
+
+
+@pytest.fixture
+def horloge(monkeypatch):
+    instance = Horloge()
+    monkeypatch.setattr(resilience, "time", instance)
+    return instance
+
+
+def erreur(**headers):
+    return SimpleNamespace(response=SimpleNamespace(headers=headers))
+
+
+def test_opens_after_consecutive_failures(horloge):
+    breaker = CircuitBreaker("gpt-4o", failure_threshold=3, recovery_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == FERME
+
+    breaker.record_failure()
+
+    assert breaker.state == OUVERT
+    with pytest.raises(CircuitOpenError) as info:
+        breaker.before_call()
+    assert info.value.retry_in == pytest.approx(30)
+
+
+def test_half_open_limits_trial_calls(horloge):
+    breaker = CircuitBreaker("gpt-4o", failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+
+    horloge.maintenant += 30
+    assert breaker.state == SEMI_OUVERT
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == FERME
+    breaker.before_call()
+    breaker.before_call()
+
+
+def test_failed_trial_reopens(horloge):
+    breaker = CircuitBreaker("gpt-4o", failure_threshold=5, recovery_timeout=30)
+    for _ in range(5):
+        breaker.record_failure()
+    horloge.maintenant += 30
+    breaker.before_call()
+
+    breaker.record_failure()
+
+    assert breaker.state == OUVERT
+    horloge.maintenant += 29
+    assert breaker.state == OUVERT
+    horloge.maintenant += 1
+    assert breaker.state == SEMI_OUVERT
+
+
+def test_retry_after_extends_opening(horloge):
+    breaker = CircuitBreaker("gpt-4o", failure_threshold=1, recovery_timeout=30)
+
+    breaker.record_failure(retry_after=120)
+
+    horloge.maintenant += 60
+    assert breaker.state == OUVERT
+    horloge.maintenant += 60
+    assert breaker.state == SEMI_OUVERT
+
+
+def test_retry_after_parsing(horloge):
+    date = email.utils.formatdate(horloge.maintenant + 42, usegmt=True)
+
+    assert retry_after(erreur(**{"retry-after-ms": "1500"})) == 1.5
+    assert retry_after(erreur(**{"retry-after-ms": "abc", "retry-after": "3"})) == 3.0
+    assert retry_after(erreur(**{"retry-after": "-5"})) == 0.0
+    assert retry_after(erreur(**{"retry-after": date})) == pytest.approx(42)
+    assert retry_after(erreur(**{"retry-after": "demain"})) is None
+    assert retry_after(erreur()) is None
+    assert retry_after(ValueError("sans réponse")) is None
+
+
+def test_decorrelated_jitter_bounds():
+    delais = [decorrelated_jitter(previous, 1.0, 20.0) for previous in (None, 2.0, 50.0) * 50]
+
+    assert all(1.0 <= delai <= 20.0 for delai in delais)
+    assert all(decorrelated_jitter(None, 1.0, 20.0) <= 3.0 for _ in range(50))
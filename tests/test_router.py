@@ -0,0 +1,56 @@
+"""Tests du routage des appels vers les modèles."""
+
+import pytest
+
+from brainstorm_ai.core.router import ModelRouter
+
+ROUTES = {"score": ["gpt-4o-mini", "gpt-4o"], "critique": ["gpt-4o", "gpt-4o-mini"]}
+
+
+@pytest.fixture
+def routing(cfg):
+    cfg.set("api.routing.enabled", True)
+    cfg.set("api.routing.routes", ROUTES)
+    cfg.set("agents.models", {"default": "gpt-4o", "critique": "gpt-4o"})
+    return cfg
+
+
+def test_disabled_routing_uses_role_model(cfg):
+    cfg.set("api.routing.enabled", False)
+    cfg.set("agents.models.score", "gpt-4o")
+
+    assert cfg.get_route_models("score", "score") == ["gpt-4o"]
+
+
+def test_unset_role_follows_route(routing):
+    assert routing.get_route_models("score", "score") == ["gpt-4o-mini", "gpt-4o"]
+
+
+def test_explicit_model_stays_first(routing):
+    routing.set("agents.models.score", "gpt-4o")
+
+    assert routing.get_route_models("score", "score") == ["gpt-4o", "gpt-4o-mini"]
+
+
+def test_explicit_step_model_overrides_role(routing):
+    # replique (rôle critique) : la clé de l'étape prime sur celle du rôle
+    assert routing.get_route_models("replique", "critique")[0] == "gpt-4o"
+    routing.set("agents.models.replique", "gpt-4o-mini")
+
+    assert routing.get_route_models("replique", "critique") == ["gpt-4o-mini", "gpt-4o"]
+
+
+def test_downgrade_only_for_unset_roles(routing):
+    router = ModelRouter(downgrade_at=0.0)
+
+    assert router.select("critique", "critique", 100) == "gpt-4o"
+    routing.set("agents.models.critique", None)
+    assert router.select("critique", "critique", 100) == "gpt-4o-mini"
+
+
+def test_rate_limited_model_skipped(routing):
+    router = ModelRouter()
+    router.mark_rate_limited("gpt-4o-mini")
+
+    assert router.select("score", "score", 100) == "gpt-4o"
+    assert router.select("score", "score", 100, exclude=("gpt-4o",)) == "gpt-4o-mini"
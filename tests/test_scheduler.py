@@ -0,0 +1,94 @@
+"""Tests de l'ordonnanceur d'étapes."""
+
+import threading
+
+import pytest
+
+from brainstorm_ai.core.scheduler import SchedulerError, Step, run_steps
+
+
+def graphe(ordre):
+    """a → (b ∥ c) → d, chaque étape notant son passage dans ``ordre``."""
+
+    def etape(nom):
+        def func(**deps):
+            ordre.append(nom)
+            return nom + "".join(sorted(deps.values()))
+
+        return func
+
+    return [
+        Step("a", etape("a")),
+        Step("b", etape("b"), ("a",)),
+        Step("c", etape("c"), ("a",)),
+        Step("d", etape("d"), ("b", "c")),
+    ]
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_dependencies_run_first(parallel):
+    ordre = []
+
+    results = run_steps(graphe(ordre), parallel=parallel)
+
+    assert ordre[0] == "a"
+    assert ordre[-1] == "d"
+    assert results == {"a": "a", "b": "ba", "c": "ca", "d": "dbaca"}
+
+
+def test_sequential_keeps_list_order():
+    ordre = []
+
+    run_steps(graphe(ordre), parallel=False)
+
+    assert ordre == ["a", "b", "c", "d"]
+
+
+def test_independent_steps_run_concurrently():
+    barriere = threading.Barrier(2, timeout=5)
+    steps = [
+        Step("b", lambda: barriere.wait()),
+        Step("c", lambda: barriere.wait()),
+    ]
+
+    # Bloquerait (BrokenBarrierError) si b et c s'exécutaient l'une après l'autre
+    results = run_steps(steps)
+
+    assert set(results) == {"b", "c"}
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_step_error_propagates_and_skips_dependents(parallel):
+    def echec(a):
+        raise ValueError("b")
+
+    ordre = []
+    steps = graphe(ordre)
+    steps[1] = Step("b", echec, ("a",))
+
+    with pytest.raises(ValueError, match="b"):
+        run_steps(steps, parallel=parallel)
+
+    assert "d" not in ordre
+
+
+def test_callbacks_receive_each_step():
+    demarrees, terminees = [], []
+
+    run_steps(graphe([]), on_start=demarrees.append, on_complete=terminees.append)
+
+    assert sorted(s.name for s in demarrees) == ["a", "b", "c", "d"]
+    assert sorted(s.name for s in terminees) == ["a", "b", "c", "d"]
+
+
+@pytest.mark.parametrize(
+    "steps, message",
+    [
+        ([Step("a", str), Step("a", str)], "dupliquée"),
+        ([Step("a", str, ("x",))], "inconnue"),
+        ([Step("a", str, ("b",)), Step("b", str, ("a",))], "cycliques"),
+    ],
+)
+def test_invalid_graph(steps, message):
+    with pytest.raises(SchedulerError, match=message):
+        run_steps(steps)
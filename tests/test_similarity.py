@@ -0,0 +1,68 @@
+"""Tests de la détection locale de redondance."""
+
+import numpy as np
+
+from brainstorm_ai.core.similarity import (
+    collapse_near_duplicates,
+    cosine_matrix,
+    select_candidates,
+)
+
+SOLAIRE = "Installer des panneaux solaires sur les toits des écoles pour réduire la facture"
+SOLAIRE_V2 = (
+    "Installer des panneaux solaires sur les toits des écoles pour réduire la facture énergétique"
+)
+VELO = "Créer un réseau de pistes cyclables sécurisées entre les quartiers périphériques"
+JARDIN = "Ouvrir des jardins partagés gérés par les habitants dans les friches urbaines"
+
+
+def test_cosine_matrix_bounds():
+    similarities = cosine_matrix([SOLAIRE, SOLAIRE_V2, VELO, ""])
+
+    assert similarities.shape == (4, 4)
+    assert np.allclose(np.diag(similarities)[:3], 1.0)
+    assert similarities[0, 1] > 0.8
+    assert similarities[0, 2] < 0.2
+    assert not similarities[3].any()
+
+
+def test_collapse_keeps_latest_revision():
+    textes = [SOLAIRE, VELO, SOLAIRE_V2, JARDIN]
+
+    assert collapse_near_duplicates(textes, 0.8) == [VELO, SOLAIRE_V2, JARDIN]
+
+
+def test_collapse_threshold_above_similarity_keeps_all():
+    textes = [SOLAIRE, SOLAIRE_V2, VELO]
+
+    assert collapse_near_duplicates(textes, 1.01) == textes
+
+
+def test_collapse_short_and_empty_inputs():
+    assert collapse_near_duplicates([], 0.8) == []
+    assert collapse_near_duplicates([SOLAIRE], 0.8) == [SOLAIRE]
+    assert collapse_near_duplicates(["", ""], 0.8) == ["", ""]
+
+
+def test_select_novelty_prefers_unknown_ideas():
+    candidats = [SOLAIRE_V2, VELO, JARDIN]
+
+    retenus = select_candidates(candidats, [SOLAIRE], keep=2, strategy="novelty")
+
+    assert SOLAIRE_V2 not in retenus
+    assert sorted(retenus) == sorted([VELO, JARDIN])
+
+
+def test_select_diverse_skips_variant_of_selected():
+    # Sans références, "novelty" garde deux variantes de la même idée
+    candidats = [SOLAIRE, SOLAIRE_V2, VELO]
+
+    assert select_candidates(candidats, [], keep=2, strategy="novelty") == [SOLAIRE, SOLAIRE_V2]
+    retenus = select_candidates(candidats, [], keep=2, strategy="diverse")
+    assert retenus == [SOLAIRE, VELO]
+
+
+def test_select_ignores_blank_candidates():
+    assert select_candidates(["  ", VELO], [SOLAIRE], keep=2) == [VELO]
+    assert select_candidates([VELO, JARDIN], ["", " "], keep=5) == [VELO, JARDIN]
+    assert select_candidates([], [SOLAIRE], keep=1) == []
@@ -0,0 +1,81 @@
+"""Tests de la télémétrie des appels et de l'estimation de coût."""
+
+import json
+
+import pytest
+
+from brainstorm_ai.core.gpt import gpt
+from brainstorm_ai.core.telemetry import TelemetryStore, get_telemetry_store
+
+
+def mesure(prompt, completion, latence=1.0):
+    return {
+        "samples": 10,
+        "prompt_min": prompt,
+        "prompt_mean": prompt,
+        "prompt_p90": prompt,
+        "completion_mean": completion,
+        "completion_p90": completion,
+        "latency_mean": latence,
+        "latency_p90": latence,
+    }
+
+
+@pytest.fixture
+def estimation(cfg):
+    cfg.set("api.routing.enabled", False)
+    cfg.set("agents.models", {"default": "gpt-4o"})
+    cfg.set("agents.token_budgets.creatif", {"prompt": 10**7, "completion": 2500})
+
+    def input_tokens(cycles, step_stats):
+        resultat = cfg.estimate_total_cost(cycles, 0, step_stats)
+        return resultat["estimates"]["gpt-4o"]["input_tokens"]
+
+    return input_tokens
+
+
+def test_store_stats_save_and_reload(tmp_path):
+    path = tmp_path / "telemetry.json"
+    store = TelemetryStore(str(path), max_samples=3)
+    for tokens in (100, 200, 300, 400):
+        store.record("defense", tokens, tokens // 2, 0.5)
+    store.save()
+
+    stats = TelemetryStore(str(path)).step_stats()["defense"]
+
+    assert stats["samples"] == 3
+    assert stats["prompt_min"] == 200
+    assert stats["completion_mean"] == 150
+
+
+def test_store_ignores_other_version(tmp_path):
+    path = tmp_path / "telemetry.json"
+    path.write_text(json.dumps({"version": 1, "steps": {"creatif": [[1, 2, 0.1]]}}))
+
+    assert TelemetryStore(str(path)).step_stats() == {}
+
+
+def test_gpt_records_by_step(synthetic, cfg):
+    cfg.set("advanced.telemetry.enabled", True)
+
+    gpt("Défends cette idée", role="creatif", step="defense")
+
+    assert "defense" in get_telemetry_store().step_stats()
+
+
+def test_estimate_uses_step_distribution(estimation):
+    par_role = {"creatif": mesure(1000, 500)}
+    par_etape = {**par_role, "defense": mesure(5000, 500)}
+
+    assert estimation(3, par_etape) - estimation(3, par_role) == 3 * 4000
+
+
+def test_estimate_history_growth_capped_by_compaction(estimation, cfg):
+    cfg.set("agents.history_compaction.enabled", True)
+    stats = {"creatif": mesure(1000, 500)}
+    increments = [estimation(n + 1, stats) - estimation(n, stats) for n in range(6, 10)]
+    assert len(set(increments)) == 1
+
+    cfg.set("agents.history_compaction.enabled", False)
+    increments = [estimation(n + 1, stats) - estimation(n, stats) for n in range(6, 10)]
+    assert increments == sorted(increments) and len(set(increments)) == 4